@@ -0,0 +1,91 @@
+"""Initial schema: users, notes and notification_schedules
+
+The tables as create_tables() made them before Alembic was introduced, so that
+`alembic upgrade head` also works on an empty database. Existing tables are left unchanged.
+
+Revision ID: 0000
+Revises:
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0000"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "users" not in tables:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("google_id", sa.String(100), nullable=False),
+            sa.Column("email", sa.String(255), nullable=False),
+            sa.Column("name", sa.String(200), nullable=False),
+            sa.Column("picture", sa.String(500)),
+            sa.Column("locale", sa.String(10)),
+            sa.Column("timezone", sa.String(50)),
+            sa.Column("birth_date", sa.Date()),
+            sa.Column("menh_calculation_method", sa.String(20)),
+            sa.Column("email_notifications", sa.Boolean()),
+            sa.Column("telegram_notifications", sa.Boolean()),
+            sa.Column("telegram_chat_id", sa.String(100)),
+            sa.Column("is_active", sa.Boolean()),
+            sa.Column("is_verified", sa.Boolean()),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True)),
+            sa.Column("last_login", sa.DateTime(timezone=True)),
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+        op.create_index("ix_users_google_id", "users", ["google_id"], unique=True)
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    if "notes" not in tables:
+        op.create_table(
+            "notes",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("title", sa.String(200), nullable=False),
+            sa.Column("content", sa.Text()),
+            sa.Column("solar_date", sa.Date(), nullable=False),
+            sa.Column("lunar_date", sa.Date()),
+            sa.Column("calendar_type", sa.Enum("SOLAR", "LUNAR", name="calendartype")),
+            sa.Column("enable_notification", sa.Boolean()),
+            sa.Column("notification_days_before", sa.Integer()),
+            sa.Column("yearly_repeat", sa.Boolean()),
+            sa.Column("monthly_repeat", sa.Boolean()),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True)),
+            sa.Column("is_active", sa.Boolean()),
+        )
+        op.create_index("ix_notes_id", "notes", ["id"])
+        op.create_index("ix_notes_user_id", "notes", ["user_id"])
+
+    if "notification_schedules" not in tables:
+        op.create_table(
+            "notification_schedules",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("note_id", sa.Integer(), sa.ForeignKey("notes.id"), nullable=False),
+            sa.Column("total_notifications_needed", sa.Integer(), nullable=False),
+            sa.Column("notifications_sent", sa.Integer()),
+            sa.Column("current_days_before", sa.Integer(), nullable=False),
+            sa.Column("current_year", sa.Integer(), nullable=False),
+            sa.Column("current_month", sa.Integer(), nullable=False),
+            sa.Column("is_completed", sa.Boolean()),
+            sa.Column("last_notification_sent", sa.DateTime(timezone=True)),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True)),
+        )
+        op.create_index("ix_notification_schedules_id", "notification_schedules", ["id"])
+        op.create_index("ix_notification_schedules_note_id", "notification_schedules", ["note_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("notification_schedules")
+    op.drop_table("notes")
+    op.drop_table("users")
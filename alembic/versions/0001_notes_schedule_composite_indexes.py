@@ -0,0 +1,41 @@
+"""Composite indexes for the notes and notification schedule hot paths
+
+- notes (user_id, is_active, solar_date): month/day views, /notes and the bot's /upcoming
+- notification_schedules (is_completed, updated_at): cleanup of completed schedules
+
+Tables created by create_tables() on a recent version already have these indexes,
+so each one is only created when missing.
+
+Revision ID: 0001
+Revises: 0000
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = "0000"
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ("ix_notes_user_active_date", "notes", ["user_id", "is_active", "solar_date"]),
+    ("ix_notification_schedules_completed_updated", "notification_schedules", ["is_completed", "updated_at"]),
+)
+
+
+def _existing_indexes(table: str) -> set:
+    return {index["name"] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        if name not in _existing_indexes(table):
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        if name in _existing_indexes(table):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,48 @@
+"""Derived solar_month/solar_day columns for recurring note lookups
+
+- notes.solar_month, notes.solar_day: month and day of solar_date, kept in sync by the Note model
+- notes (user_id, is_active, solar_month, solar_day): finds monthly/yearly notes for a date range
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "ix_notes_user_active_month_day"
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    columns = {column["name"] for column in inspector.get_columns("notes")}
+    indexes = {index["name"] for index in inspector.get_indexes("notes")}
+
+    for name in ("solar_month", "solar_day"):
+        if name not in columns:
+            op.add_column("notes", sa.Column(name, sa.SmallInteger(), nullable=True))
+
+    notes = sa.table("notes", sa.column("solar_date"), sa.column("solar_month"), sa.column("solar_day"))
+    op.execute(
+        notes.update()
+        .where(sa.or_(notes.c.solar_month.is_(None), notes.c.solar_day.is_(None)))
+        .values(
+            solar_month=sa.extract("month", notes.c.solar_date),
+            solar_day=sa.extract("day", notes.c.solar_date)
+        )
+    )
+
+    if INDEX_NAME not in indexes:
+        op.create_index(INDEX_NAME, "notes", ["user_id", "is_active", "solar_month", "solar_day"])
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name="notes")
+    op.drop_column("notes", "solar_day")
+    op.drop_column("notes", "solar_month")
@@ -0,0 +1,56 @@
+"""Materialized note_occurrences table for the rolling horizon
+
+- note_occurrences (note_id, user_id, occurrence_date, kind): one row per day a note falls on
+- (user_id, occurrence_date): calendar views and the bot's /upcoming
+- note_occurrence_horizon: single row with the last day note_occurrences is complete for
+
+The tables start empty: refresh_note_occurrences_task fills them, and until its first run
+occurrences are computed from the notes table.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+TABLE_NAME = "note_occurrences"
+HORIZON_TABLE_NAME = "note_occurrence_horizon"
+
+
+def upgrade() -> None:
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if TABLE_NAME not in tables:
+        op.create_table(
+            TABLE_NAME,
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("note_id", sa.Integer(), sa.ForeignKey("notes.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("occurrence_date", sa.Date(), nullable=False),
+            sa.Column("kind", sa.String(10), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.UniqueConstraint("note_id", "occurrence_date", name="uq_note_occurrences_note_date"),
+        )
+        op.create_index("ix_note_occurrences_id", TABLE_NAME, ["id"])
+        op.create_index("ix_note_occurrences_occurrence_date", TABLE_NAME, ["occurrence_date"])
+        op.create_index("ix_note_occurrences_user_date", TABLE_NAME, ["user_id", "occurrence_date"])
+
+    if HORIZON_TABLE_NAME not in tables:
+        op.create_table(
+            HORIZON_TABLE_NAME,
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("materialized_through", sa.Date(), nullable=False),
+            sa.Column("refreshed_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table(HORIZON_TABLE_NAME)
+    op.drop_table(TABLE_NAME)
@@ -0,0 +1,46 @@
+"""Local holidays table filled by the prefetch task
+
+- holidays (holiday_date, year, name, description, source): Google Calendar holidays
+  synced by prefetch_holidays_task and read by the calendar pages
+
+Databases where create_tables() already created the table are left unchanged.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+TABLE_NAME = "holidays"
+
+
+def upgrade() -> None:
+    if TABLE_NAME in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    op.create_table(
+        TABLE_NAME,
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("holiday_date", sa.Date(), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(200), nullable=False),
+        sa.Column("description", sa.Text()),
+        sa.Column("source", sa.String(20), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+        sa.UniqueConstraint("holiday_date", "name", "source", name="uq_holidays_date_name_source"),
+    )
+    op.create_index("ix_holidays_id", TABLE_NAME, ["id"])
+    op.create_index("ix_holidays_holiday_date", TABLE_NAME, ["holiday_date"])
+    op.create_index("ix_holidays_year", TABLE_NAME, ["year"])
+
+
+def downgrade() -> None:
+    op.drop_table(TABLE_NAME)
@@ -0,0 +1,64 @@
+"""Notification scheduling: next_notification_at and per-cycle send logs
+
+- notification_schedules.next_notification_at: when the schedule's next notification is due
+- notification_schedules (is_completed, next_notification_at): the beat task's ready query
+- notification_send_logs: one row per (schedule, cycle year, cycle month, days before),
+  so a notification is never sent twice
+
+next_notification_at is left NULL here: NotificationService fills it for active schedules
+(backfill_next_notification_at) before each ready query.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+READY_INDEX = "ix_notification_schedules_ready"
+SEND_LOGS = "notification_send_logs"
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    columns = {column["name"] for column in inspector.get_columns("notification_schedules")}
+    indexes = {index["name"] for index in inspector.get_indexes("notification_schedules")}
+
+    if "next_notification_at" not in columns:
+        op.add_column("notification_schedules", sa.Column("next_notification_at", sa.DateTime(), nullable=True))
+    if READY_INDEX not in indexes:
+        op.create_index(READY_INDEX, "notification_schedules", ["is_completed", "next_notification_at"])
+
+    if SEND_LOGS not in inspector.get_table_names():
+        op.create_table(
+            SEND_LOGS,
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column(
+                "schedule_id", sa.Integer(),
+                sa.ForeignKey("notification_schedules.id", ondelete="CASCADE"), nullable=False
+            ),
+            sa.Column("cycle_year", sa.Integer(), nullable=False),
+            sa.Column("cycle_month", sa.Integer(), nullable=False),
+            sa.Column("days_before", sa.Integer(), nullable=False),
+            sa.Column("status", sa.String(20), nullable=False),
+            sa.Column("claimed_at", sa.DateTime(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True)),
+            sa.UniqueConstraint(
+                "schedule_id", "cycle_year", "cycle_month", "days_before",
+                name="uq_notification_send_logs_cycle"
+            ),
+        )
+        op.create_index("ix_notification_send_logs_id", SEND_LOGS, ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table(SEND_LOGS)
+    op.drop_index(READY_INDEX, table_name="notification_schedules")
+    op.drop_column("notification_schedules", "next_notification_at")
@@ -14,6 +14,7 @@ class Settings(BaseSettings):
     telegram_bot_token: str = ""
     telegram_chat_id: str = ""
     telegram_api_url: str = ""
+    telegram_pool_size: int = 8  # Keep-alive HTTP connections shared by all Telegram sends
 
     # Email
     smtp_host: str = ""
@@ -21,10 +22,16 @@ class Settings(BaseSettings):
     smtp_username: str = ""
     smtp_password: str = ""
     from_email: str = ""
+    smtp_use_tls: bool = True  # STARTTLS after connecting
+    smtp_pool_size: int = 4  # Max open SMTP connections per process
+    smtp_pool_max_idle: float = 60.0  # Seconds before an idle connection is checked with NOOP
     
     # Google Calendar API
     google_calendar_id: str = "vi.vietnamese#holiday@group.v.calendar.google.com"  # Vietnam holidays calendar
     google_api_key: str = ""  # API key for public calendar access
+    holiday_cache_ttl: int = 12 * 60 * 60  # Refresh cached holidays twice a day
+    holiday_cache_stale_ttl: int = 7 * 24 * 60 * 60  # Serve stale holidays up to a week while refreshing
+    holiday_cache_negative_ttl: int = 5 * 60  # Retry the API 5 minutes after an error
     
     # Google OAuth
     google_client_id: str = ""
@@ -37,9 +44,25 @@ class Settings(BaseSettings):
     debug: bool = False
     host: str = ""
     port: int = 8000
-    
+    public_url: str = ""  # Site origin for og:url on cached guest pages, e.g. https://lich.example.com
+    threadpool_size: int = 30  # Threads running sync route handlers (DB pool_size + max_overflow)
+    calendar_range_max_days: int = 400  # Largest span served by /api/calendar/range (a year view plus overflow)
+    calendar_range_max_age: int = 24 * 60 * 60  # Cache-Control max-age for /api/calendar/range responses
+    page_cache_ttl: int = 10 * 60  # Seconds a rendered guest calendar page is kept
+    page_cache_max_entries: int = 256  # Rendered pages kept in memory per process
+    user_cache_ttl: int = 60  # Seconds a logged-in user's row is served without a query
+    user_cache_max_entries: int = 1024  # Users kept in memory per process (without Redis)
+
     # Notifications
     notification_time: str = ""
+    notification_max_workers: int = 8  # Concurrent sends per dispatch run
+    telegram_rate_limit: float = 25.0  # Messages/second across all chats (Telegram allows ~30)
+    telegram_chat_rate_limit: float = 1.0  # Messages/second to a single chat
+    telegram_max_retries: int = 3  # Retries per message after a 429 RetryAfter
+    smtp_rate_limit: float = 5.0  # Emails/second
+    notification_batch_size: int = 50  # Schedules per Celery subtask
+    notification_claim_timeout: int = 15 * 60  # Seconds before an unfinished send may be retried
+    note_occurrence_horizon_months: int = 13  # Months (from the current one) kept in note_occurrences
     
     class Config:
         env_file = ".env"
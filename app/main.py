@@ -1,3 +1,4 @@
+import anyio.to_thread
 from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
@@ -11,6 +12,7 @@ from app.routes.auth import router as auth_router
 from app.routes.legal import router as legal_router
 from app.routes.settings import router as settings_router
 from app.logging_config import setup_logging, get_logger
+from app.services.page_cache import guest_page_cache
 
 # Setup logging configuration
 setup_logging()
@@ -52,6 +54,10 @@ templates = Jinja2Templates(directory="app/templates")
 @app.on_event("startup")
 async def startup_event():
     """Initialize database and other startup tasks"""
+    # Route handlers are sync and run in this pool; bound it by the DB connection pool
+    # so threads wait here instead of inside SQLAlchemy's pool_timeout
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_size
+    
     try:
         # Create database tables
         create_tables()
@@ -80,7 +86,8 @@ async def health_check():
         "status": "healthy",
         "version": "1.0.0",
         "database": "connected",
-        "redis": "connected" if settings.redis_url else "not configured"
+        "redis": "connected" if settings.redis_url else "not configured",
+        "page_cache": guest_page_cache.stats()
     }
 
 
@@ -1,5 +1,8 @@
 from .user import User
 from .note import Note, CalendarType
 from .notification_schedule import NotificationSchedule
+from .holiday import Holiday
+from .notification_send_log import NotificationSendLog
+from .note_occurrence import NoteOccurrence, NoteOccurrenceHorizon
 
-__all__ = ["User", "Note", "CalendarType", "Notification", "NotificationStatus", "NotificationType", "NotificationSchedule"]
+__all__ = ["User", "Note", "CalendarType", "Notification", "NotificationStatus", "NotificationType", "NotificationSchedule", "Holiday", "NotificationSendLog", "NoteOccurrence", "NoteOccurrenceHorizon"]
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class Holiday(Base):
+    """National holidays synced from Google Calendar by the prefetch task"""
+    __tablename__ = "holidays"
+    __table_args__ = (
+        UniqueConstraint("holiday_date", "name", "source", name="uq_holidays_date_name_source"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    holiday_date = Column(Date, nullable=False, index=True)
+    year = Column(Integer, nullable=False, index=True)  # Năm dương lịch, dùng để đồng bộ theo năm
+    name = Column(String(200), nullable=False)
+    description = Column(Text)
+    source = Column(String(20), nullable=False, default="google_calendar")
+    
+    # Metadata
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<Holiday(date={self.holiday_date}, name='{self.name}', source={self.source})>"
+    
+    def to_dict(self):
+        """Same shape as GoogleCalendarService holidays"""
+        return {
+            'name': self.name,
+            'date': self.holiday_date,
+            'description': self.description or '',
+            'type': self.source,
+            'date_str': self.holiday_date.strftime('%Y-%m-%d')
+        }
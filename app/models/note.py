@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Boolean, Enum, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, SmallInteger, String, Text, Date, DateTime, Boolean, Enum, ForeignKey, Index
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from app.database import Base
 import enum
@@ -12,6 +12,14 @@ class CalendarType(enum.Enum):
 
 class Note(Base):
     __tablename__ = "notes"
+    __table_args__ = (
+        # Month/day views, /notes (ORDER BY solar_date DESC) and the bot's /upcoming:
+        # WHERE user_id = ? AND is_active = 1 [AND solar_date range]
+        Index("ix_notes_user_active_date", "user_id", "is_active", "solar_date"),
+        # Recurring notes projected into a date range: WHERE user_id = ? AND is_active = 1
+        # AND (solar_month, solar_day) inside the range's month/day segments
+        Index("ix_notes_user_active_month_day", "user_id", "is_active", "solar_month", "solar_day"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -20,6 +28,8 @@ class Note(Base):
     
     # Date information
     solar_date = Column(Date, nullable=False)
+    solar_month = Column(SmallInteger)  # Tháng của solar_date (tự cập nhật), dùng cho ghi chú lặp lại
+    solar_day = Column(SmallInteger)  # Ngày của solar_date (tự cập nhật), dùng cho ghi chú lặp lại
     lunar_date = Column(Date)
     calendar_type = Column(Enum(CalendarType), default=CalendarType.SOLAR)
     
@@ -40,4 +50,11 @@ class Note(Base):
     def __repr__(self):
         return f"<Note(id={self.id}, user_id={self.user_id}, title='{self.title}', date={self.solar_date})>"
     
+    @validates("solar_date")
+    def _sync_month_day(self, key, solar_date):
+        """Keep the derived solar_month/solar_day columns in step with solar_date"""
+        self.solar_month = solar_date.month if solar_date else None
+        self.solar_day = solar_date.day if solar_date else None
+        return solar_date
+    
 
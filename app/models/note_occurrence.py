@@ -0,0 +1,49 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class NoteOccurrence(Base):
+    """One day a note falls on within the rolling horizon, maintained by NoteOccurrenceService"""
+    __tablename__ = "note_occurrences"
+    __table_args__ = (
+        UniqueConstraint("note_id", "occurrence_date", name="uq_note_occurrences_note_date"),
+        # Calendar views and the bot's /upcoming: WHERE user_id = ? AND occurrence_date range
+        Index("ix_note_occurrences_user_date", "user_id", "occurrence_date"),
+    )
+
+    KIND_ONCE = "once"
+    KIND_MONTHLY = "monthly"
+    KIND_YEARLY = "yearly"
+
+    id = Column(Integer, primary_key=True, index=True)
+    note_id = Column(Integer, ForeignKey("notes.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    occurrence_date = Column(Date, nullable=False, index=True)
+    kind = Column(String(10), nullable=False)  # once, monthly hoặc yearly
+
+    # Metadata
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    note = relationship("Note")
+
+    def __repr__(self):
+        return f"<NoteOccurrence(note_id={self.note_id}, date={self.occurrence_date}, kind={self.kind})>"
+
+
+class NoteOccurrenceHorizon(Base):
+    """Single row recording how far note_occurrences is complete (set by NoteOccurrenceService.refresh)"""
+    __tablename__ = "note_occurrence_horizon"
+
+    ROW_ID = 1
+
+    id = Column(Integer, primary_key=True)
+    materialized_through = Column(Date, nullable=False)  # Ngày cuối cùng đã có đủ dữ liệu
+
+    # Metadata
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<NoteOccurrenceHorizon(through={self.materialized_through}, refreshed_at={self.refreshed_at})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -7,6 +7,12 @@ from app.database import Base
 class NotificationSchedule(Base):
     """Track notification progress for each note"""
     __tablename__ = "notification_schedules"
+    __table_args__ = (
+        # Beat task: WHERE is_completed = 0 AND next_notification_at <= now
+        Index("ix_notification_schedules_ready", "is_completed", "next_notification_at"),
+        # Cleanup task: WHERE is_completed = 1 AND updated_at < cutoff
+        Index("ix_notification_schedules_completed_updated", "is_completed", "updated_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     note_id = Column(Integer, ForeignKey("notes.id"), nullable=False, index=True)
@@ -21,6 +27,7 @@ class NotificationSchedule(Base):
     # Status
     is_completed = Column(Boolean, default=False)  # Đã hoàn thành tất cả thông báo
     last_notification_sent = Column(DateTime(timezone=True))  # Lần gửi cuối
+    next_notification_at = Column(DateTime)  # Thời điểm gửi thông báo tiếp theo (giờ địa phương)
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
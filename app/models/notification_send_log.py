@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class NotificationSendLog(Base):
+    """Idempotency record: one row per (schedule, cycle year, cycle month, days before) notification"""
+    __tablename__ = "notification_send_logs"
+    __table_args__ = (
+        UniqueConstraint(
+            "schedule_id", "cycle_year", "cycle_month", "days_before",
+            name="uq_notification_send_logs_cycle"
+        ),
+    )
+    
+    STATUS_SENDING = "sending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    schedule_id = Column(Integer, ForeignKey("notification_schedules.id", ondelete="CASCADE"), nullable=False)
+    
+    # Idempotency key
+    cycle_year = Column(Integer, nullable=False)
+    cycle_month = Column(Integer, nullable=False)
+    days_before = Column(Integer, nullable=False)
+    
+    # Status
+    status = Column(String(20), nullable=False, default=STATUS_SENDING)
+    claimed_at = Column(DateTime, nullable=False)  # Lần nhận xử lý cuối (giờ địa phương)
+    
+    # Metadata
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<NotificationSendLog(schedule_id={self.schedule_id}, {self.cycle_year}/{self.cycle_month:02d}, {self.days_before}d, {self.status})>"
@@ -63,7 +63,7 @@ async def admin_login_form(request: Request):
 
 
 @router.post("/admin/login")
-async def admin_login(
+def admin_login(
     request: Request,
     email: str = Form(...),
     password: str = Form(...),
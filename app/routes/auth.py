@@ -20,7 +20,7 @@ class BirthDateUpdate(BaseModel):
 
 
 @router.get("/login")
-async def login_page(
+def login_page(
     request: Request,
     db: Session = Depends(get_db)
 ):
@@ -74,7 +74,7 @@ async def login_page(
 
 
 @router.get("/auth/google/callback")
-async def google_callback(
+def google_callback(
     request: Request,
     code: Optional[str] = Query(None),
     state: Optional[str] = Query(None),
@@ -154,7 +154,7 @@ async def google_callback(
 
 
 @router.post("/auth/refresh-birth-date")
-async def refresh_birth_date(
+def refresh_birth_date(
     request: Request,
     db: Session = Depends(get_db)
 ):
@@ -185,7 +185,7 @@ async def refresh_birth_date(
 
 
 @router.post("/auth/update-birth-date")
-async def update_birth_date(
+def update_birth_date(
     birth_date_data: BirthDateUpdate,
     request: Request,
     db: Session = Depends(get_db)
@@ -220,6 +220,7 @@ async def update_birth_date(
         # Update user's birth date
         current_user.birth_date = birth_date
         db.commit()
+        session_service.invalidate_user(current_user.id)
         
         logger.info(f"Updated birth date for user {current_user.email}: {birth_date}")
         
@@ -252,7 +253,7 @@ async def logout(request: Request):
 
 
 @router.get("/profile")
-async def profile_page(
+def profile_page(
     request: Request,
     db: Session = Depends(get_db)
 ):
@@ -1,22 +1,31 @@
 from fastapi import APIRouter, Request, Depends, Query
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 from datetime import date, datetime, timedelta
-from typing import Optional
+from typing import Dict, List, Optional
+import calendar
+import hashlib
+import json
+from app.config import settings
 from app.database import get_db
 from app.services.lunar_calendar import LunarCalendarService
 from app.services.feng_shui_service import FengShuiService
 from app.services.google_calendar_service import google_calendar_service
+from app.services.holiday_service import HolidayService
+from app.services.note_occurrence_service import NoteOccurrenceService
+from app.services.page_cache import guest_page_cache
 from app.services.session_service import session_service
-from app.models.note import Note
 
 router = APIRouter()
 templates = Jinja2Templates(directory="app/templates")
 
+# Part of the /api/calendar/range ETag: bump when the payload format or its calculations change
+RANGE_API_VERSION = "1"
+
 
 @router.get("/", response_class=HTMLResponse)
-async def calendar_view(
+def calendar_view(
     request: Request,
     year: Optional[int] = Query(None),
     month: Optional[int] = Query(None),
@@ -47,67 +56,73 @@ async def calendar_view(
     # Get current user first
     current_user = session_service.get_current_user(request, db)
     
+    # Canonical share URL: built from the page inputs so cached HTML never embeds the request's host or query
+    page_url = f"{settings.public_url}/?year={current_year}&month={current_month}"
+    if today != date.today():
+        page_url += f"&focus_date={today.strftime('%Y-%m-%d')}"
+    
+    # Guest pages only depend on the month, the dates and the stored holidays; the host and any
+    # other query string are left out so they can't be used to flood the cache
+    cache_key = None
+    if not current_user:
+        cache_key = guest_page_cache.make_key(
+            current_year, current_month, today, date.today(),
+            HolidayService.get_version(db, calendar_weeks[0][0]["date"], calendar_weeks[-1][-1]["date"])
+        )
+        cached_html = guest_page_cache.get(cache_key)
+        if cached_html is not None:
+            return HTMLResponse(cached_html)
+    
     # Add feng shui information to each day (personalized if user has birth_date)
-    for week in calendar_weeks:
-        for day_info in week:
-            day_date = day_info["date"]
-            if current_user and current_user.birth_date:
-                # Get personalized feng shui summary
-                method = getattr(current_user, 'menh_calculation_method', 'can_chi')
-                personal_feng_shui = FengShuiService.get_personal_feng_shui_advice(
-                    current_user.birth_date, day_date, method
-                )
-                # Create a compact summary for calendar display
-                compatibility_score = personal_feng_shui["compatibility"]["score"]
-                if compatibility_score >= 80:
-                    feng_shui_summary = f"🟢 Rất tốt ({compatibility_score}/100)"
-                elif compatibility_score >= 60:
-                    feng_shui_summary = f"🔵 Tốt ({compatibility_score}/100)"
-                elif compatibility_score >= 40:
-                    feng_shui_summary = f"🟡 Trung bình ({compatibility_score}/100)"
-                else:
-                    feng_shui_summary = f"🔴 Cần cẩn thận ({compatibility_score}/100)"
+    birth_date = current_user.birth_date if current_user else None
+    method = getattr(current_user, 'menh_calculation_method', 'can_chi')
+    feng_shui_days = FengShuiService.analyze_range(
+        calendar_weeks[0][0]["date"], calendar_weeks[-1][-1]["date"], birth_date, method
+    )
+    
+    for day_info, feng_shui_day in zip((day for week in calendar_weeks for day in week), feng_shui_days):
+        if birth_date:
+            # Create a compact summary for calendar display
+            compatibility_score = feng_shui_day["score"]
+            if compatibility_score >= 80:
+                feng_shui_summary = f"🟢 Rất tốt ({compatibility_score}/100)"
+            elif compatibility_score >= 60:
+                feng_shui_summary = f"🔵 Tốt ({compatibility_score}/100)"
+            elif compatibility_score >= 40:
+                feng_shui_summary = f"🟡 Trung bình ({compatibility_score}/100)"
             else:
-                # Get general feng shui summary for non-logged in users or users without birth_date
-                feng_shui_summary = FengShuiService.get_feng_shui_summary(day_date)
-            
-            day_info["feng_shui_summary"] = feng_shui_summary
+                feng_shui_summary = f"🔴 Cần cẩn thận ({compatibility_score}/100)"
+        else:
+            # Get general feng shui summary for non-logged in users or users without birth_date
+            feng_shui_summary = feng_shui_day["summary"]
+        
+        day_info["feng_shui_summary"] = feng_shui_summary
     
-    # Get notes for the month (filtered by user if logged in)
+    # Get notes for the month, including monthly/yearly repeats (no notes for guest users)
     first_day = date(current_year, current_month, 1)
-    if current_month == 12:
-        last_day = date(current_year + 1, 1, 1)
-    else:
-        last_day = date(current_year, current_month + 1, 1)
-    
-    notes_query = db.query(Note).filter(
-        Note.solar_date >= first_day,
-        Note.solar_date < last_day,
-        Note.is_active == True
-    )
+    last_day = date(current_year, current_month, calendar.monthrange(current_year, current_month)[1])
     
-    # Filter by user if logged in
+    occurrences = []
     if current_user:
-        notes_query = notes_query.filter(Note.user_id == current_user.id)
-    else:
-        # No notes for guest users
-        notes_query = notes_query.filter(Note.user_id == -1)  # No results
-    
-    notes = notes_query.all()
+        occurrences = NoteOccurrenceService.get_occurrences(db, current_user.id, first_day, last_day)
     
     # Create notes dictionary by date
     notes_by_date = {}
-    for note in notes:
-        date_str = note.solar_date.strftime('%Y-%m-%d')
+    for occurrence_date, note in occurrences:
+        date_str = occurrence_date.strftime('%Y-%m-%d')
         if date_str not in notes_by_date:
             notes_by_date[date_str] = []
         notes_by_date[date_str].append(note)
     
-    # Get lunar holidays
-    lunar_holidays = LunarCalendarService.get_lunar_holidays(current_year)
+    # Get lunar holidays for every day shown in the grid (including overflow days)
+    lunar_holidays = LunarCalendarService.holidays_in_range(
+        calendar_weeks[0][0]["date"], calendar_weeks[-1][-1]["date"]
+    )
     
-    # Get Google Calendar holidays for the month
-    google_holidays = google_calendar_service.get_holidays_for_month(current_year, current_month)
+    # Get national holidays for the grid from the local table (synced by prefetch_holidays_task)
+    google_holidays = HolidayService.get_holidays_in_range(
+        db, calendar_weeks[0][0]["date"], calendar_weeks[-1][-1]["date"]
+    )
     
     # Create holidays dictionary by date (combine lunar and Google holidays)
     holidays_by_date = {}
@@ -164,6 +179,7 @@ async def calendar_view(
     
     context = {
         "request": request,
+        "page_url": page_url,
         "current_user": current_user,
         "current_year": current_year,
         "current_month": current_month,
@@ -190,11 +206,15 @@ async def calendar_view(
         "weekday_names": ["Thứ 2", "Thứ 3", "Thứ 4", "Thứ 5", "Thứ 6", "Thứ 7", "Chủ nhật"]
     }
     
-    return templates.TemplateResponse("calendar.html", context)
+    response = templates.TemplateResponse("calendar.html", context)
+    if cache_key:
+        guest_page_cache.set(cache_key, response.body.decode("utf-8"))
+    
+    return response
 
 
 @router.get("/navigate-day/{date_str}", response_class=HTMLResponse)
-async def navigate_day(
+def navigate_day(
     request: Request,
     date_str: str,
     db: Session = Depends(get_db)
@@ -206,7 +226,7 @@ async def navigate_day(
         target_date = date.today()
     
     # Redirect to main calendar with focus date
-    return await calendar_view(
+    return calendar_view(
         request=request,
         year=target_date.year,
         month=target_date.month,
@@ -216,7 +236,7 @@ async def navigate_day(
 
 
 @router.get("/day/{date_str}", response_class=HTMLResponse)
-async def day_view(
+def day_view(
     request: Request,
     date_str: str,
     db: Session = Depends(get_db)
@@ -246,44 +266,32 @@ async def day_view(
         # Get general feng shui analysis
         feng_shui_analysis = FengShuiService.get_daily_feng_shui_analysis(selected_date)
     
-    # Get notes for this day (filtered by user if logged in)
-    notes_query = db.query(Note).filter(
-        Note.solar_date == selected_date,
-        Note.is_active == True
-    )
-    
-    # Filter by user if logged in
+    # Get notes for this day, including monthly/yearly repeats (no notes for guest users)
+    notes = []
     if current_user:
-        notes_query = notes_query.filter(Note.user_id == current_user.id)
-    else:
-        # No notes for guest users
-        notes_query = notes_query.filter(Note.user_id == -1)  # No results
-    
-    notes = notes_query.all()
+        notes = [
+            note for _, note in NoteOccurrenceService.get_occurrences(db, current_user.id, selected_date, selected_date)
+        ]
     
     # Get holidays for this day
     date_str = selected_date.strftime('%Y-%m-%d')
     day_holidays = []
     
-    # Get lunar holidays for the year
-    lunar_holidays = LunarCalendarService.get_lunar_holidays(selected_date.year)
-    for holiday in lunar_holidays:
-        if holiday["solar_date"] == selected_date:
-            day_holidays.append({
-                'name': holiday['name'],
-                'type': 'lunar',
-                'description': f"Ngày {holiday['lunar_date']}"
-            })
-    
-    # Get Google Calendar holidays for the month
-    google_holidays = google_calendar_service.get_holidays_for_month(selected_date.year, selected_date.month)
-    for holiday in google_holidays:
-        if holiday["date_str"] == date_str:
-            day_holidays.append({
-                'name': holiday['name'],
-                'type': 'national',
-                'description': holiday.get('description', '')
-            })
+    # Get lunar holidays for this day
+    for holiday in LunarCalendarService.holidays_on(selected_date):
+        day_holidays.append({
+            'name': holiday['name'],
+            'type': 'lunar',
+            'description': f"Ngày {holiday['lunar_date']}"
+        })
+    
+    # Get national holidays for this day from the local table
+    for holiday in HolidayService.get_holidays_in_range(db, selected_date, selected_date):
+        day_holidays.append({
+            'name': holiday['name'],
+            'type': 'national',
+            'description': holiday.get('description', '')
+        })
     
     context = {
         "request": request,
@@ -304,7 +312,7 @@ async def day_view(
 
 
 @router.get("/api/feng-shui/{date_str}")
-async def get_feng_shui_api(
+def get_feng_shui_api(
     request: Request,
     date_str: str,
     db: Session = Depends(get_db)
@@ -342,3 +350,106 @@ async def get_feng_shui_api(
             "type": "general",
             "data": feng_shui_analysis
         }
+
+
+def _build_range_columns(db: Session, start_date: date, end_date: date,
+                         birth_date: Optional[date], method: str) -> Dict[str, List]:
+    """Lunar, Can Chi, holiday (and personal score) data for every day of a range, one array per field"""
+    lunar_days = LunarCalendarService.lunar_range(start_date, end_date)
+    feng_shui_days = FengShuiService.analyze_range(start_date, end_date, birth_date, method)
+    
+    holidays_by_date = {}
+    for holiday in LunarCalendarService.holidays_in_range(start_date, end_date):
+        holidays_by_date.setdefault(holiday["solar_date"], []).append({"name": holiday["name"], "type": "lunar"})
+    for holiday in HolidayService.get_holidays_in_range(db, start_date, end_date):
+        holidays_by_date.setdefault(holiday["date"], []).append({"name": holiday["name"], "type": "national"})
+    
+    columns = {
+        "date": [day["date"].strftime('%Y-%m-%d') for day in feng_shui_days],
+        "lunar_day": [lunar_day for _, _, lunar_day, _ in lunar_days],
+        "lunar_month": [lunar_month for _, lunar_month, _, _ in lunar_days],
+        "lunar_year": [lunar_year for lunar_year, _, _, _ in lunar_days],
+        "is_leap_month": [is_leap for _, _, _, is_leap in lunar_days],
+        "can_chi": [day["can_chi"] for day in feng_shui_days],
+        "element": [day["element"].value for day in feng_shui_days],
+        "holidays": [holidays_by_date.get(day["date"], []) for day in feng_shui_days]
+    }
+    if birth_date:
+        columns["score"] = [day["score"] for day in feng_shui_days]
+        columns["level"] = [day["level"] for day in feng_shui_days]
+    
+    return columns
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against our ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+@router.get("/api/calendar/range")
+def get_calendar_range_api(
+    request: Request,
+    start: str = Query(...),
+    end: str = Query(...),
+    db: Session = Depends(get_db)
+):
+    """
+    Lunar dates, Can Chi, element, holidays and (for users with a birth date) scores for a date range
+    
+    The response is columnar: each field is an array with one entry per day from start to end.
+    It carries a strong ETag and answers a matching If-None-Match with 304 Not Modified.
+    """
+    try:
+        start_date = datetime.strptime(start, '%Y-%m-%d').date()
+        end_date = datetime.strptime(end, '%Y-%m-%d').date()
+    except ValueError:
+        return JSONResponse({"error": "Invalid date format"}, status_code=400)
+    
+    day_count = (end_date - start_date).days + 1
+    if day_count <= 0:
+        return JSONResponse({"error": "end must not be before start"}, status_code=400)
+    if day_count > settings.calendar_range_max_days:
+        return JSONResponse(
+            {"error": f"Range is limited to {settings.calendar_range_max_days} days"}, status_code=400
+        )
+    
+    current_user = session_service.get_current_user(request, db)
+    birth_date = current_user.birth_date if current_user else None
+    method = getattr(current_user, 'menh_calculation_method', 'can_chi')
+    
+    # The payload is a pure function of these inputs, so the ETag is known before building it;
+    # holiday re-syncs change the version and personal scores depend on the birth date and method
+    etag_source = "|".join(str(part) for part in (
+        RANGE_API_VERSION, start_date, end_date, HolidayService.get_version(db, start_date, end_date),
+        birth_date, method if birth_date else None
+    ))
+    headers = {
+        "ETag": f'"{hashlib.sha256(etag_source.encode("utf-8")).hexdigest()[:32]}"',
+        # Personal responses depend on the session, so they must stay in the browser cache
+        "Cache-Control": f"{'private' if birth_date else 'public'}, max-age={settings.calendar_range_max_age}",
+        "Vary": "Cookie"
+    }
+    
+    if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    
+    try:
+        columns = _build_range_columns(db, start_date, end_date, birth_date, method)
+    except ValueError:
+        # Outside the years supported by the lunar calendar
+        return JSONResponse({"error": "Date out of supported range"}, status_code=400)
+    
+    payload = {
+        "type": "personal" if birth_date else "general",
+        "start": start_date.strftime('%Y-%m-%d'),
+        "end": end_date.strftime('%Y-%m-%d'),
+        "days": day_count,
+        **columns
+    }
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -11,7 +11,7 @@ templates = Jinja2Templates(directory="app/templates")
 
 
 @router.get("/terms", response_class=HTMLResponse)
-async def terms_of_service(
+def terms_of_service(
     request: Request,
     db: Session = Depends(get_db)
 ):
@@ -28,7 +28,7 @@ async def terms_of_service(
 
 
 @router.get("/privacy", response_class=HTMLResponse)
-async def privacy_policy(
+def privacy_policy(
     request: Request,
     db: Session = Depends(get_db)
 ):
@@ -45,7 +45,7 @@ async def privacy_policy(
 
 
 @router.get("/owner", response_class=HTMLResponse)
-async def owner_info(
+def owner_info(
     request: Request,
     db: Session = Depends(get_db)
 ):
@@ -69,7 +69,7 @@ async def owner_info(
 
 
 @router.get("/domain-verification", response_class=HTMLResponse)
-async def domain_verification(
+def domain_verification(
     request: Request,
     db: Session = Depends(get_db)
 ):
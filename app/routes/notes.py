@@ -7,6 +7,7 @@ from typing import Optional
 from app.database import get_db
 from app.models.note import Note, CalendarType
 from app.services.lunar_calendar import LunarCalendarService
+from app.services.note_occurrence_service import NoteOccurrenceService
 from app.services.notification_service import NotificationService
 from app.services.session_service import session_service
 import logging
@@ -17,7 +18,7 @@ logger = logging.getLogger(__name__)
 
 
 @router.get("/notes", response_class=HTMLResponse)
-async def notes_list(
+def notes_list(
     request: Request,
     db: Session = Depends(get_db)
 ):
@@ -50,7 +51,7 @@ async def notes_list(
 
 
 @router.get("/notes/list", response_class=HTMLResponse)
-async def notes_list_htmx(
+def notes_list_htmx(
     request: Request,
     db: Session = Depends(get_db)
 ):
@@ -83,7 +84,7 @@ async def notes_list_htmx(
 
 
 @router.get("/notes/new", response_class=HTMLResponse)
-async def new_note_form(
+def new_note_form(
     request: Request,
     date_param: Optional[str] = Query(None, alias="date"),
     db: Session = Depends(get_db)
@@ -115,7 +116,7 @@ async def new_note_form(
 
 
 @router.post("/notes/new")
-async def create_note(
+def create_note(
     request: Request,
     title: str = Form(...),
     content: str = Form(""),
@@ -164,6 +165,7 @@ async def create_note(
         db.add(note)
         db.commit()
         db.refresh(note)
+        NoteOccurrenceService.sync_notes(db, [note])
         
         # Create notification schedule if enabled
         if enable_notification:
@@ -230,7 +232,7 @@ async def create_note(
 
 
 @router.get("/notes/{note_id}/edit", response_class=HTMLResponse)
-async def edit_note_redirect(
+def edit_note_redirect(
     request: Request,
     note_id: int,
     db: Session = Depends(get_db)
@@ -256,7 +258,7 @@ async def edit_note_redirect(
 
 
 @router.get("/notes/{note_id}/edit-form", response_class=HTMLResponse)
-async def edit_note_form_htmx(
+def edit_note_form_htmx(
     request: Request,
     note_id: int,
     db: Session = Depends(get_db)
@@ -288,7 +290,7 @@ async def edit_note_form_htmx(
 
 
 @router.post("/notes/{note_id}/edit")
-async def update_note(
+def update_note(
     request: Request,
     note_id: int,
     title: str = Form(...),
@@ -324,6 +326,7 @@ async def update_note(
         note.monthly_repeat = monthly_repeat
         
         db.commit()
+        NoteOccurrenceService.sync_notes(db, [note])
         
         # Recreate notification schedule if enabled
         # First, delete existing schedule
@@ -374,7 +377,7 @@ async def update_note(
 
 
 @router.delete("/notes/{note_id}")
-async def delete_note(
+def delete_note(
     request: Request,
     note_id: int,
     db: Session = Depends(get_db)
@@ -401,6 +404,7 @@ async def delete_note(
     # Soft delete
     note.is_active = False
     db.commit()
+    NoteOccurrenceService.sync_notes(db, [note])
     
     # Delete notification schedule
     from app.models.notification_schedule import NotificationSchedule
@@ -17,7 +17,7 @@ session_service = SessionService()
 
 
 @router.get("/notifications", response_class=HTMLResponse)
-async def notifications_list(
+def notifications_list(
     request: Request,
     db: Session = Depends(get_db)
 ):
@@ -45,7 +45,7 @@ async def notifications_list(
 
 
 @router.get("/notifications/stats")
-async def notification_schedule_stats(request: Request, db: Session = Depends(get_db)):
+def notification_schedule_stats(request: Request, db: Session = Depends(get_db)):
     """Get notification schedule statistics"""
     # Require authentication
     try:
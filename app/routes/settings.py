@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Request, Depends, Form, HTTPException
 from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.concurrency import run_in_threadpool
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 from app.database import get_db
@@ -13,7 +14,7 @@ templates = Jinja2Templates(directory="app/templates")
 
 
 @router.get("/settings", response_class=HTMLResponse)
-async def settings_page(
+def settings_page(
     request: Request,
     db: Session = Depends(get_db)
 ):
@@ -33,7 +34,7 @@ async def settings_page(
 
 
 @router.post("/settings/notifications")
-async def update_notification_settings(
+def update_notification_settings(
     request: Request,
     email_notifications: bool = Form(False),
     telegram_notifications: bool = Form(False),
@@ -59,6 +60,7 @@ async def update_notification_settings(
         current_user.telegram_notifications = False  # Disable if no chat ID
     
     db.commit()
+    session_service.invalidate_user(current_user.id)
     
     context = {
         "request": request,
@@ -75,9 +77,9 @@ async def test_telegram_settings(
     db: Session = Depends(get_db)
 ):
     """Test Telegram notification"""
-    # Require authentication
+    # Require authentication (off the event loop; the Telegram calls below are awaited)
     try:
-        current_user = session_service.require_auth(request, db)
+        current_user = await run_in_threadpool(session_service.require_auth, request, db)
     except HTTPException:
         return RedirectResponse(url="/login", status_code=302)
     
@@ -117,7 +119,7 @@ async def test_telegram_settings(
 
 
 @router.post("/settings/menh-method", response_class=HTMLResponse)
-async def update_menh_method(
+def update_menh_method(
     request: Request,
     menh_method: str = Form(...),
     db: Session = Depends(get_db)
@@ -133,6 +135,7 @@ async def update_menh_method(
         # Cập nhật phương pháp tính mệnh
         current_user.menh_calculation_method = menh_method
         db.commit()
+        session_service.invalidate_user(current_user.id)
         
         # Lấy thông tin so sánh để hiển thị
         if current_user.birth_date:
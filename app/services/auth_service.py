@@ -7,6 +7,7 @@ from datetime import datetime, date
 from typing import Optional, Dict, Any, Tuple
 from app.config import settings
 from app.models.user import User
+from app.services.session_service import session_service
 from app.logging_config import get_logger
 import secrets
 
@@ -200,6 +201,7 @@ class GoogleAuthService:
         
         db.commit()
         db.refresh(user)
+        session_service.invalidate_user(user.id)
         
         return user
     
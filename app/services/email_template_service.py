@@ -0,0 +1,62 @@
+import os
+from typing import Dict, Iterable, List
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+import logging
+
+logger = logging.getLogger(__name__)
+
+EMAIL_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates', 'email')
+
+SIMPLE_NOTIFICATION_TEMPLATE = 'simple_notification.html'
+NOTIFICATION_TEMPLATE = 'notification_template.html'
+
+
+class EmailTemplateService:
+    """Render email templates from one shared, precompiled Jinja environment"""
+
+    PRECOMPILED_TEMPLATES = (SIMPLE_NOTIFICATION_TEMPLATE, NOTIFICATION_TEMPLATE)
+
+    def __init__(self, template_dir: str = EMAIL_TEMPLATE_DIR, bytecode_cache_dir: str = None):
+        # auto_reload=False: templates are only read and compiled once per process;
+        # the bytecode cache lets new worker processes skip compilation as well
+        self.env = Environment(
+            loader=FileSystemLoader(template_dir),
+            bytecode_cache=FileSystemBytecodeCache(bytecode_cache_dir),
+            auto_reload=False
+        )
+        self._templates: Dict[str, Template] = {}
+
+        for name in self.PRECOMPILED_TEMPLATES:
+            try:
+                self._templates[name] = self.env.get_template(name)
+            except Exception as e:
+                logger.warning(f"Could not precompile email template {name}: {e}")
+
+    def get_template(self, name: str) -> Template:
+        template = self._templates.get(name)
+        if template is None:
+            template = self.env.get_template(name)
+            self._templates[name] = template
+        return template
+
+    def render(self, name: str, **context) -> str:
+        """Render one template with the given context"""
+        return self.get_template(name).render(**context)
+
+    def render_many(self, name: str, contexts: Iterable[Dict]) -> List[str]:
+        """
+        Render the same template for many messages
+
+        Args:
+            name: Template file name inside templates/email
+            contexts: One context dictionary per message
+
+        Returns:
+            Rendered HTML bodies, in input order
+        """
+        template = self.get_template(name)
+        return [template.render(**context) for context in contexts]
+
+
+# Global instance
+email_template_service = EmailTemplateService()
@@ -1,8 +1,14 @@
 from datetime import date, datetime, timedelta
-from typing import Dict, List, Tuple, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Tuple, Optional
 from enum import Enum
 
 
+# One entry per (birth-year element, method, day in the 60-day cycle)
+PERSONAL_CYCLE_CACHE_SIZE = 5 * 2 * 60
+
+
 class Element(Enum):
     """Ngũ hành - Five Elements"""
     WOOD = "Mộc"      # Wood
@@ -84,6 +90,165 @@ class FengShuiService:
         "Quý": "Bắc Đông"
     }
     
+    # Hoạt động may mắn theo ngũ hành của ngày
+    LUCKY_ACTIVITIES = {
+        Element.WOOD: (
+            "Trồng cây, làm vườn",
+            "Học tập, đọc sách", 
+            "Khởi nghiệp, bắt đầu dự án mới",
+            "Gặp gỡ bạn bè, mở rộng mối quan hệ",
+            "Tập thể dục, yoga"
+        ),
+        Element.FIRE: (
+            "Tổ chức sự kiện, tiệc tùng",
+            "Thuyết trình, diễn thuyết",
+            "Sáng tạo nghệ thuật",
+            "Kết hôn, đính hôn", 
+            "Quảng cáo, marketing"
+        ),
+        Element.EARTH: (
+            "Mua bán bất động sản",
+            "Xây dựng, sửa chữa nhà cửa",
+            "Đầu tư tài chính",
+            "Ký hợp đồng quan trọng",
+            "Tích trữ, tiết kiệm"
+        ),
+        Element.METAL: (
+            "Cắt tóc, làm đẹp",
+            "Mua sắm trang sức, đồ kim loại",
+            "Phẫu thuật, điều trị y tế",
+            "Tổ chức, sắp xếp công việc",
+            "Đàm phán, thương lượng"
+        ),
+        Element.WATER: (
+            "Du lịch, khám phá",
+            "Tắm biển, bơi lội",
+            "Thiền định, tĩnh tâm",
+            "Nghiên cứu, tìm hiểu sâu",
+            "Làm từ thiện, giúp đỡ người khác"
+        )
+    }
+    
+    # Hoạt động nên tránh theo ngũ hành của ngày
+    UNLUCKY_ACTIVITIES = {
+        Element.WOOD: (
+            "Đốn cây, phá hoại cây xanh",
+            "Sử dụng nhiều đồ kim loại sắc bén",
+            "Cãi vã, tranh chấp",
+            "Làm việc quá sức"
+        ),
+        Element.FIRE: (
+            "Tiếp xúc với nước lạnh",
+            "Ở nơi ẩm ướt",
+            "Tránh các hoạt động tĩnh lặng",
+            "Không nên quá khiêm tốn"
+        ),
+        Element.EARTH: (
+            "Trồng cây trong nhà",
+            "Hoạt động ngoài trời khi có gió lớn",
+            "Thay đổi đột ngột",
+            "Quyết định vội vàng"
+        ),
+        Element.METAL: (
+            "Tiếp xúc với lửa mạnh",
+            "Hoạt động thể chất quá mức",
+            "Cãi vã, xung đột",
+            "Ăn uống cay nóng"
+        ),
+        Element.WATER: (
+            "Ở nơi khô hanh",
+            "Hoạt động dưới ánh nắng gắt",
+            "Vội vàng, nóng nảy",
+            "Tiêu xài hoang phí"
+        )
+    }
+    
+    # Khung giờ của từng Địa Chi
+    HOUR_RANGES = {
+        "Tý": (23, 1), "Sửu": (1, 3), "Dần": (3, 5), "Mão": (5, 7),
+        "Thìn": (7, 9), "Tỵ": (9, 11), "Ngọ": (11, 13), "Mùi": (13, 15),
+        "Thân": (15, 17), "Dậu": (17, 19), "Tuất": (19, 21), "Hợi": (21, 23)
+    }
+    
+    # Bảng xung khắc 12 con giáp
+    CONFLICTING_CHI = {
+        "Tý": ("Ngọ",),      # Chuột xung Ngựa
+        "Sửu": ("Mùi",),     # Trâu xung Dê  
+        "Dần": ("Thân",),    # Hổ xung Khỉ
+        "Mão": ("Dậu",),     # Mèo xung Gà
+        "Thìn": ("Tuất",),   # Rồng xung Chó
+        "Tỵ": ("Hợi",),      # Rắn xung Heo
+        "Ngọ": ("Tý",),      # Ngựa xung Chuột
+        "Mùi": ("Sửu",),     # Dê xung Trâu
+        "Thân": ("Dần",),    # Khỉ xung Hổ
+        "Dậu": ("Mão",),     # Gà xung Mèo
+        "Tuất": ("Thìn",),   # Chó xung Rồng
+        "Hợi": ("Tỵ",)       # Heo xung Rắn
+    }
+    
+    # Chu trình tương sinh: Mộc → Hỏa → Thổ → Kim → Thủy → Mộc
+    GENERATION_CYCLE = (Element.WOOD, Element.FIRE, Element.EARTH, Element.METAL, Element.WATER)
+    
+    # Chu trình tương khắc: Mộc → Thổ → Thủy → Hỏa → Kim → Mộc
+    DESTRUCTION_CYCLE = (Element.WOOD, Element.EARTH, Element.WATER, Element.FIRE, Element.METAL)
+    
+    # Bảng Nạp Âm theo chu kỳ 60 năm, bắt đầu từ năm Giáp Tý 1984
+    # Mỗi cặp Can Chi liền nhau có cùng mệnh
+    CYCLE_START_YEAR = 1984
+    NAP_AM_PAIRS = (
+        (Element.METAL, "Kim hải trung"),       # Giáp Tý, Ất Sửu
+        (Element.FIRE, "Hỏa lư trung"),         # Bính Dần, Đinh Mão
+        (Element.EARTH, "Thổ thành đầu"),       # Mậu Thìn, Kỷ Tỵ
+        (Element.METAL, "Kim bạch lạp"),        # Canh Ngọ, Tân Mùi
+        (Element.WATER, "Thủy dương liễu"),     # Nhâm Thân, Quý Dậu (xem NAP_AM_OVERRIDES)
+        (Element.FIRE, "Hỏa sơn đầu"),          # Giáp Tuất, Ất Hợi
+        (Element.EARTH, "Thổ ốc trung"),        # Bính Tý, Đinh Sửu
+        (Element.METAL, "Kim sa trung"),        # Mậu Dần, Kỷ Mão
+        (Element.EARTH, "Thổ lộ bàng"),         # Canh Thìn, Tân Tỵ
+        (Element.METAL, "Kim kim bạc"),         # Nhâm Ngọ, Quý Mùi
+        (Element.WATER, "Thủy tuyền trung"),    # Giáp Thân, Ất Dậu
+        (Element.FIRE, "Hỏa sơn hạ"),           # Bính Tuất, Đinh Hợi
+        (Element.EARTH, "Thổ tích lịch"),       # Mậu Tý, Kỷ Sửu
+        (Element.WOOD, "Mộc thành đầu"),        # Canh Dần, Tân Mão
+        (Element.WATER, "Thủy trường lưu"),     # Nhâm Thìn, Quý Tỵ
+        (Element.FIRE, "Hỏa sa trung"),         # Giáp Ngọ, Ất Mùi
+        (Element.FIRE, "Hỏa sơn hạ"),           # Bính Thân, Đinh Dậu
+        (Element.WOOD, "Mộc bình địa"),         # Mậu Tuất, Kỷ Hợi
+        (Element.EARTH, "Thổ tích lịch"),       # Canh Tý, Tân Sửu
+        (Element.METAL, "Kim kim bạc"),         # Nhâm Dần, Quý Mão
+        (Element.FIRE, "Hỏa phúc đăng"),        # Giáp Thìn, Ất Tỵ
+        (Element.WATER, "Thủy thiên hà"),       # Bính Ngọ, Đinh Mùi
+        (Element.EARTH, "Thổ đại trạch"),       # Mậu Thân, Kỷ Dậu
+        (Element.METAL, "Kim thoa xuyến"),      # Canh Tuất, Tân Hợi
+        (Element.WOOD, "Mộc tang đố"),          # Nhâm Tý, Quý Sửu
+        (Element.WATER, "Thủy đại khê"),        # Giáp Dần, Ất Mão
+        (Element.EARTH, "Thổ sa trung"),        # Bính Thìn, Đinh Tỵ
+        (Element.FIRE, "Hỏa thiên thượng"),     # Mậu Ngọ, Kỷ Mùi
+        (Element.WOOD, "Mộc thạch lựu"),        # Canh Thân, Tân Dậu
+        (Element.WATER, "Thủy đại hải")         # Nhâm Tuất, Quý Hợi
+    )
+    NAP_AM_TABLE = tuple(nap_am for nap_am in NAP_AM_PAIRS for _ in range(2))
+    # Giữ nguyên kết quả của bảng cũ: 1992/1993 là Kim kiếm phong, các năm Nhâm Thân/Quý Dậu
+    # khác là Thủy dương liễu. Việc thống nhất hai giá trị này cần một thay đổi riêng.
+    NAP_AM_OVERRIDES = {
+        1992: (Element.METAL, "Kim kiếm phong"),
+        1993: (Element.METAL, "Kim kiếm phong"),
+    }
+    
+    # Dựng sẵn khi import (xem cuối file)
+    ELEMENT_RELATIONSHIPS: Dict[Element, Dict[str, Tuple[Element, ...]]] = {}
+    COMPATIBILITY_MATRIX: Dict[Tuple[Element, Element], Tuple[int, str]] = {}
+    DAY_PROFILES: Tuple[Mapping, ...] = ()
+    
+    # Tóm tắt ngũ hành ngày (dùng cho calendar view)
+    ELEMENT_SUMMARIES = {
+        Element.WOOD: "Mộc - Tốt cho học tập",
+        Element.FIRE: "Hỏa - Tốt cho sự kiện", 
+        Element.EARTH: "Thổ - Tốt cho đầu tư",
+        Element.METAL: "Kim - Tốt cho làm đẹp",
+        Element.WATER: "Thủy - Tốt cho du lịch"
+    }
+    
     # Baseline date for Can Chi calculation (1/1/1900 = Kỷ Hợi)
     BASELINE_DATE = date(1900, 1, 1)
     BASELINE_THIEN_CAN_INDEX = 5  # Kỷ (index 5 in THIEN_CAN)
@@ -115,176 +280,14 @@ class FengShuiService:
         Returns: (element, description)
         """
         year = birth_date.year
-        
-        # Bảng Nạp Âm chính xác theo phong thủy truyền thống
-        # Mỗi cặp Can Chi có cùng mệnh, chu kỳ 60 năm
-        nap_am_table = {
-            # 1924-1925: Giáp Tý, Ất Sửu
-            1924: (Element.METAL, "Kim hải trung"),
-            1925: (Element.METAL, "Kim hải trung"),
-            # 1926-1927: Bính Dần, Đinh Mão  
-            1926: (Element.FIRE, "Hỏa lư trung"),
-            1927: (Element.FIRE, "Hỏa lư trung"),
-            # 1928-1929: Mậu Thìn, Kỷ Tỵ
-            1928: (Element.EARTH, "Thổ thành đầu"),
-            1929: (Element.EARTH, "Thổ thành đầu"),
-            # 1930-1931: Canh Ngọ, Tân Mùi
-            1930: (Element.METAL, "Kim bạch lạp"),
-            1931: (Element.METAL, "Kim bạch lạp"),
-            # 1932-1933: Nhâm Thân, Quý Dậu
-            1932: (Element.WATER, "Thủy dương liễu"),
-            1933: (Element.WATER, "Thủy dương liễu"),
-            # 1934-1935: Giáp Tuất, Ất Hợi
-            1934: (Element.FIRE, "Hỏa sơn đầu"),
-            1935: (Element.FIRE, "Hỏa sơn đầu"),
-            # 1936-1937: Bính Tý, Đinh Sửu
-            1936: (Element.EARTH, "Thổ ốc trung"),
-            1937: (Element.EARTH, "Thổ ốc trung"),
-            # 1938-1939: Mậu Dần, Kỷ Mão
-            1938: (Element.METAL, "Kim sa trung"),
-            1939: (Element.METAL, "Kim sa trung"),
-            # 1940-1941: Canh Thìn, Tân Tỵ
-            1940: (Element.EARTH, "Thổ lộ bàng"),
-            1941: (Element.EARTH, "Thổ lộ bàng"),
-            # 1942-1943: Nhâm Ngọ, Quý Mùi
-            1942: (Element.METAL, "Kim kim bạc"),
-            1943: (Element.METAL, "Kim kim bạc"),
-            # 1944-1945: Giáp Thân, Ất Dậu
-            1944: (Element.WATER, "Thủy tuyền trung"),
-            1945: (Element.WATER, "Thủy tuyền trung"),
-            # 1946-1947: Bính Tuất, Đinh Hợi
-            1946: (Element.FIRE, "Hỏa sơn hạ"),
-            1947: (Element.FIRE, "Hỏa sơn hạ"),
-            # 1948-1949: Mậu Tý, Kỷ Sửu
-            1948: (Element.EARTH, "Thổ tích lịch"),
-            1949: (Element.EARTH, "Thổ tích lịch"),
-            # 1950-1951: Canh Dần, Tân Mão
-            1950: (Element.WOOD, "Mộc thành đầu"),
-            1951: (Element.WOOD, "Mộc thành đầu"),
-            # 1952-1953: Nhâm Thìn, Quý Tỵ
-            1952: (Element.WATER, "Thủy trường lưu"),
-            1953: (Element.WATER, "Thủy trường lưu"),
-            # 1954-1955: Giáp Ngọ, Ất Mùi
-            1954: (Element.FIRE, "Hỏa sa trung"),
-            1955: (Element.FIRE, "Hỏa sa trung"),
-            # 1956-1957: Bính Thân, Đinh Dậu
-            1956: (Element.FIRE, "Hỏa sơn hạ"),
-            1957: (Element.FIRE, "Hỏa sơn hạ"),
-            # 1958-1959: Mậu Tuất, Kỷ Hợi
-            1958: (Element.WOOD, "Mộc bình địa"),
-            1959: (Element.WOOD, "Mộc bình địa"),
-            # 1960-1961: Canh Tý, Tân Sửu
-            1960: (Element.EARTH, "Thổ tích lịch"),
-            1961: (Element.EARTH, "Thổ tích lịch"),
-            # 1962-1963: Nhâm Dần, Quý Mão
-            1962: (Element.METAL, "Kim kim bạc"),
-            1963: (Element.METAL, "Kim kim bạc"),
-            # 1964-1965: Giáp Thìn, Ất Tỵ
-            1964: (Element.FIRE, "Hỏa phúc đăng"),
-            1965: (Element.FIRE, "Hỏa phúc đăng"),
-            # 1966-1967: Bính Ngọ, Đinh Mùi
-            1966: (Element.WATER, "Thủy thiên hà"),
-            1967: (Element.WATER, "Thủy thiên hà"),
-            # 1968-1969: Mậu Thân, Kỷ Dậu
-            1968: (Element.EARTH, "Thổ đại trạch"),
-            1969: (Element.EARTH, "Thổ đại trạch"),
-            # 1970-1971: Canh Tuất, Tân Hợi
-            1970: (Element.METAL, "Kim thoa xuyến"),
-            1971: (Element.METAL, "Kim thoa xuyến"),
-            # 1972-1973: Nhâm Tý, Quý Sửu
-            1972: (Element.WOOD, "Mộc tang đố"),
-            1973: (Element.WOOD, "Mộc tang đố"),
-            # 1974-1975: Giáp Dần, Ất Mão
-            1974: (Element.WATER, "Thủy đại khê"),
-            1975: (Element.WATER, "Thủy đại khê"),
-            # 1976-1977: Bính Thìn, Đinh Tỵ
-            1976: (Element.EARTH, "Thổ sa trung"),
-            1977: (Element.EARTH, "Thổ sa trung"),
-            # 1978-1979: Mậu Ngọ, Kỷ Mùi
-            1978: (Element.FIRE, "Hỏa thiên thượng"),
-            1979: (Element.FIRE, "Hỏa thiên thượng"),
-            # 1980-1981: Canh Thân, Tân Dậu
-            1980: (Element.WOOD, "Mộc thạch lựu"),
-            1981: (Element.WOOD, "Mộc thạch lựu"),
-            # 1982-1983: Nhâm Tuất, Quý Hợi
-            1982: (Element.WATER, "Thủy đại hải"),
-            1983: (Element.WATER, "Thủy đại hải"),
-            # 1984-1985: Giáp Tý, Ất Sửu (chu kỳ mới)
-            1984: (Element.METAL, "Kim hải trung"),
-            1985: (Element.METAL, "Kim hải trung"),
-            # 1986-1987: Bính Dần, Đinh Mão
-            1986: (Element.FIRE, "Hỏa lư trung"),
-            1987: (Element.FIRE, "Hỏa lư trung"),
-            # 1988-1989: Mậu Thìn, Kỷ Tỵ
-            1988: (Element.EARTH, "Thổ thành đầu"),
-            1989: (Element.EARTH, "Thổ thành đầu"),
-            # 1990-1991: Canh Ngọ, Tân Mùi
-            1990: (Element.METAL, "Kim bạch lạp"),
-            1991: (Element.METAL, "Kim bạch lạp"),
-            # 1992-1993: Nhâm Thân, Quý Dậu - QUAN TRỌNG!
-            1992: (Element.METAL, "Kim kiếm phong"),
-            1993: (Element.METAL, "Kim kiếm phong"),
-            # 1994-1995: Giáp Tuất, Ất Hợi
-            1994: (Element.FIRE, "Hỏa sơn đầu"),
-            1995: (Element.FIRE, "Hỏa sơn đầu"),
-            # 1996-1997: Bính Tý, Đinh Sửu
-            1996: (Element.EARTH, "Thổ ốc trung"),
-            1997: (Element.EARTH, "Thổ ốc trung"),
-            # 1998-1999: Mậu Dần, Kỷ Mão
-            1998: (Element.METAL, "Kim sa trung"),
-            1999: (Element.METAL, "Kim sa trung"),
-            # 2000-2001: Canh Thìn, Tân Tỵ
-            2000: (Element.EARTH, "Thổ lộ bàng"),
-            2001: (Element.EARTH, "Thổ lộ bàng"),
-            # 2002-2003: Nhâm Ngọ, Quý Mùi
-            2002: (Element.METAL, "Kim kim bạc"),
-            2003: (Element.METAL, "Kim kim bạc"),
-            # 2004-2005: Giáp Thân, Ất Dậu
-            2004: (Element.WATER, "Thủy tuyền trung"),
-            2005: (Element.WATER, "Thủy tuyền trung"),
-            # 2006-2007: Bính Tuất, Đinh Hợi
-            2006: (Element.FIRE, "Hỏa sơn hạ"),
-            2007: (Element.FIRE, "Hỏa sơn hạ"),
-            # 2008-2009: Mậu Tý, Kỷ Sửu
-            2008: (Element.EARTH, "Thổ tích lịch"),
-            2009: (Element.EARTH, "Thổ tích lịch"),
-            # 2010-2011: Canh Dần, Tân Mão
-            2010: (Element.WOOD, "Mộc thành đầu"),
-            2011: (Element.WOOD, "Mộc thành đầu"),
-            # 2012-2013: Nhâm Thìn, Quý Tỵ
-            2012: (Element.WATER, "Thủy trường lưu"),
-            2013: (Element.WATER, "Thủy trường lưu"),
-            # 2014-2015: Giáp Ngọ, Ất Mùi
-            2014: (Element.FIRE, "Hỏa sa trung"),
-            2015: (Element.FIRE, "Hỏa sa trung"),
-            # 2016-2017: Bính Thân, Đinh Dậu
-            2016: (Element.FIRE, "Hỏa sơn hạ"),
-            2017: (Element.FIRE, "Hỏa sơn hạ"),
-            # 2018-2019: Mậu Tuất, Kỷ Hợi
-            2018: (Element.WOOD, "Mộc bình địa"),
-            2019: (Element.WOOD, "Mộc bình địa"),
-            # 2020-2021: Canh Tý, Tân Sửu
-            2020: (Element.EARTH, "Thổ tích lịch"),
-            2021: (Element.EARTH, "Thổ tích lịch"),
-            # 2022-2023: Nhâm Dần, Quý Mão
-            2022: (Element.METAL, "Kim kim bạc"),
-            2023: (Element.METAL, "Kim kim bạc"),
-            # 2024-2025: Giáp Thìn, Ất Tỵ
-            2024: (Element.FIRE, "Hỏa phúc đăng"),
-            2025: (Element.FIRE, "Hỏa phúc đăng"),
-        }
-        
-        # Tra bảng trực tiếp
-        if year in nap_am_table:
-            return nap_am_table[year]
-        
-        # Nếu không có trong bảng, tính theo chu kỳ 60 năm
-        cycle_year = ((year - 1924) % 60) + 1924
-        if cycle_year in nap_am_table:
-            return nap_am_table[cycle_year]
-        
-        # Fallback
-        return (Element.EARTH, "Thổ")
+        if year in FengShuiService.NAP_AM_OVERRIDES:
+            return FengShuiService.NAP_AM_OVERRIDES[year]
+        return FengShuiService.NAP_AM_TABLE[FengShuiService.get_year_cycle_index(year)]
+    
+    @staticmethod
+    def get_year_cycle_index(year: int) -> int:
+        """Vị trí của năm trong chu kỳ 60 năm Can Chi (0 = Giáp Tý)"""
+        return (year - FengShuiService.CYCLE_START_YEAR) % 60
     
     @staticmethod
     def get_birth_zodiac(birth_date: date) -> Tuple[str, Element]:
@@ -314,50 +317,54 @@ class FengShuiService:
         user_year_element, user_year_desc = FengShuiService.get_birth_year_element_by_method(user_birth_date, method)
         user_zodiac, user_zodiac_element = FengShuiService.get_birth_zodiac(user_birth_date)
         
-        # Lấy ngũ hành ngày cần xem
-        day_element = FengShuiService.get_daily_element(target_date)
-        day_thien_can, day_dia_chi, _, day_dia_chi_element = FengShuiService.calculate_can_chi(target_date)
-        
-        # Tính tương thích giữa ngũ hành năm sinh và ngày
-        year_day_relationships = FengShuiService.get_element_relationships(user_year_element)
-        
-        # Điểm tương thích cơ bản
-        compatibility_score = 50  # Điểm trung bình
-        compatibility_level = "Trung bình"
-        
-        if day_element in year_day_relationships["harmonious"]:
-            compatibility_score += 30
-            compatibility_level = "Tốt"
-        elif day_element in year_day_relationships["conflicting"]:
-            compatibility_score -= 20
-            compatibility_level = "Kém"
-        
-        # Bonus nếu ngũ hành ngày sinh ra ngũ hành năm sinh (được hỗ trợ)
-        if day_element in year_day_relationships["generated_by"]:
-            compatibility_score += 20
-            compatibility_level = "Rất tốt"
-        
-        # Penalty nếu ngũ hành ngày khắc ngũ hành năm sinh
-        if day_element in year_day_relationships["destroyed_by"]:
-            compatibility_score -= 30
-            compatibility_level = "Rất kém"
-        
-        # Giới hạn điểm từ 0-100
-        compatibility_score = max(0, min(100, compatibility_score))
-        
+        cycle_advice = FengShuiService._get_personal_cycle_advice(
+            user_year_element, method, FengShuiService.get_day_cycle_index(target_date)
+        )
+        return FengShuiService._build_compatibility(cycle_advice, user_year_element, user_year_desc, user_zodiac)
+    
+    @staticmethod
+    def _build_compatibility(cycle_advice: Mapping, user_year_element: Element, user_year_desc: str,
+                             user_zodiac: str) -> Dict:
         return {
-            "score": compatibility_score,
-            "level": compatibility_level,
+            "score": cycle_advice["score"],
+            "level": cycle_advice["level"],
             "user_year_element": user_year_element.value,
             "user_year_desc": user_year_desc,
             "user_zodiac": user_zodiac,
-            "day_element": day_element.value,
-            "day_can_chi": f"{day_thien_can} {day_dia_chi}",
-            "analysis": FengShuiService._get_compatibility_analysis(
-                user_year_element, day_element, compatibility_score
-            )
+            "day_element": cycle_advice["day_element"],
+            "day_can_chi": cycle_advice["day_can_chi"],
+            "analysis": cycle_advice["analysis"]
         }
     
+    @staticmethod
+    @lru_cache(maxsize=PERSONAL_CYCLE_CACHE_SIZE)
+    def _get_personal_cycle_advice(user_element: Element, method: str, cycle_index: int) -> Mapping:
+        """
+        Phần lời khuyên cá nhân chỉ phụ thuộc vào mệnh và vị trí ngày trong chu kỳ 60 ngày
+        (tối đa 5 mệnh x 2 phương pháp x 60 ngày); ngày sinh nhật và ngày cụ thể được ghép theo từng lần gọi
+        """
+        day_profile = FengShuiService.DAY_PROFILES[cycle_index]
+        day_element = day_profile["element"]
+        score, level = FengShuiService._score_elements(user_element, day_element)
+        activities = FengShuiService._get_personal_activities(user_element, day_element, score)
+        
+        return MappingProxyType({
+            "score": score,
+            "level": level,
+            "day_element": day_element.value,
+            "day_can_chi": day_profile["can_chi"],
+            "analysis": FengShuiService._get_compatibility_analysis(user_element, day_element, score),
+            "recommended": tuple(activities["recommended"]),
+            "avoid": tuple(activities["avoid"]),
+            "colors": tuple(FengShuiService._get_personal_colors(user_element, day_element)),
+            "overall_advice": FengShuiService._get_overall_advice(score)
+        })
+    
+    @staticmethod
+    def _score_elements(user_element: Element, day_element: Element) -> Tuple[int, str]:
+        """Điểm và mức tương thích giữa mệnh năm sinh và ngũ hành ngày"""
+        return FengShuiService.COMPATIBILITY_MATRIX[(user_element, day_element)]
+    
     @staticmethod
     def _get_compatibility_analysis(user_element: Element, day_element: Element, score: int) -> str:
         """Phân tích chi tiết về tương thích"""
@@ -379,22 +386,20 @@ class FengShuiService:
             target_date: Ngày cần xem
             method: Phương pháp tính mệnh ("can_chi" hoặc "nap_am")
         """
-        # Tính tương thích
-        compatibility = FengShuiService.calculate_compatibility_score(user_birth_date, target_date, method)
-        
         # Lấy thông tin cơ bản
         user_year_element, user_year_desc = FengShuiService.get_birth_year_element_by_method(user_birth_date, method)
         user_zodiac, user_zodiac_element = FengShuiService.get_birth_zodiac(user_birth_date)
         
-        # Lấy thông tin ngày
-        day_analysis = FengShuiService.get_daily_feng_shui_analysis(target_date)
-        
-        # Lời khuyên cá nhân hóa
-        personal_activities = FengShuiService._get_personal_activities(
-            user_year_element, day_analysis["element"], compatibility["score"]
+        # Phần phụ thuộc vào (mệnh, phương pháp, vị trí ngày trong chu kỳ 60) được cache
+        cycle_advice = FengShuiService._get_personal_cycle_advice(
+            user_year_element, method, FengShuiService.get_day_cycle_index(target_date)
+        )
+        compatibility = FengShuiService._build_compatibility(
+            cycle_advice, user_year_element, user_year_desc, user_zodiac
         )
         
-        personal_colors = FengShuiService._get_personal_colors(user_year_element, day_analysis["element"])
+        # Lấy thông tin ngày
+        day_analysis = FengShuiService.get_daily_feng_shui_analysis(target_date)
         
         # Kiểm tra sinh nhật
         is_birthday = (user_birth_date.month == target_date.month and 
@@ -418,9 +423,12 @@ class FengShuiService:
             },
             "day_info": day_analysis,
             "personal_advice": {
-                "activities": personal_activities,
-                "colors": personal_colors,
-                "overall_advice": FengShuiService._get_overall_advice(compatibility["score"])
+                "activities": {
+                    "recommended": list(cycle_advice["recommended"]),
+                    "avoid": list(cycle_advice["avoid"])
+                },
+                "colors": list(cycle_advice["colors"]),
+                "overall_advice": cycle_advice["overall_advice"]
             },
             "birthday_reminder": birthday_reminder
         }
@@ -428,11 +436,11 @@ class FengShuiService:
     @staticmethod
     def _get_personal_activities(user_element: Element, day_element: Element, score: int) -> Dict:
         """Lấy hoạt động cá nhân hóa dựa trên mệnh và điểm tương thích"""
-        base_activities = FengShuiService.get_lucky_activities(day_element)
-        base_avoid = FengShuiService.get_unlucky_activities(day_element)
+        base_activities = FengShuiService.LUCKY_ACTIVITIES.get(day_element, ())
+        base_avoid = FengShuiService.UNLUCKY_ACTIVITIES.get(day_element, ())
         
         # Điều chỉnh dựa trên mệnh cá nhân
-        user_relationships = FengShuiService.get_element_relationships(user_element)
+        user_relationships = FengShuiService.ELEMENT_RELATIONSHIPS[user_element]
         
         recommended = []
         avoid = []
@@ -499,192 +507,48 @@ class FengShuiService:
         """
         Lấy mối quan hệ tương sinh và tương khắc của một ngũ hành
         """
-        # Chu trình tương sinh: Mộc → Hỏa → Thổ → Kim → Thủy → Mộc
-        generation_cycle = [Element.WOOD, Element.FIRE, Element.EARTH, Element.METAL, Element.WATER]
-        
-        # Chu trình tương khắc: Mộc → Thổ → Thủy → Hỏa → Kim → Mộc  
-        destruction_cycle = [Element.WOOD, Element.EARTH, Element.WATER, Element.FIRE, Element.METAL]
-        
-        current_index = generation_cycle.index(element)
-        
-        # Tương sinh: element sinh ra gì, gì sinh ra element
-        generates = generation_cycle[(current_index + 1) % 5]  # Element sinh ra
-        generated_by = generation_cycle[(current_index - 1) % 5]  # Gì sinh ra element
-        
-        # Tương khắc: element khắc gì, gì khắc element
-        current_dest_index = destruction_cycle.index(element)
-        destroys = destruction_cycle[(current_dest_index + 1) % 5]  # Element khắc gì
-        destroyed_by = destruction_cycle[(current_dest_index - 1) % 5]  # Gì khắc element
-        
-        return {
-            "generates": [generates],  # Tương sinh
-            "generated_by": [generated_by],
-            "destroys": [destroys],  # Tương khắc
-            "destroyed_by": [destroyed_by],
-            "harmonious": [generated_by, generates],  # Hài hòa
-            "conflicting": [destroyed_by, destroys]  # Xung khắc
-        }
+        return {name: list(elements) for name, elements in FengShuiService.ELEMENT_RELATIONSHIPS[element].items()}
     
     @staticmethod
     def get_lucky_activities(element: Element) -> List[str]:
         """Lấy các hoạt động may mắn theo ngũ hành của ngày"""
-        activities = {
-            Element.WOOD: [
-                "Trồng cây, làm vườn",
-                "Học tập, đọc sách", 
-                "Khởi nghiệp, bắt đầu dự án mới",
-                "Gặp gỡ bạn bè, mở rộng mối quan hệ",
-                "Tập thể dục, yoga"
-            ],
-            Element.FIRE: [
-                "Tổ chức sự kiện, tiệc tùng",
-                "Thuyết trình, diễn thuyết",
-                "Sáng tạo nghệ thuật",
-                "Kết hôn, đính hôn", 
-                "Quảng cáo, marketing"
-            ],
-            Element.EARTH: [
-                "Mua bán bất động sản",
-                "Xây dựng, sửa chữa nhà cửa",
-                "Đầu tư tài chính",
-                "Ký hợp đồng quan trọng",
-                "Tích trữ, tiết kiệm"
-            ],
-            Element.METAL: [
-                "Cắt tóc, làm đẹp",
-                "Mua sắm trang sức, đồ kim loại",
-                "Phẫu thuật, điều trị y tế",
-                "Tổ chức, sắp xếp công việc",
-                "Đàm phán, thương lượng"
-            ],
-            Element.WATER: [
-                "Du lịch, khám phá",
-                "Tắm biển, bơi lội",
-                "Thiền định, tĩnh tâm",
-                "Nghiên cứu, tìm hiểu sâu",
-                "Làm từ thiện, giúp đỡ người khác"
-            ]
-        }
-        return activities.get(element, [])
+        return list(FengShuiService.LUCKY_ACTIVITIES.get(element, ()))
     
     @staticmethod
     def get_unlucky_activities(element: Element) -> List[str]:
         """Lấy các hoạt động nên tránh theo ngũ hành của ngày"""
-        relationships = FengShuiService.get_element_relationships(element)
-        conflicting_elements = relationships["conflicting"]
-        
-        # Hoạt động nên tránh dựa trên ngũ hành xung khắc
-        avoid_activities = {
-            Element.WOOD: [
-                "Đốn cây, phá hoại cây xanh",
-                "Sử dụng nhiều đồ kim loại sắc bén",
-                "Cãi vã, tranh chấp",
-                "Làm việc quá sức"
-            ],
-            Element.FIRE: [
-                "Tiếp xúc với nước lạnh",
-                "Ở nơi ẩm ướt",
-                "Tránh các hoạt động tĩnh lặng",
-                "Không nên quá khiêm tốn"
-            ],
-            Element.EARTH: [
-                "Trồng cây trong nhà",
-                "Hoạt động ngoài trời khi có gió lớn",
-                "Thay đổi đột ngột",
-                "Quyết định vội vàng"
-            ],
-            Element.METAL: [
-                "Tiếp xúc với lửa mạnh",
-                "Hoạt động thể chất quá mức",
-                "Cãi vã, xung đột",
-                "Ăn uống cay nóng"
-            ],
-            Element.WATER: [
-                "Ở nơi khô hanh",
-                "Hoạt động dưới ánh nắng gắt",
-                "Vội vàng, nóng nảy",
-                "Tiêu xài hoang phí"
-            ]
-        }
-        return avoid_activities.get(element, [])
+        return list(FengShuiService.UNLUCKY_ACTIVITIES.get(element, ()))
     
     @staticmethod
     def get_lucky_hours(target_date: date) -> List[Dict]:
         """Lấy các giờ hoàng đạo trong ngày"""
-        _, dia_chi, _, _ = FengShuiService.calculate_can_chi(target_date)
-        lucky_hours_list = FengShuiService.LUCKY_HOURS.get(dia_chi, [])
-        
-        # Chuyển đổi sang giờ cụ thể
-        hour_mapping = {
-            "Tý": (23, 1), "Sửu": (1, 3), "Dần": (3, 5), "Mão": (5, 7),
-            "Thìn": (7, 9), "Tỵ": (9, 11), "Ngọ": (11, 13), "Mùi": (13, 15),
-            "Thân": (15, 17), "Dậu": (17, 19), "Tuất": (19, 21), "Hợi": (21, 23)
-        }
-        
-        lucky_hours = []
-        for hour_name in lucky_hours_list:
-            start_hour, end_hour = hour_mapping[hour_name]
-            lucky_hours.append({
-                "name": hour_name,
-                "time_range": f"{start_hour:02d}:00 - {end_hour:02d}:00",
-                "description": f"Giờ {hour_name}"
-            })
-        
-        return lucky_hours
+        profile = FengShuiService.DAY_PROFILES[FengShuiService.get_day_cycle_index(target_date)]
+        return [dict(hour) for hour in profile["lucky_hours"]]
     
     @staticmethod
     def get_conflicting_zodiacs(target_date: date) -> List[str]:
         """Lấy các con giáp xung khắc trong ngày"""
-        _, dia_chi, _, _ = FengShuiService.calculate_can_chi(target_date)
-        
-        # Bảng xung khắc 12 con giáp
-        conflict_map = {
-            "Tý": ["Ngọ"],      # Chuột xung Ngựa
-            "Sửu": ["Mùi"],     # Trâu xung Dê  
-            "Dần": ["Thân"],    # Hổ xung Khỉ
-            "Mão": ["Dậu"],     # Mèo xung Gà
-            "Thìn": ["Tuất"],   # Rồng xung Chó
-            "Tỵ": ["Hợi"],      # Rắn xung Heo
-            "Ngọ": ["Tý"],      # Ngựa xung Chuột
-            "Mùi": ["Sửu"],     # Dê xung Trâu
-            "Thân": ["Dần"],    # Khỉ xung Hổ
-            "Dậu": ["Mão"],     # Gà xung Mèo
-            "Tuất": ["Thìn"],   # Chó xung Rồng
-            "Hợi": ["Tỵ"]       # Heo xung Rắn
-        }
-        
-        # Lấy con giáp từ Địa Chi
-        zodiac_map = {chi[0]: chi[2] for chi in FengShuiService.DIA_CHI}
-        conflicting_chi = conflict_map.get(dia_chi, [])
-        
-        return [zodiac_map[chi] for chi in conflicting_chi]
+        profile = FengShuiService.DAY_PROFILES[FengShuiService.get_day_cycle_index(target_date)]
+        return list(profile["conflicting_zodiacs"])
+    
+    @staticmethod
+    def get_day_cycle_index(target_date: date) -> int:
+        """Vị trí của ngày trong chu kỳ 60 ngày Can Chi (0 = ngày baseline)"""
+        return (target_date - FengShuiService.BASELINE_DATE).days % 60
     
     @staticmethod
     def get_daily_feng_shui_analysis(target_date: date) -> Dict:
         """Phân tích phong thủy tổng quan cho một ngày"""
-        thien_can, dia_chi, thien_can_element, dia_chi_element = FengShuiService.calculate_can_chi(target_date)
-        
-        # Lấy thông tin chi tiết
-        lucky_activities = FengShuiService.get_lucky_activities(thien_can_element)
-        unlucky_activities = FengShuiService.get_unlucky_activities(thien_can_element)
-        lucky_hours = FengShuiService.get_lucky_hours(target_date)
-        conflicting_zodiacs = FengShuiService.get_conflicting_zodiacs(target_date)
-        lucky_colors = FengShuiService.ELEMENT_COLORS[thien_can_element]
-        lucky_direction = FengShuiService.THIEN_CAN_DIRECTIONS.get(thien_can, "Trung ương")
-        
+        # Can Chi lặp lại sau 60 ngày: chỉ cần tra bảng dựng sẵn
+        profile = FengShuiService.DAY_PROFILES[FengShuiService.get_day_cycle_index(target_date)]
+        # Bảng dựng sẵn dùng tuple; trả về bản sao dạng list để caller có thể sửa
         return {
             "date": target_date,
-            "can_chi": f"{thien_can} {dia_chi}",
-            "thien_can": thien_can,
-            "dia_chi": dia_chi,
-            "element": thien_can_element,
-            "dia_chi_element": dia_chi_element,
-            "lucky_activities": lucky_activities,
-            "unlucky_activities": unlucky_activities,
-            "lucky_hours": lucky_hours,
-            "conflicting_zodiacs": conflicting_zodiacs,
-            "lucky_colors": lucky_colors,
-            "lucky_direction": lucky_direction
+            **profile,
+            "lucky_activities": list(profile["lucky_activities"]),
+            "unlucky_activities": list(profile["unlucky_activities"]),
+            "lucky_hours": [dict(hour) for hour in profile["lucky_hours"]],
+            "conflicting_zodiacs": list(profile["conflicting_zodiacs"])
         }
     
     @staticmethod
@@ -693,15 +557,58 @@ class FengShuiService:
         thien_can, dia_chi, element, _ = FengShuiService.calculate_can_chi(target_date)
         
         # Tạo summary ngắn gọn
-        element_desc = {
-            Element.WOOD: "Mộc - Tốt cho học tập",
-            Element.FIRE: "Hỏa - Tốt cho sự kiện", 
-            Element.EARTH: "Thổ - Tốt cho đầu tư",
-            Element.METAL: "Kim - Tốt cho làm đẹp",
-            Element.WATER: "Thủy - Tốt cho du lịch"
-        }
+        return f"{thien_can} {dia_chi} - {FengShuiService.ELEMENT_SUMMARIES.get(element, element.value)}"
+    
+    @staticmethod
+    def analyze_range(start_date: date, end_date: date, birth_date: Optional[date] = None,
+                      method: str = "can_chi") -> List[Dict]:
+        """
+        Phân tích Can Chi cho cả khoảng ngày (bao gồm hai đầu) trong một lần gọi
         
-        return f"{thien_can} {dia_chi} - {element_desc.get(element, element.value)}"
+        Chỉ số Can/Chi được tính bằng phép cộng và modulo trên số ngày từ baseline,
+        mọi dữ liệu theo Thiên Can (ngũ hành, tóm tắt, điểm tương thích) được tra sẵn một lần.
+        Args:
+            start_date: Ngày đầu
+            end_date: Ngày cuối
+            birth_date: Ngày sinh user (nếu có sẽ tính điểm tương thích)
+            method: Phương pháp tính mệnh ("can_chi" hoặc "nap_am")
+        Returns: list of {date, can_chi, thien_can, dia_chi, element, dia_chi_element, summary
+                          [, score, level]} theo thứ tự ngày
+        """
+        day_count = (end_date - start_date).days + 1
+        if day_count <= 0:
+            return []
+        
+        offset = (start_date - FengShuiService.BASELINE_DATE).days
+        can_start = (FengShuiService.BASELINE_THIEN_CAN_INDEX + offset) % 10
+        chi_start = (FengShuiService.BASELINE_DIA_CHI_INDEX + offset) % 12
+        
+        # Điểm tương thích chỉ phụ thuộc vào ngũ hành của Thiên Can ngày
+        scores = None
+        if birth_date:
+            user_element, _ = FengShuiService.get_birth_year_element_by_method(birth_date, method)
+            scores = {element: FengShuiService._score_elements(user_element, element) for element in Element}
+        
+        results = []
+        for i in range(day_count):
+            thien_can, can_element = FengShuiService.THIEN_CAN[(can_start + i) % 10]
+            dia_chi, chi_element, _ = FengShuiService.DIA_CHI[(chi_start + i) % 12]
+            can_chi = f"{thien_can} {dia_chi}"
+            
+            day = {
+                "date": start_date + timedelta(days=i),
+                "can_chi": can_chi,
+                "thien_can": thien_can,
+                "dia_chi": dia_chi,
+                "element": can_element,
+                "dia_chi_element": chi_element,
+                "summary": f"{can_chi} - {FengShuiService.ELEMENT_SUMMARIES.get(can_element, can_element.value)}"
+            }
+            if scores is not None:
+                day["score"], day["level"] = scores[can_element]
+            results.append(day)
+        
+        return results
     
     @staticmethod
     def get_birth_year_element_by_can_chi(birth_date: date) -> Tuple[Element, str]:
@@ -779,4 +686,115 @@ class FengShuiService:
         if method == "nap_am":
             return FengShuiService.get_birth_year_element(birth_date)
         else:  # default to can_chi
-            return FengShuiService.get_birth_year_element_by_can_chi(birth_date) 
\ No newline at end of file
+            return FengShuiService.get_birth_year_element_by_can_chi(birth_date) 
+
+
+def _build_element_relationships() -> Dict[Element, Mapping]:
+    """Quan hệ tương sinh / tương khắc của cả 5 ngũ hành"""
+    generation_cycle = FengShuiService.GENERATION_CYCLE
+    destruction_cycle = FengShuiService.DESTRUCTION_CYCLE
+    relationships = {}
+    
+    for element in Element:
+        current_index = generation_cycle.index(element)
+        
+        # Tương sinh: element sinh ra gì, gì sinh ra element
+        generates = generation_cycle[(current_index + 1) % 5]  # Element sinh ra
+        generated_by = generation_cycle[(current_index - 1) % 5]  # Gì sinh ra element
+        
+        # Tương khắc: element khắc gì, gì khắc element
+        current_dest_index = destruction_cycle.index(element)
+        destroys = destruction_cycle[(current_dest_index + 1) % 5]  # Element khắc gì
+        destroyed_by = destruction_cycle[(current_dest_index - 1) % 5]  # Gì khắc element
+        
+        relationships[element] = MappingProxyType({
+            "generates": (generates,),  # Tương sinh
+            "generated_by": (generated_by,),
+            "destroys": (destroys,),  # Tương khắc
+            "destroyed_by": (destroyed_by,),
+            "harmonious": (generated_by, generates),  # Hài hòa
+            "conflicting": (destroyed_by, destroys)  # Xung khắc
+        })
+    
+    return relationships
+
+
+def _build_compatibility_matrix() -> Dict[Tuple[Element, Element], Tuple[int, str]]:
+    """Điểm tương thích cho mọi cặp (mệnh năm sinh, ngũ hành ngày) - ma trận 5x5"""
+    matrix = {}
+    
+    for user_element in Element:
+        year_day_relationships = FengShuiService.ELEMENT_RELATIONSHIPS[user_element]
+        
+        for day_element in Element:
+            # Điểm tương thích cơ bản
+            compatibility_score = 50  # Điểm trung bình
+            compatibility_level = "Trung bình"
+            
+            if day_element in year_day_relationships["harmonious"]:
+                compatibility_score += 30
+                compatibility_level = "Tốt"
+            elif day_element in year_day_relationships["conflicting"]:
+                compatibility_score -= 20
+                compatibility_level = "Kém"
+            
+            # Bonus nếu ngũ hành ngày sinh ra ngũ hành năm sinh (được hỗ trợ)
+            if day_element in year_day_relationships["generated_by"]:
+                compatibility_score += 20
+                compatibility_level = "Rất tốt"
+            
+            # Penalty nếu ngũ hành ngày khắc ngũ hành năm sinh
+            if day_element in year_day_relationships["destroyed_by"]:
+                compatibility_score -= 30
+                compatibility_level = "Rất kém"
+            
+            # Giới hạn điểm từ 0-100
+            matrix[(user_element, day_element)] = (max(0, min(100, compatibility_score)), compatibility_level)
+    
+    return matrix
+
+
+def _build_day_profiles() -> Tuple[Mapping, ...]:
+    """Phân tích phong thủy (không gồm ngày) cho 60 vị trí của chu kỳ Can Chi"""
+    zodiac_by_chi = {chi[0]: chi[2] for chi in FengShuiService.DIA_CHI}
+    profiles = []
+    
+    for cycle_index in range(60):
+        thien_can, thien_can_element = FengShuiService.THIEN_CAN[
+            (FengShuiService.BASELINE_THIEN_CAN_INDEX + cycle_index) % 10
+        ]
+        dia_chi, dia_chi_element, _ = FengShuiService.DIA_CHI[
+            (FengShuiService.BASELINE_DIA_CHI_INDEX + cycle_index) % 12
+        ]
+        
+        lucky_hours = []
+        for hour_name in FengShuiService.LUCKY_HOURS.get(dia_chi, []):
+            start_hour, end_hour = FengShuiService.HOUR_RANGES[hour_name]
+            lucky_hours.append({
+                "name": hour_name,
+                "time_range": f"{start_hour:02d}:00 - {end_hour:02d}:00",
+                "description": f"Giờ {hour_name}"
+            })
+        
+        profiles.append(MappingProxyType({
+            "can_chi": f"{thien_can} {dia_chi}",
+            "thien_can": thien_can,
+            "dia_chi": dia_chi,
+            "element": thien_can_element,
+            "dia_chi_element": dia_chi_element,
+            "lucky_activities": FengShuiService.LUCKY_ACTIVITIES.get(thien_can_element, ()),
+            "unlucky_activities": FengShuiService.UNLUCKY_ACTIVITIES.get(thien_can_element, ()),
+            "lucky_hours": tuple(lucky_hours),
+            "conflicting_zodiacs": tuple(
+                zodiac_by_chi[chi] for chi in FengShuiService.CONFLICTING_CHI.get(dia_chi, ())
+            ),
+            "lucky_colors": FengShuiService.ELEMENT_COLORS[thien_can_element],
+            "lucky_direction": FengShuiService.THIEN_CAN_DIRECTIONS.get(thien_can, "Trung ương")
+        }))
+    
+    return tuple(profiles)
+
+
+FengShuiService.ELEMENT_RELATIONSHIPS = _build_element_relationships()
+FengShuiService.COMPATIBILITY_MATRIX = _build_compatibility_matrix()
+FengShuiService.DAY_PROFILES = _build_day_profiles()
@@ -1,20 +1,26 @@
 from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
 from datetime import datetime, date
 from typing import List, Dict, Optional
 from app.config import settings
+from app.services.holiday_cache import HolidayCache, create_holiday_cache
 from app.logging_config import google_calendar_logger as logger
 
 
 class GoogleCalendarService:
     """Service for integrating with Google Calendar API to fetch Vietnamese holidays"""
     
-    def __init__(self):
+    def __init__(self, service=None, cache: Optional[HolidayCache] = None):
+        """
+        Args:
+            service: Pre-built Google Calendar API resource (built from the API key if omitted)
+            cache: Holiday cache (created from settings if omitted)
+        """
         self.api_key = settings.google_api_key
         self.calendar_id = settings.google_calendar_id
-        self.service = None
+        self.service = service
+        self.cache = cache or create_holiday_cache()
         
-        if self.api_key:
+        if self.service is None and self.api_key:
             try:
                 self.service = build('calendar', 'v3', developerKey=self.api_key)
                 logger.info("Google Calendar service initialized successfully")
@@ -32,52 +38,14 @@ class GoogleCalendarService:
         Returns:
             List of holiday dictionaries with name, date, and description
         """
-        if not self.service or not self.api_key:
-            logger.warning("Google Calendar service not configured properly")
-            return []
-        
-        try:
-            # Calculate time range for the month
-            start_date = datetime(year, month, 1)
-            if month == 12:
-                end_date = datetime(year + 1, 1, 1)
-            else:
-                end_date = datetime(year, month + 1, 1)
-            
-            # Format dates for API
-            time_min = start_date.isoformat() + 'Z'
-            time_max = end_date.isoformat() + 'Z'
-            
-            # Call Google Calendar API
-            events_result = self.service.events().list(
-                calendarId=self.calendar_id,
-                timeMin=time_min,
-                timeMax=time_max,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
-            holidays = []
-            
-            for event in events:
-                holiday = self._parse_event_to_holiday(event)
-                if holiday:
-                    holidays.append(holiday)
-            
-            logger.info(f"Retrieved {len(holidays)} holidays for {month}/{year}")
-            return holidays
-            
-        except HttpError as error:
-            logger.error(f"An error occurred while fetching holidays: {error}")
-            return []
-        except Exception as e:
-            logger.error(f"Unexpected error while fetching holidays: {e}")
-            return []
+        return [
+            holiday for holiday in self.get_holidays_for_year(year)
+            if holiday['date'].month == month
+        ]
     
     def get_holidays_for_year(self, year: int) -> List[Dict]:
         """
-        Get Vietnamese holidays for the entire year
+        Get Vietnamese holidays for the entire year (served from the holiday cache)
         
         Args:
             year: Year to get holidays for
@@ -85,45 +53,55 @@ class GoogleCalendarService:
         Returns:
             List of holiday dictionaries with name, date, and description
         """
-        if not self.service or not self.api_key:
+        if not self.is_configured():
             logger.warning("Google Calendar service not configured properly")
             return []
         
-        try:
-            # Calculate time range for the year
-            start_date = datetime(year, 1, 1)
-            end_date = datetime(year + 1, 1, 1)
-            
-            # Format dates for API
-            time_min = start_date.isoformat() + 'Z'
-            time_max = end_date.isoformat() + 'Z'
-            
-            # Call Google Calendar API
-            events_result = self.service.events().list(
-                calendarId=self.calendar_id,
-                timeMin=time_min,
-                timeMax=time_max,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
-            holidays = []
-            
-            for event in events:
-                holiday = self._parse_event_to_holiday(event)
-                if holiday:
-                    holidays.append(holiday)
+        return self.cache.get_year(year, self.fetch_holidays_for_year)
+    
+    def fetch_holidays_for_year(self, year: int) -> List[Dict]:
+        """
+        Fetch Vietnamese holidays for a year directly from the Google Calendar API
+
+        Called by prefetch_holidays_task (which needs API errors to keep the rows it already has)
+        and by the holiday cache; pages read the holidays table through HolidayService.
+        
+        Args:
+            year: Year to get holidays for
             
-            logger.info(f"Retrieved {len(holidays)} holidays for year {year}")
-            return holidays
+        Returns:
+            List of holiday dictionaries with name, date, and description
             
-        except HttpError as error:
-            logger.error(f"An error occurred while fetching holidays: {error}")
-            return []
-        except Exception as e:
-            logger.error(f"Unexpected error while fetching holidays: {e}")
-            return []
+        Raises:
+            HttpError or any transport error, so the caller keeps the rows it already has
+        """
+        # Calculate time range for the year
+        start_date = datetime(year, 1, 1)
+        end_date = datetime(year + 1, 1, 1)
+        
+        # Format dates for API
+        time_min = start_date.isoformat() + 'Z'
+        time_max = end_date.isoformat() + 'Z'
+        
+        # Call Google Calendar API
+        events_result = self.service.events().list(
+            calendarId=self.calendar_id,
+            timeMin=time_min,
+            timeMax=time_max,
+            singleEvents=True,
+            orderBy='startTime'
+        ).execute()
+        
+        events = events_result.get('items', [])
+        holidays = []
+        
+        for event in events:
+            holiday = self._parse_event_to_holiday(event)
+            if holiday:
+                holidays.append(holiday)
+        
+        logger.info(f"Retrieved {len(holidays)} holidays for year {year}")
+        return holidays
     
     def _parse_event_to_holiday(self, event: Dict) -> Optional[Dict]:
         """
@@ -165,7 +143,7 @@ class GoogleCalendarService:
     
     def is_configured(self) -> bool:
         """Check if Google Calendar service is properly configured"""
-        return bool(self.service and self.api_key)
+        return bool(self.service)
 
 
 # Global instance
@@ -0,0 +1,204 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from app.config import settings
+from app.logging_config import google_calendar_logger as logger
+
+
+class MemoryHolidayCacheBackend:
+    """In-process LRU backend with per-entry expiry"""
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+
+            value, expires_at = item
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Dict, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class RedisHolidayCacheBackend:
+    """Redis backend shared by all app and worker processes"""
+
+    def __init__(self, redis_url: str, prefix: str = "holidays:"):
+        import redis
+
+        self.client = redis.Redis.from_url(redis_url, socket_timeout=2, socket_connect_timeout=2)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Dict]:
+        try:
+            raw = self.client.get(self.prefix + key)
+        except Exception as e:
+            logger.warning(f"Redis holiday cache read failed: {e}")
+            return None
+        return json.loads(raw) if raw else None
+
+    def set(self, key: str, value: Dict, ttl: int) -> None:
+        try:
+            self.client.set(self.prefix + key, json.dumps(value, ensure_ascii=False), ex=ttl)
+        except Exception as e:
+            logger.warning(f"Redis holiday cache write failed: {e}")
+
+    def delete(self, key: str) -> None:
+        try:
+            self.client.delete(self.prefix + key)
+        except Exception as e:
+            logger.warning(f"Redis holiday cache delete failed: {e}")
+
+
+class HolidayCache:
+    """
+    Per-year holiday cache with TTL, stale-while-revalidate and negative caching
+
+    Entries are looked up in each backend in order (fastest first) and written to all of them.
+    """
+
+    def __init__(self, backends: List, ttl: int, stale_ttl: int, negative_ttl: int):
+        self.backends = backends
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def get_year(self, year: int, fetch: Callable[[int], List[Dict]]) -> List[Dict]:
+        """
+        Get holidays for a year, calling fetch(year) only when the cached entry is missing or stale
+
+        Args:
+            year: Year to get holidays for
+            fetch: Function returning the holidays of a year, raising on API errors
+
+        Returns:
+            List of holiday dictionaries
+        """
+        key = str(year)
+        entry = self._read(key)
+        now = time.time()
+
+        if entry is not None:
+            if now < entry["expires_at"]:
+                return self._decode(entry["holidays"])
+
+            # Stale: serve it right away and refresh in the background
+            self._refresh_in_background(year, fetch)
+            return self._decode(entry["holidays"])
+
+        return self._decode(self._refresh(year, fetch))
+
+    def invalidate(self, year: int) -> None:
+        """Drop the cached entry of a year from every backend"""
+        for backend in self.backends:
+            backend.delete(str(year))
+
+    def _read(self, key: str) -> Optional[Dict]:
+        for index, backend in enumerate(self.backends):
+            entry = backend.get(key)
+            if entry is not None:
+                # Backfill faster backends
+                for faster in self.backends[:index]:
+                    faster.set(key, entry, max(1, int(entry["stale_until"] - time.time())))
+                return entry
+        return None
+
+    def _write(self, key: str, entry: Dict) -> None:
+        ttl = max(1, int(entry["stale_until"] - time.time()))
+        for backend in self.backends:
+            backend.set(key, entry, ttl)
+
+    def _refresh(self, year: int, fetch: Callable[[int], List[Dict]]) -> List[Dict]:
+        key = str(year)
+        now = time.time()
+
+        try:
+            holidays = self._encode(fetch(year))
+            self._write(key, {
+                "holidays": holidays,
+                "expires_at": now + self.ttl,
+                "stale_until": now + self.ttl + self.stale_ttl
+            })
+            return holidays
+        except Exception as e:
+            logger.error(f"Failed to refresh holidays for year {year}: {e}")
+
+            previous = self._read(key)
+            holidays = previous["holidays"] if previous else []
+
+            # Negative cache: keep serving what we have, retry only after negative_ttl
+            self._write(key, {
+                "holidays": holidays,
+                "expires_at": now + self.negative_ttl,
+                "stale_until": now + self.negative_ttl + self.stale_ttl
+            })
+            return holidays
+
+    def _refresh_in_background(self, year: int, fetch: Callable[[int], List[Dict]]) -> None:
+        with self._lock:
+            if year in self._refreshing:
+                return
+            self._refreshing.add(year)
+
+        def run():
+            try:
+                self._refresh(year, fetch)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(year)
+
+        threading.Thread(target=run, name=f"holiday-refresh-{year}", daemon=True).start()
+
+    @staticmethod
+    def _encode(holidays: List[Dict]) -> List[Dict]:
+        """Make holidays JSON-serializable (date is rebuilt from date_str on read)"""
+        return [{k: v for k, v in holiday.items() if k != 'date'} for holiday in holidays]
+
+    @staticmethod
+    def _decode(holidays: List[Dict]) -> List[Dict]:
+        return [
+            {**holiday, 'date': datetime.strptime(holiday['date_str'], '%Y-%m-%d').date()}
+            for holiday in holidays
+        ]
+
+
+def create_holiday_cache() -> HolidayCache:
+    """Create the holiday cache from settings (in-process LRU, plus Redis when configured)"""
+    backends = [MemoryHolidayCacheBackend()]
+
+    if settings.redis_url:
+        try:
+            backends.append(RedisHolidayCacheBackend(settings.redis_url))
+        except Exception as e:
+            logger.warning(f"Redis holiday cache disabled: {e}")
+
+    return HolidayCache(
+        backends,
+        ttl=settings.holiday_cache_ttl,
+        stale_ttl=settings.holiday_cache_stale_ttl,
+        negative_ttl=settings.holiday_cache_negative_ttl
+    )
@@ -0,0 +1,87 @@
+from datetime import date
+from typing import Dict, List
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.models.holiday import Holiday
+from app.logging_config import google_calendar_logger as logger
+
+
+class HolidayService:
+    """Service for reading and syncing the local holidays table"""
+
+    SOURCE_GOOGLE = "google_calendar"
+
+    @staticmethod
+    def get_holidays_in_range(db: Session, start_date: date, end_date: date) -> List[Dict]:
+        """
+        Get stored holidays between two dates (inclusive)
+
+        Args:
+            db: Database session
+            start_date: First day of the range
+            end_date: Last day of the range
+
+        Returns:
+            List of holiday dictionaries with name, date, description, type and date_str
+        """
+        holidays = db.query(Holiday).filter(
+            Holiday.holiday_date >= start_date,
+            Holiday.holiday_date <= end_date
+        ).order_by(Holiday.holiday_date).all()
+
+        return [holiday.to_dict() for holiday in holidays]
+
+    @staticmethod
+    def get_version(db: Session, start_date: date, end_date: date) -> str:
+        """
+        Cheap fingerprint of the stored holidays between two dates (inclusive)
+
+        replace_year deletes and re-inserts rows, so any sync changes the count or the max id.
+        """
+        count, max_id = db.query(func.count(Holiday.id), func.max(Holiday.id)).filter(
+            Holiday.holiday_date >= start_date,
+            Holiday.holiday_date <= end_date
+        ).one()
+        return f"{count}:{max_id or 0}"
+
+    @staticmethod
+    def replace_year(db: Session, year: int, holidays: List[Dict], source: str = SOURCE_GOOGLE) -> int:
+        """
+        Replace the stored holidays of one source for a year in a single transaction
+
+        Args:
+            db: Database session
+            year: Solar year being synced
+            holidays: Holiday dictionaries as returned by GoogleCalendarService
+            source: Holiday source
+
+        Returns:
+            Number of rows written
+        """
+        rows = {}
+        for holiday in holidays:
+            # Normalize duplicates returned by the API (same name on the same day)
+            key = (holiday['date'], holiday['name'][:200])
+            if holiday['date'].year != year or key in rows:
+                continue
+            rows[key] = Holiday(
+                holiday_date=holiday['date'],
+                year=year,
+                name=key[1],
+                description=holiday.get('description', ''),
+                source=source
+            )
+
+        try:
+            db.query(Holiday).filter(
+                Holiday.year == year,
+                Holiday.source == source
+            ).delete(synchronize_session=False)
+            db.add_all(rows.values())
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        logger.info(f"Stored {len(rows)} holidays for year {year}")
+        return len(rows)
@@ -1,22 +1,78 @@
+from array import array
 from datetime import date, datetime, timedelta
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Dict, List, Tuple
-from lunardate import LunarDate
+from lunardate import LunarDate, yearInfos
 import calendar
 
 
+def _build_day_table() -> Tuple[int, array, Dict[Tuple[int, int, bool], Tuple[int, int]]]:
+    """
+    Build the solar -> lunar lookup table for the whole lunardate range (1900-2099 lunar years)
+
+    Returns: (first_ordinal, day_table, month_index)
+        day_table[ordinal - first_ordinal] packs (year, month, day, leap) of that solar day
+        month_index[(year, month, is_leap)] = (first_ordinal_of_month, days_in_month)
+    """
+    first_ordinal = LunarDate._startDate.toordinal()
+    day_table = array('L')
+    month_index = {}
+
+    ordinal = first_ordinal
+    for year_offset, year_info in enumerate(yearInfos):
+        year = 1900 + year_offset
+        for month, days, is_leap in LunarDate._enumMonth(year_info):
+            month_index[(year, month, bool(is_leap))] = (ordinal, days)
+            packed_month = ((year << 4) | month) << 6
+            for day in range(1, days + 1):
+                day_table.append(packed_month | (day << 1) | is_leap)
+            ordinal += days
+
+    return first_ordinal, day_table, month_index
+
+
+_FIRST_ORDINAL, _DAY_TABLE, _MONTH_INDEX = _build_day_table()
+
+# Number of (year, month) grids kept by LunarCalendarService._get_month_grid
+MONTH_GRID_CACHE_SIZE = 120
+
+# Number of solar years kept by LunarCalendarService._get_holiday_index
+HOLIDAY_INDEX_CACHE_SIZE = 16
+
+
+def _lookup_lunar(solar_date: date) -> Tuple[int, int, int, bool]:
+    """Get (year, month, day, is_leap) for a solar date from the precomputed table"""
+    index = solar_date.toordinal() - _FIRST_ORDINAL
+    if 0 <= index < len(_DAY_TABLE):
+        packed = _DAY_TABLE[index]
+        return packed >> 10, (packed >> 6) & 0xF, (packed >> 1) & 0x1F, bool(packed & 1)
+
+    # Outside the table: defer to lunardate so behaviour stays identical
+    lunar_date = LunarDate.fromSolarDate(solar_date.year, solar_date.month, solar_date.day)
+    return lunar_date.year, lunar_date.month, lunar_date.day, lunar_date.isLeapMonth
+
+
 class LunarCalendarService:
     """Service for handling lunar calendar conversions and operations"""
     
     @staticmethod
     def solar_to_lunar(solar_date: date) -> LunarDate:
         """Convert solar date to lunar date"""
-        return LunarDate.fromSolarDate(solar_date.year, solar_date.month, solar_date.day)
+        return LunarDate(*_lookup_lunar(solar_date))
     
     @staticmethod
     def lunar_to_solar(lunar_year: int, lunar_month: int, lunar_day: int, is_leap: bool = False) -> date:
         """Convert lunar date to solar date"""
-        lunar_date = LunarDate(lunar_year, lunar_month, lunar_day, is_leap)
-        return lunar_date.toSolarDate()
+        month_info = _MONTH_INDEX.get((lunar_year, lunar_month, bool(is_leap)))
+        if month_info is None:
+            # Unknown year/month: let lunardate raise its usual ValueError
+            return LunarDate(lunar_year, lunar_month, lunar_day, is_leap).toSolarDate()
+        
+        month_start, month_days = month_info
+        if not 1 <= lunar_day <= month_days:
+            raise ValueError("day out of range")
+        return date.fromordinal(month_start + lunar_day - 1)
     
     @staticmethod
     def get_lunar_info(solar_date: date) -> Dict:
@@ -33,6 +89,17 @@ class LunarCalendarService:
             "lunar_date_vietnamese": LunarCalendarService.format_vietnamese_lunar_date(lunar_date)
         }
     
+    @staticmethod
+    def lunar_range(start_date: date, end_date: date) -> List[Tuple[int, int, int, bool]]:
+        """Get (lunar_year, lunar_month, lunar_day, is_leap_month) for every day in [start_date, end_date]"""
+        start = start_date.toordinal()
+        if start < _FIRST_ORDINAL or end_date.toordinal() - _FIRST_ORDINAL >= len(_DAY_TABLE):
+            raise ValueError("date out of range")
+        return [
+            _lookup_lunar(date.fromordinal(ordinal))
+            for ordinal in range(start, end_date.toordinal() + 1)
+        ]
+
     @staticmethod
     def format_vietnamese_lunar_date(lunar_date: LunarDate) -> str:
         """Format lunar date in Vietnamese style"""
@@ -47,6 +114,27 @@ class LunarCalendarService:
     @staticmethod
     def get_month_calendar(year: int, month: int, focused_date: date = None) -> List[List[Dict]]:
         """Get calendar matrix for a month with both solar and lunar dates"""
+        # Use focused_date if provided, otherwise use today
+        today = date.today()
+        highlight_date = focused_date if focused_date else today
+        
+        # Overlay request-specific flags on the cached (immutable) month grid
+        return [
+            [
+                {
+                    **cell,
+                    "is_today": cell["date"] == today,  # Real today for reference
+                    "is_focused": cell["date"] == highlight_date  # Focused/highlighted date
+                }
+                for cell in week
+            ]
+            for week in LunarCalendarService._get_month_grid(year, month)
+        ]
+    
+    @staticmethod
+    @lru_cache(maxsize=MONTH_GRID_CACHE_SIZE)
+    def _get_month_grid(year: int, month: int) -> Tuple[Tuple[MappingProxyType, ...], ...]:
+        """Build the solar/lunar fields of a month grid once per (year, month)"""
         # Get first day of month and number of days
         first_day = date(year, month, 1)
         last_day = date(year, month, calendar.monthrange(year, month)[1])
@@ -54,9 +142,6 @@ class LunarCalendarService:
         # Get first Monday of the calendar view
         start_date = first_day - timedelta(days=first_day.weekday())
         
-        # Use focused_date if provided, otherwise use today
-        highlight_date = focused_date if focused_date else date.today()
-        
         # Create 6 weeks calendar
         calendar_weeks = []
         current_date = start_date
@@ -64,46 +149,45 @@ class LunarCalendarService:
         for week in range(6):
             week_days = []
             for day in range(7):
-                lunar_info = LunarCalendarService.get_lunar_info(current_date)
+                lunar_year, lunar_month, lunar_day, is_leap = _lookup_lunar(current_date)
                 day_info = {
                     "date": current_date,
                     "day": current_date.day,
                     "is_current_month": current_date.month == month,
-                    "is_today": current_date == date.today(),  # Real today for reference
-                    "is_focused": current_date == highlight_date,  # Focused/highlighted date
-                    "lunar_day": lunar_info["lunar_day"],
-                    "lunar_month": lunar_info["lunar_month"],
-                    "lunar_date_str": lunar_info["lunar_date_str"],
-                    "is_leap_month": lunar_info["is_leap_month"]
+                    "lunar_day": lunar_day,
+                    "lunar_month": lunar_month,
+                    "lunar_date_str": f"{lunar_day}/{lunar_month}/{lunar_year}",
+                    "is_leap_month": is_leap
                 }
-                week_days.append(day_info)
+                week_days.append(MappingProxyType(day_info))
                 current_date += timedelta(days=1)
             
-            calendar_weeks.append(week_days)
+            calendar_weeks.append(tuple(week_days))
             
             # Stop if we've passed the current month and have at least 4 weeks
             if week >= 3 and current_date > last_day:
                 break
         
-        return calendar_weeks
+        return tuple(calendar_weeks)
+    
+    # Important lunar holidays (same dates every lunar year)
+    LUNAR_HOLIDAYS = [
+        {"name": "Tết Nguyên Đán", "lunar_month": 1, "lunar_day": 1},
+        {"name": "Rằm tháng Giêng", "lunar_month": 1, "lunar_day": 15},
+        {"name": "Tết Hàn Thực", "lunar_month": 3, "lunar_day": 3},
+        {"name": "Phật Đản", "lunar_month": 4, "lunar_day": 8},
+        {"name": "Tết Đoan Ngọ", "lunar_month": 5, "lunar_day": 5},
+        {"name": "Vu Lan", "lunar_month": 7, "lunar_day": 15},
+        {"name": "Tết Trung Thu", "lunar_month": 8, "lunar_day": 15},
+        {"name": "Tết Trùng Cửu", "lunar_month": 9, "lunar_day": 9},
+        {"name": "Tết Hạ Nguyên", "lunar_month": 10, "lunar_day": 15},
+    ]
     
     @staticmethod
     def get_lunar_holidays(year: int) -> List[Dict]:
         """Get list of important lunar holidays for a year"""
-        holidays = [
-            {"name": "Tết Nguyên Đán", "lunar_month": 1, "lunar_day": 1},
-            {"name": "Rằm tháng Giêng", "lunar_month": 1, "lunar_day": 15},
-            {"name": "Tết Hàn Thực", "lunar_month": 3, "lunar_day": 3},
-            {"name": "Phật Đản", "lunar_month": 4, "lunar_day": 8},
-            {"name": "Tết Đoan Ngọ", "lunar_month": 5, "lunar_day": 5},
-            {"name": "Vu Lan", "lunar_month": 7, "lunar_day": 15},
-            {"name": "Tết Trung Thu", "lunar_month": 8, "lunar_day": 15},
-            {"name": "Tết Trùng Cửu", "lunar_month": 9, "lunar_day": 9},
-            {"name": "Tết Hạ Nguyên", "lunar_month": 10, "lunar_day": 15},
-        ]
-        
         result = []
-        for holiday in holidays:
+        for holiday in LunarCalendarService.LUNAR_HOLIDAYS:
             try:
                 solar_date = LunarCalendarService.lunar_to_solar(
                     year, holiday["lunar_month"], holiday["lunar_day"]
@@ -118,3 +202,37 @@ class LunarCalendarService:
                 continue
         
         return result
+    
+    @staticmethod
+    def holidays_on(solar_date: date) -> List[Dict]:
+        """Get lunar holidays falling on a solar date"""
+        holidays = LunarCalendarService._get_holiday_index(solar_date.year).get(solar_date, ())
+        return [dict(holiday) for holiday in holidays]
+    
+    @staticmethod
+    def holidays_in_range(start_date: date, end_date: date) -> List[Dict]:
+        """Get lunar holidays with solar_date in [start_date, end_date], sorted by date"""
+        result = []
+        for year in range(start_date.year, end_date.year + 1):
+            index = LunarCalendarService._get_holiday_index(year)
+            for solar_date in sorted(index):
+                if start_date <= solar_date <= end_date:
+                    result.extend(dict(holiday) for holiday in index[solar_date])
+        
+        return result
+    
+    @staticmethod
+    @lru_cache(maxsize=HOLIDAY_INDEX_CACHE_SIZE)
+    def _get_holiday_index(year: int) -> MappingProxyType:
+        """
+        Index lunar holidays by the solar date they fall on within a solar year
+        Holidays late in the previous lunar year can land in this solar year, so both are scanned
+        Returns: {solar_date: (holiday, ...)}
+        """
+        index = {}
+        for lunar_year in (year - 1, year):
+            for holiday in LunarCalendarService.get_lunar_holidays(lunar_year):
+                if holiday["solar_date"].year == year:
+                    index.setdefault(holiday["solar_date"], []).append(MappingProxyType(holiday))
+        
+        return MappingProxyType({solar_date: tuple(holidays) for solar_date, holidays in index.items()})
@@ -0,0 +1,231 @@
+from calendar import monthrange
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import and_, insert, or_
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.note import Note
+from app.models.note_occurrence import NoteOccurrence, NoteOccurrenceHorizon
+
+# Rows deleted per statement by NoteOccurrenceService.refresh
+REFRESH_CHUNK_SIZE = 500
+
+
+class NoteOccurrenceService:
+    """
+    Occurrences of one-off and recurring (monthly/yearly) notes
+
+    The rolling horizon is materialized in note_occurrences (refreshed by a background task,
+    and per note whenever a note is written); other ranges, and months the task has not
+    materialized yet, are projected on the fly.
+    """
+
+    @staticmethod
+    def occurrence_in_month(note_date: date, year: int, month: int) -> date:
+        """Day a recurring note falls on in a month (clamped to the last day, e.g. 31 -> 30/4)"""
+        return date(year, month, min(note_date.day, monthrange(year, month)[1]))
+
+    @staticmethod
+    def month_segments(start_date: date, end_date: date) -> List[Tuple[int, int, int, int]]:
+        """(year, month, first_day, last_day) of each calendar month touched by [start_date, end_date]"""
+        segments = []
+        current = start_date
+        while current <= end_date:
+            month_end = date(current.year, current.month, monthrange(current.year, current.month)[1])
+            segments.append((current.year, current.month, current.day, min(month_end, end_date).day))
+            current = month_end + timedelta(days=1)
+        return segments
+
+    @staticmethod
+    def get_window(today: date = None) -> Tuple[date, date]:
+        """First and last day of the horizon kept in note_occurrences (the current month onwards)"""
+        start = (today or date.today()).replace(day=1)
+        year, month = divmod(start.year * 12 + start.month - 1 + settings.note_occurrence_horizon_months - 1, 12)
+        return start, date(year, month + 1, monthrange(year, month + 1)[1])
+
+    @staticmethod
+    def kind_of(note: Note) -> str:
+        if note.monthly_repeat:
+            return NoteOccurrence.KIND_MONTHLY
+        if note.yearly_repeat:
+            return NoteOccurrence.KIND_YEARLY
+        return NoteOccurrence.KIND_ONCE
+
+    @staticmethod
+    def get_occurrences(db: Session, user_id: int, start_date: date, end_date: date) -> List[Tuple[date, Note]]:
+        """
+        Get every occurrence of a user's active notes in [start_date, end_date]
+
+        Ranges from the current month up to the last refresh's materialized_through are read
+        from note_occurrences with one indexed query; anything else (past months, or the month
+        that just entered the horizon before the next refresh) is projected on the fly.
+
+        Returns:
+            (occurrence_date, note) pairs sorted by date
+        """
+        window_start, _ = NoteOccurrenceService.get_window()
+        materialized_through = NoteOccurrenceService.get_materialized_through(db)
+        if materialized_through is None or start_date < window_start or end_date > materialized_through:
+            return NoteOccurrenceService.compute_occurrences(db, start_date, end_date, user_id)
+
+        rows = db.query(NoteOccurrence.occurrence_date, Note).join(
+            Note, Note.id == NoteOccurrence.note_id
+        ).filter(
+            NoteOccurrence.user_id == user_id,
+            NoteOccurrence.occurrence_date >= start_date,
+            NoteOccurrence.occurrence_date <= end_date,
+            Note.is_active == True
+        ).order_by(NoteOccurrence.occurrence_date, NoteOccurrence.note_id).all()
+
+        return [(occurrence_date, note) for occurrence_date, note in rows]
+
+    @staticmethod
+    def get_materialized_through(db: Session) -> Optional[date]:
+        """Last day note_occurrences is complete for (None until the first refresh)"""
+        return db.query(NoteOccurrenceHorizon.materialized_through).filter(
+            NoteOccurrenceHorizon.id == NoteOccurrenceHorizon.ROW_ID
+        ).scalar()
+
+    @staticmethod
+    def compute_occurrences(db: Session, start_date: date, end_date: date,
+                            user_id: int = None) -> List[Tuple[date, Note]]:
+        """
+        Project active notes onto [start_date, end_date] without the materialized table
+
+        One indexed query selects one-off notes dated in the range plus recurring notes whose
+        (solar_month, solar_day) can land in it; the exact dates are then computed in Python.
+        A recurring note only occurs on or after its own solar_date.
+
+        Args:
+            db: Database session
+            start_date: First day of the range
+            end_date: Last day of the range
+            user_id: Only this user's notes (all users when None)
+
+        Returns:
+            (occurrence_date, note) pairs sorted by date
+        """
+        segments = NoteOccurrenceService.month_segments(start_date, end_date)
+
+        conditions = [Note.solar_date >= start_date]
+        for year, month, first_day, last_day in segments:
+            # A segment that reaches the end of the month also catches days clamped onto it
+            if last_day == monthrange(year, month)[1]:
+                last_day = 31
+            in_segment = Note.solar_day.between(first_day, last_day)
+            conditions.append(and_(Note.monthly_repeat == True, in_segment))
+            conditions.append(and_(Note.yearly_repeat == True, Note.solar_month == month, in_segment))
+
+        query = db.query(Note).filter(
+            Note.is_active == True,
+            Note.solar_date <= end_date,
+            or_(*conditions)
+        )
+        if user_id is not None:
+            query = query.filter(Note.user_id == user_id)
+
+        occurrences = []
+        for note in query.all():
+            for occurrence_date in NoteOccurrenceService.expand(note, segments):
+                occurrences.append((occurrence_date, note))
+
+        occurrences.sort(key=lambda occurrence: (occurrence[0], occurrence[1].id))
+        return occurrences
+
+    @staticmethod
+    def sync_notes(db: Session, notes: List[Note], today: date = None) -> None:
+        """Rewrite the note_occurrences rows of some notes; call after committing changes to them"""
+        window_start, window_end = NoteOccurrenceService.get_window(today)
+        segments = NoteOccurrenceService.month_segments(window_start, window_end)
+
+        db.query(NoteOccurrence).filter(
+            NoteOccurrence.note_id.in_([note.id for note in notes]),
+            NoteOccurrence.occurrence_date >= window_start
+        ).delete(synchronize_session=False)
+
+        rows = [
+            {
+                "note_id": note.id,
+                "user_id": note.user_id,
+                "occurrence_date": occurrence_date,
+                "kind": NoteOccurrenceService.kind_of(note)
+            }
+            for note in notes if note.is_active
+            for occurrence_date in NoteOccurrenceService.expand(note, segments)
+        ]
+        if rows:
+            db.execute(insert(NoteOccurrence), rows)
+        db.commit()
+
+    @staticmethod
+    def refresh(db: Session, today: date = None) -> Dict[str, int]:
+        """
+        Bring note_occurrences in line with the notes for the current horizon
+
+        Only the differences are written: rows that rolled out of the horizon or no longer
+        match a note are deleted and missing rows (e.g. the month entering the horizon) inserted.
+        The new end of the horizon is then recorded so get_occurrences starts reading it.
+
+        Returns:
+            Counts of purged, deleted and inserted rows
+        """
+        window_start, window_end = NoteOccurrenceService.get_window(today)
+
+        purged = db.query(NoteOccurrence).filter(
+            NoteOccurrence.occurrence_date < window_start
+        ).delete(synchronize_session=False)
+
+        desired = {
+            (note.id, occurrence_date): (note.user_id, NoteOccurrenceService.kind_of(note))
+            for occurrence_date, note in NoteOccurrenceService.compute_occurrences(db, window_start, window_end)
+        }
+        existing = {
+            (note_id, occurrence_date): (row_id, user_id, kind)
+            for row_id, note_id, user_id, occurrence_date, kind in db.query(
+                NoteOccurrence.id, NoteOccurrence.note_id, NoteOccurrence.user_id,
+                NoteOccurrence.occurrence_date, NoteOccurrence.kind
+            ).filter(NoteOccurrence.occurrence_date >= window_start)
+        }
+
+        stale = {
+            key: row_id for key, (row_id, user_id, kind) in existing.items()
+            if desired.get(key) != (user_id, kind)
+        }
+        stale_ids = list(stale.values())
+        for i in range(0, len(stale_ids), REFRESH_CHUNK_SIZE):
+            db.query(NoteOccurrence).filter(
+                NoteOccurrence.id.in_(stale_ids[i:i + REFRESH_CHUNK_SIZE])
+            ).delete(synchronize_session=False)
+
+        missing = [
+            {"note_id": note_id, "user_id": user_id, "occurrence_date": occurrence_date, "kind": kind}
+            for (note_id, occurrence_date), (user_id, kind) in desired.items()
+            if (note_id, occurrence_date) not in existing or (note_id, occurrence_date) in stale
+        ]
+        if missing:
+            db.execute(insert(NoteOccurrence), missing)
+
+        horizon = db.get(NoteOccurrenceHorizon, NoteOccurrenceHorizon.ROW_ID)
+        if horizon is None:
+            horizon = NoteOccurrenceHorizon(id=NoteOccurrenceHorizon.ROW_ID)
+            db.add(horizon)
+        horizon.materialized_through = window_end
+
+        db.commit()
+        return {"purged": purged, "deleted": len(stale_ids), "inserted": len(missing)}
+
+    @staticmethod
+    def expand(note: Note, segments: List[Tuple[int, int, int, int]]) -> List[date]:
+        """Dates a note occurs on within the given month segments"""
+        dates = []
+        for year, month, first_day, last_day in segments:
+            if note.monthly_repeat or (note.yearly_repeat and note.solar_date.month == month):
+                occurrence_date = NoteOccurrenceService.occurrence_in_month(note.solar_date, year, month)
+            elif (note.solar_date.year, note.solar_date.month) == (year, month):
+                occurrence_date = note.solar_date
+            else:
+                continue
+
+            if first_day <= occurrence_date.day <= last_day and occurrence_date >= note.solar_date:
+                dates.append(occurrence_date)
+        return dates
@@ -0,0 +1,194 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket: allows `rate` acquisitions per second with bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, blocking until available. Returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+
+                delay = (1 - self._tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
+
+
+class Delivery:
+    """One message to send on one channel for one schedule"""
+
+    def __init__(
+        self,
+        schedule_id: int,
+        channel: str,
+        recipient: str,
+        send: Callable[[], bool],
+        message: Optional[str] = None
+    ):
+        self.schedule_id = schedule_id
+        self.channel = channel
+        self.recipient = recipient
+        self.send = send
+        self.message = message  # Plain-text payload, lets Telegram deliveries go through send_many
+        self.success = False
+
+    def __repr__(self):
+        return f"<Delivery(schedule_id={self.schedule_id}, channel={self.channel}, success={self.success})>"
+
+
+class NotificationDispatcher:
+    """Send deliveries concurrently while respecting per-channel rate limits"""
+
+    CHANNEL_TELEGRAM = "telegram"
+    CHANNEL_EMAIL = "email"
+
+    def __init__(
+        self,
+        max_workers: int = None,
+        telegram_rate: float = None,
+        telegram_chat_rate: float = None,
+        smtp_rate: float = None,
+        telegram_service=None
+    ):
+        """
+        Args:
+            telegram_service: TelegramService used to batch Telegram deliveries through its
+                rate-aware send_many queue; without it they run on the thread pool like email
+        """
+        self.telegram_service = telegram_service
+        self.max_workers = max_workers or settings.notification_max_workers
+        self.telegram_chat_rate = telegram_chat_rate or settings.telegram_chat_rate_limit
+        self.channel_buckets = {
+            self.CHANNEL_TELEGRAM: TokenBucket(telegram_rate or settings.telegram_rate_limit),
+            self.CHANNEL_EMAIL: TokenBucket(smtp_rate or settings.smtp_rate_limit),
+        }
+        self._chat_buckets = {}
+        self._chat_lock = threading.Lock()
+
+    def dispatch(self, deliveries: List[Delivery]) -> Dict:
+        """
+        Send all deliveries, setting delivery.success on each
+
+        Args:
+            deliveries: Deliveries whose send() callables only use plain data (no DB session)
+
+        Returns:
+            Throughput metrics for the run
+        """
+        metrics = {
+            "total": len(deliveries),
+            "sent": 0,
+            "failed": 0,
+            "by_channel": {},
+            "rate_limit_wait_seconds": 0.0,
+            "elapsed_seconds": 0.0,
+            "messages_per_second": 0.0
+        }
+        if not deliveries:
+            return metrics
+
+        metrics_lock = threading.Lock()
+        started_at = time.monotonic()
+
+        def record(delivery: Delivery, waited: float):
+            with metrics_lock:
+                channel_metrics = metrics["by_channel"].setdefault(delivery.channel, {"sent": 0, "failed": 0})
+                key = "sent" if delivery.success else "failed"
+                channel_metrics[key] += 1
+                metrics[key] += 1
+                metrics["rate_limit_wait_seconds"] += waited
+
+        def run(delivery: Delivery):
+            waited = self._wait_for_slot(delivery)
+            try:
+                delivery.success = bool(delivery.send())
+            except Exception as e:
+                logger.error(f"Error sending {delivery.channel} for schedule {delivery.schedule_id}: {e}")
+                delivery.success = False
+            record(delivery, waited)
+
+        batched = [delivery for delivery in deliveries if self._is_batched(delivery)]
+        threaded = [delivery for delivery in deliveries if not self._is_batched(delivery)]
+
+        # Telegram batch runs on the sender's event loop while the thread pool handles the rest
+        telegram_future = None
+        if batched:
+            telegram_future = self.telegram_service.submit_many(
+                [(delivery.recipient, delivery.message) for delivery in batched]
+            )
+
+        if threaded:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="notify") as executor:
+                list(executor.map(run, threaded))
+
+        if telegram_future is not None:
+            try:
+                results = telegram_future.result()
+            except Exception as e:
+                logger.error(f"Error sending Telegram batch: {e}")
+                results = [None] * len(batched)
+            for delivery, result in zip(batched, results):
+                delivery.success = bool(result and result.success)
+                if delivery.success:
+                    logger.info(f"📱 Telegram → Schedule {delivery.schedule_id}")
+                record(delivery, result.retry_after_seconds if result else 0.0)
+
+        elapsed = time.monotonic() - started_at
+        metrics["elapsed_seconds"] = round(elapsed, 3)
+        metrics["rate_limit_wait_seconds"] = round(metrics["rate_limit_wait_seconds"], 3)
+        metrics["messages_per_second"] = round(metrics["total"] / elapsed, 2) if elapsed > 0 else 0.0
+
+        logger.info(
+            f"🚀 Dispatched {metrics['sent']}/{metrics['total']} messages in {metrics['elapsed_seconds']}s "
+            f"({metrics['messages_per_second']} msg/s)"
+        )
+        return metrics
+
+    def _is_batched(self, delivery: Delivery) -> bool:
+        return (
+            self.telegram_service is not None
+            and delivery.channel == self.CHANNEL_TELEGRAM
+            and delivery.message is not None
+        )
+
+    def _wait_for_slot(self, delivery: Delivery) -> float:
+        """Block until the channel (and, for Telegram, the chat) allows one more message"""
+        waited = 0.0
+        if delivery.channel == self.CHANNEL_TELEGRAM:
+            waited += self._chat_bucket(delivery.recipient).acquire()
+
+        bucket = self.channel_buckets.get(delivery.channel)
+        if bucket:
+            waited += bucket.acquire()
+        return waited
+
+    def _chat_bucket(self, chat_id: str) -> TokenBucket:
+        with self._chat_lock:
+            bucket = self._chat_buckets.get(chat_id)
+            if bucket is None:
+                bucket = TokenBucket(self.telegram_chat_rate, capacity=1)
+                self._chat_buckets[chat_id] = bucket
+            return bucket
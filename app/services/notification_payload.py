@@ -0,0 +1,88 @@
+from datetime import date
+from typing import Dict, Optional, Tuple
+from app.models.notification_schedule import NotificationSchedule
+from app.services.lunar_calendar import LunarCalendarService
+from app.services.feng_shui_service import FengShuiService
+
+
+class NotificationPayload:
+    """Everything the channel renderers need for one schedule's notification, as plain data"""
+
+    def __init__(
+        self,
+        schedule: NotificationSchedule,
+        event_date: date,
+        lunar_info: Dict,
+        feng_shui: Dict,
+        birth_date: Optional[date]
+    ):
+        note = schedule.note
+
+        self.schedule_id = schedule.id
+        self.note_title = note.title
+        self.note_content = note.content or ""
+        self.note_solar_date = note.solar_date
+        self.monthly_repeat = note.monthly_repeat
+        self.yearly_repeat = note.yearly_repeat
+
+        self.current_year = schedule.current_year
+        self.current_month = schedule.current_month
+        self.days_before = schedule.current_days_before
+        self.progress = f"{schedule.notifications_sent + 1}/{schedule.total_notifications_needed}"
+
+        self.event_date = event_date
+        self.solar_date_str = event_date.strftime('%d/%m/%Y')
+        self.lunar_date_str = lunar_info['lunar_date_str']
+
+        # Personal advice when the user has a birth date, the general daily analysis otherwise
+        self.birth_date = birth_date
+        self.feng_shui = feng_shui
+
+    @property
+    def is_personal(self) -> bool:
+        return self.birth_date is not None
+
+
+class NotificationPayloadBuilder:
+    """
+    Build notification payloads for a dispatch run
+
+    Lunar info and feng shui are computed once per (event_date, birth_date, method) and shared
+    by every schedule and channel in the run; create one builder per run.
+    """
+
+    # Notifications use the default Mệnh calculation
+    DEFAULT_METHOD = "can_chi"
+
+    def __init__(self, method: str = DEFAULT_METHOD):
+        self.method = method
+        self._lunar_info: Dict[date, Dict] = {}
+        self._feng_shui: Dict[Tuple[date, Optional[date], str], Dict] = {}
+
+    def build(self, schedule: NotificationSchedule, event_date: date) -> NotificationPayload:
+        birth_date = schedule.note.user.birth_date
+        return NotificationPayload(
+            schedule,
+            event_date,
+            self.get_lunar_info(event_date),
+            self.get_feng_shui(event_date, birth_date),
+            birth_date
+        )
+
+    def get_lunar_info(self, event_date: date) -> Dict:
+        lunar_info = self._lunar_info.get(event_date)
+        if lunar_info is None:
+            lunar_info = LunarCalendarService.get_lunar_info(event_date)
+            self._lunar_info[event_date] = lunar_info
+        return lunar_info
+
+    def get_feng_shui(self, event_date: date, birth_date: Optional[date]) -> Dict:
+        key = (event_date, birth_date, self.method)
+        feng_shui = self._feng_shui.get(key)
+        if feng_shui is None:
+            if birth_date:
+                feng_shui = FengShuiService.get_personal_feng_shui_advice(birth_date, event_date, self.method)
+            else:
+                feng_shui = FengShuiService.get_daily_feng_shui_analysis(event_date)
+            self._feng_shui[key] = feng_shui
+        return feng_shui
@@ -1,19 +1,35 @@
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from datetime import datetime, date, timedelta
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from datetime import datetime, date, time, timedelta
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import and_, bindparam, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, contains_eager, joinedload
 from app.config import settings
 from app.models.note import Note
 from app.models.notification_schedule import NotificationSchedule
+from app.models.notification_send_log import NotificationSendLog
+from app.services.note_occurrence_service import NoteOccurrenceService
 from app.services.telegram_service import TelegramService
-from app.services.lunar_calendar import LunarCalendarService
-from app.services.feng_shui_service import FengShuiService
+from app.services.notification_dispatcher import NotificationDispatcher, Delivery
+from app.services.smtp_service import smtp_pool
+from app.services.email_template_service import email_template_service, SIMPLE_NOTIFICATION_TEMPLATE
+from app.services.notification_payload import NotificationPayload, NotificationPayloadBuilder
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Bulk progress write: SET columns come from each parameter row, b_* guard the claimed cycle
+_schedule_table = NotificationSchedule.__table__
+_PROGRESS_UPDATE = update(_schedule_table).where(
+    _schedule_table.c.id == bindparam("b_id"),
+    _schedule_table.c.current_year == bindparam("b_year"),
+    _schedule_table.c.current_month == bindparam("b_month"),
+    _schedule_table.c.current_days_before == bindparam("b_days_before"),
+    _schedule_table.c.is_completed == False
+)
+
 
 class NotificationService:
     """Service for managing notifications with new schedule-based system"""
@@ -48,6 +64,7 @@ class NotificationService:
             current_month=note.solar_date.month,  # Track current month for monthly repeat
             is_completed=False
         )
+        schedule.next_notification_at = self.compute_next_notification_at(note, schedule)
         
         db.add(schedule)
         db.commit()
@@ -55,159 +72,450 @@ class NotificationService:
         logger.info(f"Created notification schedule for note {note.id}: {total_needed} notifications needed, starting from {note.notification_days_before} days before, year {note.solar_date.year}")
         return schedule
     
-    def get_schedules_ready_for_notification(self, db: Session) -> List[NotificationSchedule]:
-        """Get schedules that are ready for next notification"""
-        now = datetime.now()
+    @staticmethod
+    def get_event_date(note: Note, schedule: NotificationSchedule) -> date:
+        """Event date of a note in the schedule's current year/month"""
+        return NoteOccurrenceService.occurrence_in_month(
+            note.solar_date, schedule.current_year, schedule.current_month
+        )
+    
+    @staticmethod
+    def get_notification_time() -> time:
+        """Configured time of day for sending notifications (default 09:00)"""
+        try:
+            time_parts = settings.notification_time.split(":")
+            notification_hour = int(time_parts[0])
+            notification_minute = int(time_parts[1]) if len(time_parts) > 1 else 0
+            return time(hour=notification_hour, minute=notification_minute)
+        except:
+            return time(hour=9, minute=0)
+    
+    @staticmethod
+    def compute_next_notification_at(note: Note, schedule: NotificationSchedule) -> Optional[datetime]:
+        """When the schedule's next notification is due (None once completed)"""
+        if schedule.is_completed:
+            return None
         
-        schedules = db.query(NotificationSchedule).join(Note).filter(
+        event_date = NotificationService.get_event_date(note, schedule)
+        notification_date = event_date - timedelta(days=schedule.current_days_before)
+        return datetime.combine(notification_date, NotificationService.get_notification_time())
+    
+    def backfill_next_notification_at(self, db: Session) -> int:
+        """Fill next_notification_at for active schedules created before the column existed"""
+        schedules = db.query(NotificationSchedule).options(
+            joinedload(NotificationSchedule.note)
+        ).filter(
             NotificationSchedule.is_completed == False,
-            Note.enable_notification == True
+            NotificationSchedule.next_notification_at.is_(None)
         ).all()
         
-        ready_schedules = []
         for schedule in schedules:
-            note = schedule.note
-            
-            # Calculate the event date for current year/month
-            try:
-                event_date_this_period = note.solar_date.replace(
-                    year=schedule.current_year,
-                    month=schedule.current_month
-                )
-            except ValueError:
-                # Handle invalid dates (e.g., 31st of Feb)
-                from calendar import monthrange
-                last_day = monthrange(schedule.current_year, schedule.current_month)[1]
-                event_date_this_period = note.solar_date.replace(
-                    year=schedule.current_year,
-                    month=schedule.current_month,
-                    day=min(note.solar_date.day, last_day)
-                )
-            
-            # Calculate when this notification should be sent
-            notification_date = event_date_this_period - timedelta(days=schedule.current_days_before)
-            
-            # Parse notification time
-            try:
-                time_parts = settings.notification_time.split(":")
-                notification_hour = int(time_parts[0])
-                notification_minute = int(time_parts[1]) if len(time_parts) > 1 else 0
-            except:
-                notification_hour, notification_minute = 9, 0
-            
-            scheduled_time = datetime.combine(
-                notification_date, 
-                datetime.min.time().replace(hour=notification_hour, minute=notification_minute)
+            schedule.next_notification_at = self.compute_next_notification_at(schedule.note, schedule)
+        
+        if schedules:
+            db.commit()
+            logger.info(f"🗓️ Backfilled next_notification_at for {len(schedules)} schedules")
+        
+        return len(schedules)
+    
+    @staticmethod
+    def cycle_key(schedule: NotificationSchedule) -> str:
+        """Idempotency key of the schedule's pending notification: 'year-month-days_before'"""
+        return f"{schedule.current_year}-{schedule.current_month:02d}-{schedule.current_days_before}"
+    
+    @staticmethod
+    def _ready_filters(now: datetime) -> list:
+        """Filters selecting schedules whose next notification is due"""
+        today_start = datetime.combine(now.date(), time.min)
+        return [
+            NotificationSchedule.is_completed == False,
+            NotificationSchedule.next_notification_at <= now,
+            Note.enable_notification == True,
+            # Don't send twice on the same day (prevent duplicate on restart)
+            or_(
+                NotificationSchedule.last_notification_sent.is_(None),
+                NotificationSchedule.last_notification_sent < today_start
             )
-            
-            # Check if it's time to send this notification
-            if scheduled_time <= now:
-                # Additional check: Don't send if already sent today
-                if schedule.last_notification_sent:
-                    last_sent_date = schedule.last_notification_sent.date()
-                    today = now.date()
-                    
-                    # If we already sent today, skip (prevent duplicate on restart)
-                    if last_sent_date == today:
-                        continue
-                
-                ready_schedules.append(schedule)
-                logger.info(f"📅 Schedule {schedule.id}: {note.title} ({schedule.current_days_before}d, year {schedule.current_year})")
+        ]
+    
+    def get_schedules_ready_for_notification(self, db: Session) -> List[NotificationSchedule]:
+        """Get schedules that are ready for next notification"""
+        self.backfill_next_notification_at(db)
+        
+        ready_schedules = db.query(NotificationSchedule).join(Note).options(
+            contains_eager(NotificationSchedule.note).joinedload(Note.user)
+        ).filter(
+            *self._ready_filters(datetime.now())
+        ).order_by(NotificationSchedule.next_notification_at).all()
+        
+        for schedule in ready_schedules:
+            logger.info(f"📅 Schedule {schedule.id}: {schedule.note.title} ({schedule.current_days_before}d, year {schedule.current_year})")
         
         return ready_schedules
     
+    def get_ready_schedule_keys(self, db: Session) -> List[Tuple[int, str]]:
+        """
+        Get (schedule_id, cycle_key) of every due schedule without loading notes or users
+        Ordered by user so one user's notifications tend to land in the same batch
+        """
+        self.backfill_next_notification_at(db)
+        
+        rows = db.query(
+            NotificationSchedule.id,
+            NotificationSchedule.current_year,
+            NotificationSchedule.current_month,
+            NotificationSchedule.current_days_before
+        ).join(Note).filter(
+            *self._ready_filters(datetime.now())
+        ).order_by(Note.user_id, NotificationSchedule.id).all()
+        
+        return [
+            (schedule_id, f"{year}-{month:02d}-{days_before}")
+            for schedule_id, year, month, days_before in rows
+        ]
+    
     def send_notification_for_schedule(self, db: Session, schedule: NotificationSchedule) -> bool:
         """Send notification for a schedule and update progress"""
+        result = self.process_schedule_batch(db, [(schedule.id, self.cycle_key(schedule))])
+        return result["processed"] == 1
+    
+    def process_schedule_batch(self, db: Session, items: List[Tuple[int, str]]) -> dict:
+        """
+        Send the pending notification of each (schedule_id, cycle_key) at most once
+        
+        Each notification is claimed through a unique NotificationSendLog row before sending,
+        so retried tasks and overlapping beat runs skip anything already sent or in flight.
+        """
+        keys = {schedule_id: cycle_key for schedule_id, cycle_key in items}
+        schedules = db.query(NotificationSchedule).options(
+            joinedload(NotificationSchedule.note).joinedload(Note.user)
+        ).filter(
+            NotificationSchedule.id.in_(list(keys))
+        ).order_by(NotificationSchedule.id).all()
+        
+        pending = []
+        skipped = 0
+        for schedule in schedules:
+            if schedule.is_completed or self.cycle_key(schedule) != keys[schedule.id]:
+                # Already advanced by another run
+                skipped += 1
+                continue
+            pending.append(schedule)
+        
+        # Claim every notification in one transaction
+        log_ids = self._claim_notifications(db, pending)
+        skipped += len(pending) - len(log_ids)
+        
+        # The claim commit expired the loaded rows; reload the claimed ones in a single query
+        if log_ids:
+            schedules = db.query(NotificationSchedule).options(
+                joinedload(NotificationSchedule.note).joinedload(Note.user)
+            ).filter(
+                NotificationSchedule.id.in_(list(log_ids))
+            ).order_by(NotificationSchedule.id).all()
+        else:
+            schedules = []
+        
+        # Render every message up front, sharing lunar/feng shui results across the batch
+        payload_builder = NotificationPayloadBuilder()
+        claimed = []
+        for schedule in schedules:
+            try:
+                deliveries = self.prepare_deliveries(schedule, payload_builder)
+            except Exception as e:
+                logger.error(f"Error preparing schedule {schedule.id}: {e}")
+                deliveries = []
+            claimed.append((schedule, log_ids[schedule.id], deliveries))
+        
+        if not claimed:
+            return {"processed": 0, "failed": 0, "skipped": skipped, "total": len(items),
+                    "message": "Không có thông báo nào cần gửi"}
+        
+        metrics = NotificationDispatcher(telegram_service=self.telegram_service).dispatch(
+            [delivery for _, _, deliveries in claimed for delivery in deliveries]
+        )
+        metrics["smtp_pool"] = smtp_pool.get_metrics()
+        
+        processed, failed = self._apply_results(db, [
+            (schedule, log_id, any(delivery.success for delivery in deliveries))
+            for schedule, log_id, deliveries in claimed
+        ])
+        
+        return {
+            "processed": processed,
+            "failed": failed,
+            "skipped": skipped,
+            "total": len(items),
+            "metrics": metrics,
+            "message": f"Đã xử lý {processed}/{len(items)} lịch thông báo"
+        }
+    
+    def _apply_results(self, db: Session, results: List[Tuple[NotificationSchedule, int, bool]]) -> Tuple[int, int]:
+        """
+        Write schedule progress and send-log status with bulk UPDATEs, one transaction per chunk
+        
+        Progress rows only match while the schedule is still in the claimed cycle, so replaying a
+        chunk that was already committed can't count a notification twice.
+        
+        Args:
+            results: (schedule, send_log_id, success) per claimed notification
+        
+        Returns:
+            (processed, failed)
+        """
+        # Build every row before the first commit expires the loaded schedules
+        rows = []
+        for schedule, log_id, success in results:
+            progress = None
+            if success:
+                progress = {
+                    "b_id": schedule.id,
+                    "b_year": schedule.current_year,
+                    "b_month": schedule.current_month,
+                    "b_days_before": schedule.current_days_before,
+                    **self._next_progress(schedule)
+                }
+            rows.append((log_id, progress))
+        
+        processed = 0
+        failed = 0
+        batch_size = max(1, settings.notification_batch_size)
+        
+        for start in range(0, len(rows), batch_size):
+            chunk = rows[start:start + batch_size]
+            progress_rows = [progress for _, progress in chunk if progress]
+            sent_log_ids = [log_id for log_id, progress in chunk if progress]
+            failed_log_ids = [log_id for log_id, progress in chunk if not progress]
+            
+            try:
+                if progress_rows:
+                    updated = db.execute(_PROGRESS_UPDATE, progress_rows).rowcount
+                    if updated != len(progress_rows):
+                        logger.warning(f"⏭️ {len(progress_rows) - updated} schedules were already advanced")
+                
+                for status, log_ids in (
+                    (NotificationSendLog.STATUS_SENT, sent_log_ids),
+                    (NotificationSendLog.STATUS_FAILED, failed_log_ids)
+                ):
+                    if log_ids:
+                        db.query(NotificationSendLog).filter(
+                            NotificationSendLog.id.in_(log_ids),
+                            NotificationSendLog.status == NotificationSendLog.STATUS_SENDING
+                        ).update({"status": status}, synchronize_session=False)
+                
+                db.commit()
+                processed += len(sent_log_ids)
+                failed += len(failed_log_ids)
+                
+            except Exception as e:
+                # Claims stay "sending" and are retried once notification_claim_timeout passes
+                logger.error(f"Error saving progress for {len(chunk)} schedules: {e}")
+                db.rollback()
+                failed += len(chunk)
+        
+        return processed, failed
+    
+    def _claim_notifications(self, db: Session, schedules: List[NotificationSchedule]) -> Dict[int, int]:
+        """
+        Claim the pending notification of many schedules
+        
+        Inserts every claim in one transaction; if any already exists (a retry or an overlapping run)
+        falls back to claiming row by row.
+        
+        Returns:
+            {schedule_id: send_log_id} for the schedules claimed by this run
+        """
+        if not schedules:
+            return {}
+        
+        now = datetime.now()
+        send_logs = {
+            schedule.id: NotificationSendLog(
+                schedule_id=schedule.id,
+                cycle_year=schedule.current_year,
+                cycle_month=schedule.current_month,
+                days_before=schedule.current_days_before,
+                status=NotificationSendLog.STATUS_SENDING,
+                claimed_at=now
+            )
+            for schedule in schedules
+        }
+        # Read what the fallback needs while the rows are still loaded
+        cycles = [(schedule.id, schedule.current_year, schedule.current_month, schedule.current_days_before)
+                  for schedule in schedules]
+        
+        db.add_all(send_logs.values())
+        try:
+            db.flush()
+            log_ids = {schedule_id: send_log.id for schedule_id, send_log in send_logs.items()}
+            db.commit()
+            return log_ids
+        except IntegrityError:
+            db.rollback()
+        
+        log_ids = {}
+        for cycle in cycles:
+            log_id = self._claim_notification(db, *cycle)
+            if log_id is not None:
+                log_ids[cycle[0]] = log_id
+        return log_ids
+    
+    def _claim_notification(self, db: Session, schedule_id: int, cycle_year: int, cycle_month: int,
+                            days_before: int) -> Optional[int]:
+        """
+        Atomically claim one schedule's pending notification
+        
+        Returns the claimed log id, or None if it was already sent or is being sent elsewhere.
+        Failed claims, and claims abandoned for longer than notification_claim_timeout, can be taken over.
+        """
+        now = datetime.now()
+        key_filters = [
+            NotificationSendLog.schedule_id == schedule_id,
+            NotificationSendLog.cycle_year == cycle_year,
+            NotificationSendLog.cycle_month == cycle_month,
+            NotificationSendLog.days_before == days_before
+        ]
+        
+        send_log = NotificationSendLog(
+            schedule_id=schedule_id,
+            cycle_year=cycle_year,
+            cycle_month=cycle_month,
+            days_before=days_before,
+            status=NotificationSendLog.STATUS_SENDING,
+            claimed_at=now
+        )
+        db.add(send_log)
+        try:
+            db.flush()
+            log_id = send_log.id
+            db.commit()
+            return log_id
+        except IntegrityError:
+            db.rollback()
+        
+        stale_before = now - timedelta(seconds=settings.notification_claim_timeout)
+        taken_over = db.query(NotificationSendLog).filter(
+            *key_filters,
+            or_(
+                NotificationSendLog.status == NotificationSendLog.STATUS_FAILED,
+                and_(
+                    NotificationSendLog.status == NotificationSendLog.STATUS_SENDING,
+                    NotificationSendLog.claimed_at < stale_before
+                )
+            )
+        ).update({"status": NotificationSendLog.STATUS_SENDING, "claimed_at": now}, synchronize_session=False)
+        db.commit()
+        
+        if not taken_over:
+            logger.info(f"⏭️ Schedule {schedule_id}: {cycle_year}-{cycle_month:02d}-{days_before} already sent or in progress")
+            return None
+        
+        return db.query(NotificationSendLog.id).filter(*key_filters).scalar()
+    
+    def prepare_deliveries(self, schedule: NotificationSchedule,
+                           payload_builder: NotificationPayloadBuilder = None) -> List[Delivery]:
+        """
+        Build the messages of every enabled channel for a schedule
+        
+        Messages are rendered here, so the returned Delivery.send callables only hold plain data
+        and can run on worker threads without touching the database session.
+        The schedule's payload is built once and shared by every channel; pass the run's
+        payload_builder to also share lunar/feng shui results across schedules.
+        """
         note = schedule.note
         user = note.user
         
         if not user:
             logger.error(f"No user found for note {note.id}")
-            return False
+            return []
         
-        success_count = 0
-        total_attempts = 0
-        
-        # Send Telegram notification if enabled
-        if user.telegram_notifications and user.telegram_chat_id and settings.telegram_bot_token:
-            total_attempts += 1
-            if self._send_telegram_for_schedule(schedule):
-                success_count += 1
-        
-        # Send Email notification if enabled
-        if user.email_notifications and settings.smtp_username:
-            total_attempts += 1
-            if self._send_email_for_schedule(schedule):
-                success_count += 1
-        
-        # Update schedule progress
-        if success_count > 0:
-            schedule.notifications_sent += 1
-            schedule.last_notification_sent = datetime.now()
-            
-            # Move to next notification or complete/repeat
-            if schedule.current_days_before > 0:
-                schedule.current_days_before -= 1
-                logger.info(f"➡️ Schedule {schedule.id}: Next {schedule.current_days_before}d")
+        deliveries = []
+        send_telegram = bool(user.telegram_notifications and user.telegram_chat_id and settings.telegram_bot_token)
+        send_email = bool(user.email_notifications and settings.smtp_username)
+        if not send_telegram and not send_email:
+            return deliveries
+        
+        try:
+            payload = (payload_builder or NotificationPayloadBuilder()).build(
+                schedule, self.get_event_date(note, schedule)
+            )
+        except Exception as e:
+            logger.error(f"Error building notification payload for schedule {schedule.id}: {e}")
+            return deliveries
+        
+        # Telegram notification if enabled
+        if send_telegram:
+            message = self._build_telegram_message(payload)
+            if message is not None:
+                chat_id = user.telegram_chat_id
+                deliveries.append(Delivery(
+                    schedule.id, NotificationDispatcher.CHANNEL_TELEGRAM, chat_id,
+                    lambda schedule_id=schedule.id, chat_id=chat_id, message=message:
+                        self._send_telegram(schedule_id, chat_id, message),
+                    message=message
+                ))
+        
+        # Email notification if enabled
+        if send_email:
+            msg = self._build_email_message(payload, user.email)
+            if msg is not None:
+                to_email = user.email
+                deliveries.append(Delivery(
+                    schedule.id, NotificationDispatcher.CHANNEL_EMAIL, to_email,
+                    lambda schedule_id=schedule.id, to_email=to_email, msg=msg:
+                        self._send_email(schedule_id, to_email, msg)
+                ))
+        
+        return deliveries
+    
+    def _next_progress(self, schedule: NotificationSchedule) -> dict:
+        """Column values that record a sent notification and move the schedule to its next step"""
+        note = schedule.note
+        progress = {
+            "notifications_sent": schedule.notifications_sent + 1,
+            "last_notification_sent": datetime.now(),
+            "current_days_before": schedule.current_days_before,
+            "current_year": schedule.current_year,
+            "current_month": schedule.current_month,
+            "is_completed": False
+        }
+        
+        # Move to next notification or complete/repeat
+        if progress["current_days_before"] > 0:
+            progress["current_days_before"] -= 1
+            logger.info(f"➡️ Schedule {schedule.id}: Next {progress['current_days_before']}d")
+        else:
+            # Completed current cycle
+            if note.monthly_repeat:
+                # Reset for next month
+                progress["current_month"] += 1
+                if progress["current_month"] > 12:
+                    progress["current_month"] = 1
+                    progress["current_year"] += 1
+                progress["current_days_before"] = note.notification_days_before
+                progress["notifications_sent"] = 0
+                logger.info(f"🔄 Schedule {schedule.id}: Reset for {progress['current_year']}/{progress['current_month']:02d}")
+            elif note.yearly_repeat:
+                # Reset for next year
+                progress["current_year"] += 1
+                progress["current_days_before"] = note.notification_days_before
+                progress["notifications_sent"] = 0
+                logger.info(f"🔄 Schedule {schedule.id}: Reset for year {progress['current_year']}")
             else:
-                # Completed current cycle
-                if note.monthly_repeat:
-                    # Reset for next month
-                    schedule.current_month += 1
-                    if schedule.current_month > 12:
-                        schedule.current_month = 1
-                        schedule.current_year += 1
-                    schedule.current_days_before = note.notification_days_before
-                    schedule.notifications_sent = 0
-                    schedule.is_completed = False
-                    logger.info(f"🔄 Schedule {schedule.id}: Reset for {schedule.current_year}/{schedule.current_month:02d}")
-                elif note.yearly_repeat:
-                    # Reset for next year
-                    schedule.current_year += 1
-                    schedule.current_days_before = note.notification_days_before
-                    schedule.notifications_sent = 0
-                    schedule.is_completed = False
-                    logger.info(f"🔄 Schedule {schedule.id}: Reset for year {schedule.current_year}")
-                else:
-                    # Mark as completed
-                    schedule.is_completed = True
-                    logger.info(f"✅ Schedule {schedule.id}: Completed")
-            
-            db.commit()
-            return True
+                # Mark as completed
+                progress["is_completed"] = True
+                logger.info(f"✅ Schedule {schedule.id}: Completed")
         
-        return False
+        progress["next_notification_at"] = self.compute_next_notification_at(note, SimpleNamespace(**progress))
+        return progress
     
-    def _send_telegram_for_schedule(self, schedule: NotificationSchedule) -> bool:
-        """Send Telegram notification for schedule"""
+    def _build_telegram_message(self, payload: NotificationPayload) -> Optional[str]:
+        """Build Telegram notification text for schedule"""
         try:
-            note = schedule.note
-            user = note.user
-            
-            # Calculate event date for current year/month
-            try:
-                event_date_this_period = note.solar_date.replace(
-                    year=schedule.current_year,
-                    month=schedule.current_month
-                )
-            except ValueError:
-                # Handle invalid dates
-                from calendar import monthrange
-                last_day = monthrange(schedule.current_year, schedule.current_month)[1]
-                event_date_this_period = note.solar_date.replace(
-                    year=schedule.current_year,
-                    month=schedule.current_month,
-                    day=min(note.solar_date.day, last_day)
-                )
-            
-            lunar_info = LunarCalendarService.get_lunar_info(event_date_this_period)
-            
             # Get personalized feng shui if user has birth date
             feng_shui_content = ""
-            if user.birth_date:
-                personal_feng_shui = FengShuiService.get_personal_feng_shui_advice(
-                    user.birth_date, event_date_this_period
-                )
+            if payload.is_personal:
+                personal_feng_shui = payload.feng_shui
                 
                 # Check for birthday
                 birthday_msg = ""
@@ -223,7 +531,7 @@ class NotificationService:
 • Lời khuyên: {personal_feng_shui['personal_advice']['overall_advice']}{birthday_msg}"""
             else:
                 # General feng shui analysis
-                feng_shui_analysis = FengShuiService.get_daily_feng_shui_analysis(event_date_this_period)
+                feng_shui_analysis = payload.feng_shui
                 feng_shui_content = f"""🔮 Phong thủy:
 • Can Chi: {feng_shui_analysis['can_chi']}
 • Ngũ hành: {feng_shui_analysis['element'].value}
@@ -231,96 +539,77 @@ class NotificationService:
 • Hướng tốt: {feng_shui_analysis['lucky_direction']}
 • Nên làm: {', '.join(feng_shui_analysis['lucky_activities'][:2])}"""
             
-            if schedule.current_days_before == 0:
+            if payload.days_before == 0:
                 time_msg = "⏰ Hôm nay là ngày sự kiện!"
             else:
-                time_msg = f"⏰ Thông báo trước {schedule.current_days_before} ngày - Còn {schedule.current_days_before} ngày nữa!"
+                time_msg = f"⏰ Thông báo trước {payload.days_before} ngày - Còn {payload.days_before} ngày nữa!"
             
             # Add repeat info
             repeat_info = ""
-            if note.monthly_repeat:
-                if schedule.current_year != note.solar_date.year or schedule.current_month != note.solar_date.month:
-                    repeat_info = f"\n📅 Lặp lại hàng tháng - {schedule.current_year}/{schedule.current_month:02d}"
+            if payload.monthly_repeat:
+                if payload.current_year != payload.note_solar_date.year or payload.current_month != payload.note_solar_date.month:
+                    repeat_info = f"\n📅 Lặp lại hàng tháng - {payload.current_year}/{payload.current_month:02d}"
                 else:
                     repeat_info = f"\n📅 Sẽ lặp lại hàng tháng"
-            elif note.yearly_repeat:
-                if schedule.current_year != note.solar_date.year:
-                    repeat_info = f"\n🔄 Lặp lại hàng năm - Năm {schedule.current_year}"
+            elif payload.yearly_repeat:
+                if payload.current_year != payload.note_solar_date.year:
+                    repeat_info = f"\n🔄 Lặp lại hàng năm - Năm {payload.current_year}"
                 else:
                     repeat_info = f"\n🔄 Sẽ lặp lại hàng năm"
             
-            message = f"""🔔 Nhắc nhở: {note.title}
+            message = f"""🔔 Nhắc nhở: {payload.note_title}
 
-📝 Nội dung: {note.content or ""}
+📝 Nội dung: {payload.note_content}
 
-📅 Ngày dương: {event_date_this_period.strftime('%d/%m/%Y')}
-🌙 Ngày âm: {lunar_info['lunar_date_str']}
+📅 Ngày dương: {payload.solar_date_str}
+🌙 Ngày âm: {payload.lunar_date_str}
 
 {feng_shui_content}
 
 {time_msg}{repeat_info}
 
-📊 Tiến trình: {schedule.notifications_sent + 1}/{schedule.total_notifications_needed}"""
+📊 Tiến trình: {payload.progress}"""
             
-            success = self.telegram_service.send_message_sync(
-                message=message,
-                chat_id=user.telegram_chat_id
-            )
-            
-            if success:
-                logger.info(f"📱 Telegram → Schedule {schedule.id}")
-            
-            return success
+            return message
             
         except Exception as e:
-            logger.error(f"Error sending Telegram for schedule {schedule.id}: {e}")
-            return False
+            logger.error(f"Error building Telegram message for schedule {payload.schedule_id}: {e}")
+            return None
     
-    def _send_email_for_schedule(self, schedule: NotificationSchedule) -> bool:
-        """Send Email notification for schedule"""
+    def _send_telegram(self, schedule_id: int, chat_id: str, message: str) -> bool:
+        """Send a prepared Telegram message"""
+        success = self.telegram_service.send_message_sync(
+            message=message,
+            chat_id=chat_id
+        )
+        
+        if success:
+            logger.info(f"📱 Telegram → Schedule {schedule_id}")
+        
+        return success
+    
+    def _build_email_message(self, payload: NotificationPayload, to_email: str) -> Optional[MIMEMultipart]:
+        """Build Email notification message for schedule"""
         try:
-            note = schedule.note
-            user = note.user
-            
             # Create message
             msg = MIMEMultipart('alternative')
             msg['From'] = settings.from_email
-            msg['To'] = user.email
+            msg['To'] = to_email
             
             # Create subject
-            if schedule.current_days_before == 0:
-                subject = f"🔔 Hôm nay: {note.title}"
+            if payload.days_before == 0:
+                subject = f"🔔 Hôm nay: {payload.note_title}"
             else:
-                subject = f"🔔 Nhắc trước {schedule.current_days_before} ngày: {note.title}"
+                subject = f"🔔 Nhắc trước {payload.days_before} ngày: {payload.note_title}"
             
             msg['Subject'] = subject
             
-            # Get lunar info and feng shui analysis
-            try:
-                event_date_this_period = note.solar_date.replace(
-                    year=schedule.current_year,
-                    month=schedule.current_month
-                )
-            except ValueError:
-                from calendar import monthrange
-                last_day = monthrange(schedule.current_year, schedule.current_month)[1]
-                event_date_this_period = note.solar_date.replace(
-                    year=schedule.current_year,
-                    month=schedule.current_month,
-                    day=min(note.solar_date.day, last_day)
-                )
-            
-            lunar_info = LunarCalendarService.get_lunar_info(event_date_this_period)
-            
             # Get personalized feng shui if user has birth date
-            feng_shui_data = None
+            feng_shui_data = payload.feng_shui
             feng_shui_summary = ""
             
-            if user.birth_date:
-                personal_feng_shui = FengShuiService.get_personal_feng_shui_advice(
-                    user.birth_date, event_date_this_period
-                )
-                feng_shui_data = personal_feng_shui
+            if payload.is_personal:
+                personal_feng_shui = feng_shui_data
                 
                 # Check for birthday
                 birthday_msg = ""
@@ -328,7 +617,7 @@ class NotificationService:
                     birthday_msg = f"\n🎉 {personal_feng_shui['birthday_reminder']['message']}"
                 
                 feng_shui_summary = f"""
-🔮 Phong thủy cá nhân ngày {event_date_this_period.strftime('%d/%m/%Y')}:
+🔮 Phong thủy cá nhân ngày {payload.solar_date_str}:
 - Mệnh: {personal_feng_shui['user_info']['birth_year_element']} ({personal_feng_shui['user_info']['birth_year_desc']})
 - Can Chi ngày: {personal_feng_shui['day_info']['can_chi']}
 - Tương thích: {personal_feng_shui['compatibility']['level']} ({personal_feng_shui['compatibility']['score']}/100)
@@ -337,11 +626,10 @@ class NotificationService:
 - Lời khuyên: {personal_feng_shui['personal_advice']['overall_advice']}{birthday_msg}
                 """.strip()
             else:
-                feng_shui_analysis = FengShuiService.get_daily_feng_shui_analysis(event_date_this_period)
-                feng_shui_data = feng_shui_analysis
+                feng_shui_analysis = feng_shui_data
                 
                 feng_shui_summary = f"""
-🔮 Phong thủy ngày {event_date_this_period.strftime('%d/%m/%Y')}:
+🔮 Phong thủy ngày {payload.solar_date_str}:
 - Can Chi: {feng_shui_analysis['can_chi']}
 - Ngũ hành: {feng_shui_analysis['element'].value}
 - Màu may mắn: {', '.join(feng_shui_analysis['lucky_colors'][:3])}
@@ -350,27 +638,27 @@ class NotificationService:
                 """.strip()
             
             # Create plain text version
-            if schedule.current_days_before == 0:
+            if payload.days_before == 0:
                 time_msg = "Hôm nay là ngày sự kiện!"
             else:
-                time_msg = f"Thông báo trước {schedule.current_days_before} ngày - Còn {schedule.current_days_before} ngày nữa!"
+                time_msg = f"Thông báo trước {payload.days_before} ngày - Còn {payload.days_before} ngày nữa!"
 
             text_body = f"""
 Xin chào!
 
 Đây là lời nhắc nhở về ghi chú của bạn:
 
-Tiêu đề: {note.title}
-Nội dung: {note.content or ""}
+Tiêu đề: {payload.note_title}
+Nội dung: {payload.note_content}
 
-Ngày dương: {event_date_this_period.strftime('%d/%m/%Y')}
-Ngày âm: {lunar_info['lunar_date_str']}
+Ngày dương: {payload.solar_date_str}
+Ngày âm: {payload.lunar_date_str}
 
 {feng_shui_summary}
 
 {time_msg}
 
-Tiến trình: {schedule.notifications_sent + 1}/{schedule.total_notifications_needed}
+Tiến trình: {payload.progress}
 
 Trân trọng,
 Hệ thống Calendar
@@ -378,22 +666,16 @@ Hệ thống Calendar
             
             # Create HTML version
             try:
-                from jinja2 import Environment, FileSystemLoader
-                import os
-                
-                template_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates', 'email')
-                env = Environment(loader=FileSystemLoader(template_dir))
-                template = env.get_template('simple_notification.html')
-                
-                html_body = template.render(
-                    note_title=note.title,
-                    note_content=note.content or "",
-                    solar_date=event_date_this_period.strftime('%d/%m/%Y'),
-                    lunar_date=lunar_info['lunar_date_str'],
-                    days_before=schedule.current_days_before,
-                    progress=f"{schedule.notifications_sent + 1}/{schedule.total_notifications_needed}",
+                html_body = email_template_service.render(
+                    SIMPLE_NOTIFICATION_TEMPLATE,
+                    note_title=payload.note_title,
+                    note_content=payload.note_content,
+                    solar_date=payload.solar_date_str,
+                    lunar_date=payload.lunar_date_str,
+                    days_before=payload.days_before,
+                    progress=payload.progress,
                     feng_shui_data=feng_shui_data,
-                    user_birth_date=user.birth_date
+                    user_birth_date=payload.birth_date
                 )
                 
                 msg.attach(MIMEText(text_body, 'plain', 'utf-8'))
@@ -402,53 +684,34 @@ Hệ thống Calendar
             except Exception:
                 msg.attach(MIMEText(text_body, 'plain', 'utf-8'))
             
-            # Send email
-            server = smtplib.SMTP(settings.smtp_host, settings.smtp_port)
-            server.starttls()
-            server.login(settings.smtp_username, settings.smtp_password)
-            text = msg.as_string()
-            server.sendmail(settings.from_email, user.email, text)
-            server.quit()
+            return msg
             
-            logger.info(f"📧 Email → Schedule {schedule.id}")
-            return True
+        except Exception as e:
+            logger.error(f"Error building email for schedule {payload.schedule_id}: {e}")
+            return None
+    
+    def _send_email(self, schedule_id: int, to_email: str, msg: MIMEMultipart) -> bool:
+        """Send a prepared email message"""
+        try:
+            success = smtp_pool.send(settings.from_email, to_email, msg)
+            
+            if success:
+                logger.info(f"📧 Email → Schedule {schedule_id}")
+            
+            return success
             
         except Exception as e:
-            logger.error(f"Error sending email for schedule {schedule.id}: {e}")
+            logger.error(f"Error sending email for schedule {schedule_id}: {e}")
             return False
     
     def process_all_ready_schedules(self, db: Session) -> dict:
         """Process all schedules ready for notification"""
-        ready_schedules = self.get_schedules_ready_for_notification(db)
+        ready_keys = self.get_ready_schedule_keys(db)
         
-        if not ready_schedules:
+        if not ready_keys:
             return {"processed": 0, "failed": 0, "message": "Không có thông báo nào cần gửi"}
         
-        processed = 0
-        failed = 0
-        
-        for schedule in ready_schedules:
-            try:
-                if self.send_notification_for_schedule(db, schedule):
-                    processed += 1
-                else:
-                    failed += 1
-                    
-                # Add delay between notifications
-                import time, random
-                delay = random.uniform(2.0, 4.0)
-                time.sleep(delay)
-                
-            except Exception as e:
-                logger.error(f"Error processing schedule {schedule.id}: {e}")
-                failed += 1
-        
-        return {
-            "processed": processed,
-            "failed": failed,
-            "total": len(ready_schedules),
-            "message": f"Đã xử lý {processed}/{len(ready_schedules)} lịch thông báo"
-        }
+        return self.process_schedule_batch(db, ready_keys)
     
     def cleanup_old_completed_schedules(self, db: Session, days_old: int = 30) -> int:
         """Clean up completed schedules older than specified days"""
@@ -468,6 +731,11 @@ Hệ thống Calendar
         for schedule in old_schedules:
             db.delete(schedule)
         
+        # Delete old idempotency records (their notifications can no longer be retried)
+        db.query(NotificationSendLog).filter(
+            NotificationSendLog.claimed_at < cutoff_date
+        ).delete(synchronize_session=False)
+        
         db.commit()
         logger.info(f"🧹 Cleaned {count} old schedules")
         
@@ -0,0 +1,146 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryPageCacheBackend:
+    """In-process LRU backend with per-entry expiry"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+
+            html, expires_at = item
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return html
+
+    def set(self, key: str, html: str, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (html, time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisPageCacheBackend:
+    """Redis backend shared by all uvicorn workers"""
+
+    def __init__(self, redis_url: str, prefix: str = "page:"):
+        import redis
+
+        self.client = redis.Redis.from_url(redis_url, socket_timeout=2, socket_connect_timeout=2)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            raw = self.client.get(self.prefix + key)
+        except Exception as e:
+            logger.warning(f"Redis page cache read failed: {e}")
+            return None
+        return raw.decode("utf-8") if raw else None
+
+    def set(self, key: str, html: str, ttl: int) -> None:
+        try:
+            self.client.set(self.prefix + key, html.encode("utf-8"), ex=ttl)
+        except Exception as e:
+            logger.warning(f"Redis page cache write failed: {e}")
+
+    def clear(self) -> None:
+        # Entries expire on their own; keys also change with the date and holiday version
+        pass
+
+
+class PageCache:
+    """
+    Rendered-HTML cache for pages that do not depend on the user
+
+    Keys are built from every input of the page, so entries never need invalidation;
+    the TTL only bounds how long unused pages are kept. Backends are looked up in order
+    (fastest first) and written to all of them.
+    """
+
+    def __init__(self, backends: List, ttl: int):
+        self.backends = backends
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        return hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        for index, backend in enumerate(self.backends):
+            html = backend.get(key)
+            if html is not None:
+                # Backfill faster backends
+                for faster in self.backends[:index]:
+                    faster.set(key, html, self.ttl)
+                self._count(hit=True)
+                return html
+
+        self._count(hit=False)
+        return None
+
+    def set(self, key: str, html: str) -> None:
+        for backend in self.backends:
+            backend.set(key, html, self.ttl)
+
+    def clear(self) -> None:
+        for backend in self.backends:
+            backend.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
+def create_page_cache() -> PageCache:
+    """Create the page cache from settings (in-process LRU, plus Redis when configured)"""
+    backends = [MemoryPageCacheBackend(settings.page_cache_max_entries)]
+
+    if settings.redis_url:
+        try:
+            backends.append(RedisPageCacheBackend(settings.redis_url))
+        except Exception as e:
+            logger.warning(f"Redis page cache disabled: {e}")
+
+    return PageCache(backends, ttl=settings.page_cache_ttl)
+
+
+# Global instance for guest calendar pages
+guest_page_cache = create_page_cache()
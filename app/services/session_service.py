@@ -1,9 +1,11 @@
 from fastapi import Request, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
 from typing import Optional
 from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
 from app.config import settings
 from app.models.user import User
+from app.services.user_cache import UserCache, create_user_cache
 from app.logging_config import get_logger
 
 logger = get_logger('app.session')
@@ -12,9 +14,10 @@ logger = get_logger('app.session')
 class SessionService:
     """Service for managing user sessions"""
     
-    def __init__(self):
+    def __init__(self, user_cache: UserCache = None):
         self.serializer = URLSafeTimedSerializer(settings.secret_key)
         self.session_timeout = 30 * 24 * 60 * 60  # 30 days in seconds
+        self.user_cache = user_cache or create_user_cache()
     
     def create_session_token(self, user_id: int) -> str:
         """
@@ -66,12 +69,45 @@ class SessionService:
         if not user_id:
             return None
         
+        # Serve the user from the snapshot cache when possible
+        user = self._user_from_cache(db, user_id)
+        if user is not None:
+            return user
+        
         # Get user from database
         user = db.query(User).filter(
             User.id == user_id,
             User.is_active == True
         ).first()
         
+        if user:
+            self.user_cache.set(user)
+        
+        return user
+    
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop the cached snapshot of a user; call after committing changes to the user row"""
+        self.user_cache.invalidate(user_id)
+    
+    def _user_from_cache(self, db: Session, user_id: int) -> Optional[User]:
+        """
+        Attach a cached user snapshot to the session without querying
+        
+        The instance is persistent in db as if it had been loaded, so changes to it are
+        flushed as usual and relationships lazy-load normally.
+        """
+        # Already loaded in this session (e.g. require_auth after get_current_user)
+        user = db.identity_map.get(identity_key(User, user_id))
+        if user is not None:
+            return user if user.is_active else None
+        
+        values = self.user_cache.get(user_id)
+        if values is None:
+            return None
+        
+        user = User(**values)
+        make_transient_to_detached(user)
+        db.add(user)
         return user
     
     def require_auth(self, request: Request, db: Session) -> User:
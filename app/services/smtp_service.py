@@ -0,0 +1,212 @@
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from email.message import Message
+from typing import Dict, List, Optional, Tuple
+from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# SMTP errors after which a connection can't be reused (socket-level OSErrors are handled
+# the same way; every SMTPException is itself an OSError, so those are told apart first)
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)
+
+
+class SMTPConnectionPool:
+    """Pool of authenticated SMTP connections kept alive between emails"""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str = "",
+        password: str = "",
+        use_tls: bool = True,
+        max_size: int = 4,
+        max_idle_seconds: float = 60.0,
+        timeout: float = 30.0
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.max_size = max_size
+        self.max_idle_seconds = max_idle_seconds
+        self.timeout = timeout
+
+        self._idle = []  # [(connection, last_used_at)]
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._metrics = {
+            "connections_opened": 0,
+            "connections_reused": 0,
+            "reconnects": 0,
+            "sent": 0,
+            "failed": 0
+        }
+
+    @classmethod
+    def from_settings(cls) -> "SMTPConnectionPool":
+        return cls(
+            host=settings.smtp_host,
+            port=settings.smtp_port,
+            username=settings.smtp_username,
+            password=settings.smtp_password,
+            use_tls=settings.smtp_use_tls,
+            max_size=settings.smtp_pool_size,
+            max_idle_seconds=settings.smtp_pool_max_idle
+        )
+
+    def send(self, from_addr: str, to_addr: str, msg: Message) -> bool:
+        """
+        Send one email over a pooled connection, reconnecting once if the server dropped it
+
+        Returns:
+            True if the server accepted the message
+        """
+        with self.connection() as handle:
+            return self._send_on(handle, from_addr, to_addr, msg)
+
+    def send_many(self, messages: List[Tuple[str, str, Message]]) -> List[bool]:
+        """
+        Send a batch of (from_addr, to_addr, msg) over a single SMTP session
+
+        Returns:
+            Per-message success flags, in input order
+        """
+        results = []
+        with self.connection() as handle:
+            for from_addr, to_addr, msg in messages:
+                results.append(self._send_on(handle, from_addr, to_addr, msg))
+        return results
+
+    @contextmanager
+    def connection(self):
+        """Borrow a live connection (opening one if needed) and return it to the pool afterwards"""
+        self._slots.acquire()
+        holder = {"conn": None}
+        try:
+            holder["conn"] = self._checkout()
+            yield _ConnectionHandle(self, holder)
+        finally:
+            conn = holder["conn"]
+            if conn is not None:
+                with self._lock:
+                    self._idle.append((conn, time.monotonic()))
+            self._slots.release()
+
+    def get_metrics(self) -> Dict:
+        """Pool counters plus current idle connection count"""
+        with self._lock:
+            return {**self._metrics, "idle": len(self._idle), "max_size": self.max_size}
+
+    def close_all(self) -> None:
+        """Close every idle connection"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._close(conn)
+
+    def _send_on(self, handle: "_ConnectionHandle", from_addr: str, to_addr: str, msg: Message) -> bool:
+        """Send on a borrowed connection, reopening it once if the server dropped it"""
+        text = msg.as_string()
+        for attempt in range(2):
+            try:
+                if handle.conn is None:
+                    handle.replace(self._open())
+                handle.conn.sendmail(from_addr, to_addr, text)
+                self._count("sent")
+                return True
+            except CONNECTION_ERRORS as e:
+                error = e
+            except smtplib.SMTPException as e:
+                # Server rejected this message; the session itself is still usable
+                logger.error(f"Failed to send email to {to_addr}: {e}")
+                break
+            except OSError as e:
+                # Socket errors and timeouts
+                error = e
+
+            handle.discard()
+            if attempt == 0:
+                logger.warning(f"SMTP connection lost ({error}), reconnecting")
+                self._count("reconnects")
+                continue
+            logger.error(f"Failed to send email to {to_addr}: {error}")
+
+        self._count("failed")
+        return False
+
+    def _checkout(self) -> smtplib.SMTP:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                conn, last_used_at = self._idle.pop()
+
+            if time.monotonic() - last_used_at > self.max_idle_seconds and not self._is_alive(conn):
+                self._close(conn)
+                continue
+
+            self._count("connections_reused")
+            return conn
+
+        return self._open()
+
+    def _open(self) -> smtplib.SMTP:
+        conn = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            conn.starttls()
+        if self.username:
+            conn.login(self.username, self.password)
+        self._count("connections_opened")
+        return conn
+
+    @staticmethod
+    def _is_alive(conn: smtplib.SMTP) -> bool:
+        try:
+            return conn.noop()[0] == 250
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close(conn: Optional[smtplib.SMTP]) -> None:
+        if conn is None:
+            return
+        try:
+            conn.quit()
+        except Exception:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._metrics[key] += 1
+
+
+class _ConnectionHandle:
+    """Borrowed connection that can be swapped for a fresh one after a disconnect"""
+
+    def __init__(self, pool: SMTPConnectionPool, holder: Dict):
+        self._pool = pool
+        self._holder = holder
+
+    @property
+    def conn(self) -> smtplib.SMTP:
+        return self._holder["conn"]
+
+    def discard(self) -> None:
+        self._pool._close(self._holder["conn"])
+        self._holder["conn"] = None
+
+    def replace(self, conn: smtplib.SMTP) -> None:
+        self._holder["conn"] = conn
+
+
+# Global instance (connections are opened lazily, so it is safe to create before forking workers)
+smtp_pool = SMTPConnectionPool.from_settings()
@@ -23,6 +23,7 @@ from app.database import SessionLocal
 from app.models.user import User
 from app.models.note import Note, CalendarType
 from app.services.lunar_calendar import LunarCalendarService
+from app.services.note_occurrence_service import NoteOccurrenceService
 from app.services.notification_service import NotificationService
 from app.config import settings
 
@@ -416,6 +417,7 @@ Cần hỗ trợ? Liên hệ: support@minhhungtsbd.me
             db.add(note)
             db.commit()
             db.refresh(note)
+            NoteOccurrenceService.sync_notes(db, [note])
             
             # Tạo notification schedule nếu cần
             if note.enable_notification:
@@ -556,19 +558,10 @@ Cần hỗ trợ? Liên hệ: support@minhhungtsbd.me
             today = date.today()
             next_week = today + timedelta(days=7)
             
-            notes = (
-                db.query(Note)
-                .filter(
-                    Note.user_id == user.id,
-                    Note.is_active == True,
-                    Note.solar_date >= today,
-                    Note.solar_date <= next_week,
-                )
-                .order_by(Note.solar_date)
-                .all()
-            )
+            # Bao gồm cả các lần lặp của ghi chú hàng tháng/hàng năm
+            occurrences = NoteOccurrenceService.get_occurrences(db, user.id, today, next_week)
             
-            if not notes:
+            if not occurrences:
                 await message.reply_text(
                     "⌚ <b>Không có ghi chú sắp tới</b>\n\n"
                     "Bạn không có ghi chú nào trong 7 ngày tới.",
@@ -580,8 +573,8 @@ Cần hỗ trợ? Liên hệ: support@minhhungtsbd.me
             message_text = f"⌚ <b>Ghi chú sắp tới</b> (7 ngày tới)\n\n"
             
             keyboard = []
-            for note in notes:
-                days_left = (note.solar_date - today).days
+            for occurrence_date, note in occurrences:
+                days_left = (occurrence_date - today).days
                 
                 if days_left == 0:
                     time_text = "Hôm nay"
@@ -746,6 +739,7 @@ Cần hỗ trợ? Liên hệ: support@minhhungtsbd.me
             # Soft delete
             note.is_active = False
             db.commit()
+            NoteOccurrenceService.sync_notes(db, [note])
             
             # Delete notification schedule
             from app.models.notification_schedule import NotificationSchedule
@@ -1,46 +1,144 @@
 import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Awaitable, Callable, List, Optional, Tuple
 from telegram import Bot
-from telegram.error import TelegramError
+from telegram.error import RetryAfter, TelegramError
+from telegram.request import HTTPXRequest
 from app.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+SEND_TIMEOUT_SECONDS = 30
 
-class TelegramService:
-    """Service for sending Telegram notifications"""
+
+class TelegramSendResult:
+    """Outcome of one message sent through send_many"""
     
-    def __init__(self):
-        self.bot_token = settings.telegram_bot_token
-        self.chat_id = settings.telegram_chat_id
-        self.api_url = settings.telegram_api_url
-        self.bot = None
+    def __init__(self, chat_id: str):
+        self.chat_id = chat_id
+        self.success = False
+        self.error: Optional[str] = None
+        self.attempts = 0
+        self.retry_after_seconds = 0.0
+    
+    def __repr__(self):
+        return f"<TelegramSendResult(chat_id={self.chat_id}, success={self.success}, attempts={self.attempts})>"
 
-        if self.bot_token:
-            # Use custom API URL instead of default api.telegram.org
-            self.bot = Bot(token=self.bot_token, base_url=f"{self.api_url}/bot")
+
+class AsyncRateLimiter:
+    """Token bucket for coroutines on one event loop"""
     
-    async def send_message(self, message: str, chat_id: str = None) -> bool:
-        """Send a message via Telegram bot"""
-        if not self.bot:
-            logger.error("Telegram bot token not configured")
-            return False
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+    
+    async def acquire(self) -> None:
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class TelegramSender:
+    """
+    Long-lived Telegram client: one event loop in a background thread and one keep-alive HTTP pool
+    
+    Any thread (or event loop) can submit work; the loop is started lazily and restarted
+    after a fork, so the global instance is safe to create at import time.
+    """
+    
+    def __init__(
+        self,
+        bot_token: str = None,
+        api_url: str = None,
+        pool_size: int = None,
+        rate: float = None,
+        chat_rate: float = None,
+        max_retries: int = None
+    ):
+        self.bot_token = settings.telegram_bot_token if bot_token is None else bot_token
+        self.api_url = settings.telegram_api_url if api_url is None else api_url
+        self.pool_size = pool_size or settings.telegram_pool_size
+        self.rate = rate or settings.telegram_rate_limit
+        self.chat_rate = chat_rate or settings.telegram_chat_rate_limit
+        self.max_retries = settings.telegram_max_retries if max_retries is None else max_retries
         
-        # Use provided chat_id or default one
-        target_chat_id = chat_id or self.chat_id
-        if not target_chat_id:
-            logger.error("No chat ID provided or configured")
+        self._bot = None
+        self._rate_limiter = None
+        self._loop = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+    
+    def is_configured(self) -> bool:
+        return bool(self.bot_token)
+    
+    def call(self, func: Callable[[Bot], Awaitable]) -> Future:
+        """Run func(bot) on the sender loop; returns a concurrent.futures.Future with its result"""
+        loop = self._ensure_started()
+        
+        async def run():
+            return await func(self._bot)
+        
+        return asyncio.run_coroutine_threadsafe(run(), loop)
+    
+    def submit(self, message: str, chat_id: str, parse_mode: str = 'HTML') -> Future:
+        """Queue one message; the future resolves to True if Telegram accepted it"""
+        return asyncio.run_coroutine_threadsafe(
+            self._send(message, chat_id, parse_mode), self._ensure_started()
+        )
+    
+    def send(self, message: str, chat_id: str, timeout: float = SEND_TIMEOUT_SECONDS) -> bool:
+        """Send one message and wait for the result"""
+        try:
+            return self.submit(message, chat_id).result(timeout=timeout)
+        except Exception as e:
+            logger.error(f"Unexpected error sending Telegram message: {e}")
             return False
+    
+    def submit_many(self, messages: List[Tuple[str, str]], parse_mode: str = 'HTML') -> Future:
+        """Queue (chat_id, message) pairs; the future resolves to one TelegramSendResult per pair, in order"""
+        return asyncio.run_coroutine_threadsafe(
+            self._send_many(messages, parse_mode), self._ensure_started()
+        )
+    
+    def send_many(self, messages: List[Tuple[str, str]], timeout: float = None) -> List[TelegramSendResult]:
+        """Send a batch of (chat_id, message) pairs and wait for every outcome"""
+        return self.submit_many(messages).result(timeout=timeout)
+    
+    def shutdown(self, timeout: float = 5) -> None:
+        """Close the HTTP pool and stop the loop thread"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None or self._pid != os.getpid():
+                return
+            self._loop = self._thread = None
         
         try:
-            await self.bot.send_message(
-                chat_id=target_chat_id,
-                text=message,
-                parse_mode='HTML'
-            )
-            # Removed verbose log - handled by notification_service
+            asyncio.run_coroutine_threadsafe(self._bot.shutdown(), loop).result(timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Error closing Telegram client: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=timeout)
+    
+    async def _send(self, message: str, chat_id: str, parse_mode: str) -> bool:
+        try:
+            await self._rate_limiter.acquire()
+            await self._bot.send_message(chat_id=chat_id, text=message, parse_mode=parse_mode)
             return True
-            
         except TelegramError as e:
             logger.error(f"Failed to send Telegram message: {e}")
             return False
@@ -48,39 +146,139 @@ class TelegramService:
             logger.error(f"Unexpected error sending Telegram message: {e}")
             return False
     
-    def send_message_sync(self, message: str, chat_id: str = None) -> bool:
-        """Synchronous wrapper for sending Telegram messages"""
-        try:
-            # Try to run in a new event loop to avoid "event loop already running" error
-            return asyncio.run(self.send_message(message, chat_id))
-        except RuntimeError as e:
-            if "cannot be called from a running event loop" in str(e):
-                # If we're in an async context, create a new thread
-                import concurrent.futures
-                import threading
+    async def _send_many(self, messages: List[Tuple[str, str]], parse_mode: str) -> List[TelegramSendResult]:
+        """
+        Drain one queue per chat concurrently
+        
+        Each chat gets at most chat_rate messages/second and keeps its order; a RetryAfter
+        pauses only that chat's queue. All chats share the global rate limiter and at most
+        pool_size requests are in flight at once.
+        """
+        results = [TelegramSendResult(str(chat_id)) for chat_id, _ in messages]
+        queues = {}
+        for index, (chat_id, _) in enumerate(messages):
+            queues.setdefault(str(chat_id), deque()).append(index)
+        
+        in_flight = asyncio.Semaphore(self.pool_size)
+        loop = asyncio.get_running_loop()
+        
+        async def drain(chat_id: str, queue: deque):
+            next_send_at = 0.0
+            while queue:
+                index = queue[0]
+                result = results[index]
                 
-                def run_in_thread():
-                    new_loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(new_loop)
-                    try:
-                        return new_loop.run_until_complete(self.send_message(message, chat_id))
-                    finally:
-                        new_loop.close()
+                delay = next_send_at - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await self._rate_limiter.acquire()
                 
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(run_in_thread)
-                    return future.result(timeout=30)  # 30 second timeout
-            else:
-                logger.error(f"Error in send_message_sync: {e}")
-                return False
-        except Exception as e:
-            logger.error(f"Unexpected error in send_message_sync: {e}")
+                result.attempts += 1
+                try:
+                    async with in_flight:
+                        await self._bot.send_message(chat_id=chat_id, text=messages[index][1], parse_mode=parse_mode)
+                    result.success = True
+                except RetryAfter as e:
+                    if result.attempts <= self.max_retries:
+                        logger.warning(f"⏳ Telegram chat {chat_id}: flood control, retrying in {e.retry_after}s")
+                        result.retry_after_seconds += e.retry_after
+                        next_send_at = loop.time() + e.retry_after
+                        continue
+                    result.error = str(e)
+                except Exception as e:
+                    result.error = str(e)
+                
+                if result.error:
+                    logger.error(f"Failed to send Telegram message to {chat_id}: {result.error}")
+                queue.popleft()
+                next_send_at = loop.time() + 1 / self.chat_rate
+        
+        await asyncio.gather(*(drain(chat_id, queue) for chat_id, queue in queues.items()))
+        return results
+    
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            # A forked child (e.g. a Celery worker) inherits the attributes but not the thread
+            if self._loop is None or self._pid != os.getpid():
+                self._start()
+            return self._loop
+    
+    def _start(self) -> None:
+        loop = asyncio.new_event_loop()
+        self._bot = Bot(
+            token=self.bot_token,
+            # Use custom API URL instead of default api.telegram.org
+            base_url=f"{self.api_url}/bot",
+            request=HTTPXRequest(connection_pool_size=self.pool_size, pool_timeout=SEND_TIMEOUT_SECONDS)
+        )
+        self._rate_limiter = AsyncRateLimiter(self.rate)
+        
+        def run():
+            asyncio.set_event_loop(loop)
+            loop.run_forever()
+        
+        self._thread = threading.Thread(target=run, name="telegram-sender", daemon=True)
+        self._thread.start()
+        self._loop = loop
+        self._pid = os.getpid()
+
+
+class TelegramService:
+    """Service for sending Telegram notifications"""
+    
+    def __init__(self, sender: TelegramSender = None):
+        self.bot_token = settings.telegram_bot_token
+        self.chat_id = settings.telegram_chat_id
+        self.sender = sender or telegram_sender
+    
+    def _target_chat_id(self, chat_id: str = None):
+        if not self.sender.is_configured():
+            logger.error("Telegram bot token not configured")
+            return None
+        
+        # Use provided chat_id or default one
+        target_chat_id = chat_id or self.chat_id
+        if not target_chat_id:
+            logger.error("No chat ID provided or configured")
+        return target_chat_id
+    
+    async def send_message(self, message: str, chat_id: str = None) -> bool:
+        """Send a message via Telegram bot"""
+        target_chat_id = self._target_chat_id(chat_id)
+        if not target_chat_id:
             return False
+        
+        return await asyncio.wrap_future(self.sender.submit(message, target_chat_id))
     
-    async def send_note_reminder(self, note_title: str, note_content: str, 
-                                solar_date: str, lunar_date: str, days_before: int) -> bool:
-        """Send a formatted note reminder"""
-        message = f"""
+    def send_message_sync(self, message: str, chat_id: str = None) -> bool:
+        """Send a message from synchronous code (safe from any thread, including inside a running loop)"""
+        target_chat_id = self._target_chat_id(chat_id)
+        if not target_chat_id:
+            return False
+        
+        return self.sender.send(message, target_chat_id)
+    
+    def submit_many(self, messages: List[Tuple[str, str]]) -> Future:
+        """Queue a batch of (chat_id, message) pairs; resolves to per-message TelegramSendResult"""
+        if not self.sender.is_configured():
+            logger.error("Telegram bot token not configured")
+            future = Future()
+            results = [TelegramSendResult(str(chat_id)) for chat_id, _ in messages]
+            for result in results:
+                result.error = "Telegram bot token not configured"
+            future.set_result(results)
+            return future
+        
+        return self.sender.submit_many(messages)
+    
+    def send_many(self, messages: List[Tuple[str, str]], timeout: float = None) -> List[TelegramSendResult]:
+        """Send a batch of (chat_id, message) pairs, respecting global and per-chat rate limits"""
+        return self.submit_many(messages).result(timeout=timeout)
+    
+    @staticmethod
+    def format_note_reminder(note_title: str, note_content: str, 
+                             solar_date: str, lunar_date: str, days_before: int) -> str:
+        return f"""
 🗓️ <b>Nhắc nhở ghi chú</b>
 
 📝 <b>Tiêu đề:</b> {note_title}
@@ -91,50 +289,34 @@ class TelegramService:
 
 ⏰ <b>Còn {days_before} ngày nữa</b>
         """.strip()
-        
-        return await self.send_message(message)
+    
+    async def send_note_reminder(self, note_title: str, note_content: str, 
+                                solar_date: str, lunar_date: str, days_before: int) -> bool:
+        """Send a formatted note reminder"""
+        return await self.send_message(
+            self.format_note_reminder(note_title, note_content, solar_date, lunar_date, days_before)
+        )
     
     def send_note_reminder_sync(self, note_title: str, note_content: str, 
                                solar_date: str, lunar_date: str, days_before: int) -> bool:
         """Synchronous wrapper for sending note reminders"""
-        try:
-            return asyncio.run(
-                self.send_note_reminder(note_title, note_content, solar_date, lunar_date, days_before)
-            )
-        except RuntimeError as e:
-            if "cannot be called from a running event loop" in str(e):
-                # If we're in an async context, create a new thread
-                import concurrent.futures
-                
-                def run_in_thread():
-                    new_loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(new_loop)
-                    try:
-                        return new_loop.run_until_complete(
-                            self.send_note_reminder(note_title, note_content, solar_date, lunar_date, days_before)
-                        )
-                    finally:
-                        new_loop.close()
-                
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(run_in_thread)
-                    return future.result(timeout=30)
-            else:
-                logger.error(f"Error in send_note_reminder_sync: {e}")
-                return False
-        except Exception as e:
-            logger.error(f"Unexpected error in send_note_reminder_sync: {e}")
-            return False
+        return self.send_message_sync(
+            self.format_note_reminder(note_title, note_content, solar_date, lunar_date, days_before)
+        )
     
     async def test_connection(self) -> bool:
         """Test Telegram bot connection"""
-        if not self.bot:
+        if not self.sender.is_configured():
             return False
         
         try:
-            bot_info = await self.bot.get_me()
+            bot_info = await asyncio.wrap_future(self.sender.call(lambda bot: bot.get_me()))
             logger.info(f"Telegram bot connected: {bot_info.username}")
             return True
         except Exception as e:
             logger.error(f"Telegram bot connection test failed: {e}")
             return False
+
+
+# Global instance (the loop thread starts on first use)
+telegram_sender = TelegramSender()
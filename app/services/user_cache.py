@@ -0,0 +1,137 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Dict, Optional
+from sqlalchemy import Date, DateTime
+from app.config import settings
+from app.models.user import User
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryUserCacheBackend:
+    """In-process LRU backend with per-entry expiry"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+
+            value, expires_at = item
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Dict, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class RedisUserCacheBackend:
+    """Redis backend shared by all uvicorn workers"""
+
+    def __init__(self, redis_url: str, prefix: str = "user:"):
+        import redis
+
+        self.client = redis.Redis.from_url(redis_url, socket_timeout=2, socket_connect_timeout=2)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Dict]:
+        try:
+            raw = self.client.get(self.prefix + key)
+        except Exception as e:
+            logger.warning(f"Redis user cache read failed: {e}")
+            return None
+        return json.loads(raw) if raw else None
+
+    def set(self, key: str, value: Dict, ttl: int) -> None:
+        try:
+            self.client.set(self.prefix + key, json.dumps(value, ensure_ascii=False), ex=ttl)
+        except Exception as e:
+            logger.warning(f"Redis user cache write failed: {e}")
+
+    def delete(self, key: str) -> None:
+        try:
+            self.client.delete(self.prefix + key)
+        except Exception as e:
+            logger.warning(f"Redis user cache delete failed: {e}")
+
+
+class UserCache:
+    """
+    Short-lived snapshots of user rows, keyed by user id
+
+    A snapshot holds every column as JSON-friendly values so it can live in Redis;
+    code that writes to a user row must call invalidate() after committing.
+    """
+
+    def __init__(self, backend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+
+    def get(self, user_id: int) -> Optional[Dict]:
+        """Get the column values of a user, or None if not cached"""
+        snapshot = self.backend.get(str(user_id))
+        return self._decode(snapshot) if snapshot is not None else None
+
+    def set(self, user: User) -> None:
+        self.backend.set(str(user.id), self._encode(user), self.ttl)
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop the snapshot of a user"""
+        self.backend.delete(str(user_id))
+
+    @staticmethod
+    def _encode(user: User) -> Dict:
+        snapshot = {}
+        for column in User.__table__.columns:
+            value = getattr(user, column.key)
+            snapshot[column.key] = value.isoformat() if isinstance(value, (date, datetime)) else value
+        return snapshot
+
+    @staticmethod
+    def _decode(snapshot: Dict) -> Dict:
+        values = {}
+        for column in User.__table__.columns:
+            value = snapshot.get(column.key)
+            if value is not None and isinstance(column.type, DateTime):
+                value = datetime.fromisoformat(value)
+            elif value is not None and isinstance(column.type, Date):
+                value = date.fromisoformat(value)
+            values[column.key] = value
+        return values
+
+
+def create_user_cache() -> UserCache:
+    """
+    Create the user cache from settings
+
+    Uses Redis alone when configured: an in-process tier in front of it could not be
+    invalidated by writes handled in other workers.
+    """
+    if settings.redis_url:
+        try:
+            return UserCache(RedisUserCacheBackend(settings.redis_url), ttl=settings.user_cache_ttl)
+        except Exception as e:
+            logger.warning(f"Redis user cache disabled: {e}")
+
+    return UserCache(MemoryUserCacheBackend(settings.user_cache_max_entries), ttl=settings.user_cache_ttl)
@@ -1,3 +1,15 @@
-from .notification_tasks import send_notifications_task
+from .notification_tasks import (
+    send_notifications_task,
+    send_schedule_batch_task,
+    send_schedule_notification,
+    prefetch_holidays_task,
+    refresh_note_occurrences_task,
+)
 
-__all__ = ["send_notifications_task"]
+__all__ = [
+    "send_notifications_task",
+    "send_schedule_batch_task",
+    "send_schedule_notification",
+    "prefetch_holidays_task",
+    "refresh_note_occurrences_task",
+]
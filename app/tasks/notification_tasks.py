@@ -1,8 +1,12 @@
-from celery import Celery
+from celery import Celery, group
+from datetime import date
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
 from app.database import engine
 from app.services.notification_service import NotificationService
+from app.services.google_calendar_service import google_calendar_service
+from app.services.holiday_service import HolidayService
+from app.services.note_occurrence_service import NoteOccurrenceService
 import logging
 
 # Configure logging
@@ -43,6 +47,14 @@ celery_app.conf.update(
             'task': 'app.tasks.notification_tasks.cleanup_old_schedules_task',
             'schedule': 24 * 60 * 60.0,  # Run daily
         },
+        'prefetch-holidays': {
+            'task': 'app.tasks.notification_tasks.prefetch_holidays_task',
+            'schedule': 6 * 60 * 60.0,  # Run every 6 hours
+        },
+        'refresh-note-occurrences': {
+            'task': 'app.tasks.notification_tasks.refresh_note_occurrences_task',
+            'schedule': 6 * 60 * 60.0,  # Run every 6 hours (only differences are written)
+        },
     },
 )
 
@@ -52,15 +64,48 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 @celery_app.task(bind=True)
 def send_notifications_task(self):
-    """Celery task to process notification schedules"""
+    """Celery task to select due notification schedules and fan them out to worker subtasks"""
     db = None
     try:
         # Create database session with proper error handling
         db = SessionLocal()
         notification_service = NotificationService()
         
-        # Process ready schedules (new system)
-        result = notification_service.process_all_ready_schedules(db)
+        # Only pick the due schedules here; sending happens in send_schedule_batch_task
+        ready_keys = notification_service.get_ready_schedule_keys(db)
+        if not ready_keys:
+            return {"enqueued": 0, "batches": 0}
+        
+        batch_size = settings.notification_batch_size
+        batches = [ready_keys[i:i + batch_size] for i in range(0, len(ready_keys), batch_size)]
+        group(send_schedule_batch_task.s(batch) for batch in batches).apply_async()
+        
+        logger.info(f"📤 Enqueued {len(ready_keys)} schedules in {len(batches)} batches")
+        return {"enqueued": len(ready_keys), "batches": len(batches)}
+        
+    except Exception as e:
+        logger.error(f"❌ Error in send_notifications_task: {e}")
+        return {"status": "error", "message": str(e)}
+    finally:
+        # Always close database session
+        if db:
+            try:
+                db.close()
+            except Exception as e:
+                logger.error(f"❌ Error closing database session: {e}")
+
+
+@celery_app.task(bind=True)
+def send_schedule_batch_task(self, items):
+    """Celery subtask sending the notifications of a batch of [schedule_id, cycle_key] pairs"""
+    db = None
+    try:
+        db = SessionLocal()
+        notification_service = NotificationService()
+        
+        result = notification_service.process_schedule_batch(
+            db, [(schedule_id, cycle_key) for schedule_id, cycle_key in items]
+        )
         
         # Log concise result
         if result["processed"] > 0 or result["failed"] > 0:
@@ -69,10 +114,9 @@ def send_notifications_task(self):
         return result
         
     except Exception as e:
-        logger.error(f"❌ Error in send_notifications_task: {e}")
+        logger.error(f"❌ Error in send_schedule_batch_task: {e}")
         return {"status": "error", "message": str(e)}
     finally:
-        # Always close database session
         if db:
             try:
                 db.close()
@@ -80,6 +124,12 @@ def send_notifications_task(self):
                 logger.error(f"❌ Error closing database session: {e}")
 
 
+@celery_app.task(bind=True)
+def send_schedule_notification(self, schedule_id, cycle_key):
+    """Celery subtask sending one schedule's pending notification (idempotent per cycle_key)"""
+    return send_schedule_batch_task.run([[schedule_id, cycle_key]])
+
+
 @celery_app.task(bind=True)
 def cleanup_old_schedules_task(self):
     """Celery task to cleanup old completed notification schedules"""
@@ -115,5 +165,69 @@ def cleanup_old_schedules_task(self):
                 logger.error(f"Error closing database session: {e}")
 
 
+@celery_app.task(bind=True)
+def prefetch_holidays_task(self):
+    """Celery task to sync Google Calendar holidays (previous, current, next year) into the holidays table"""
+    if not google_calendar_service.is_configured():
+        return {"status": "skipped", "message": "Google Calendar not configured"}
+    
+    db = None
+    synced = {}
+    failed = []
+    try:
+        db = SessionLocal()
+        current_year = date.today().year
+        
+        for year in (current_year - 1, current_year, current_year + 1):
+            try:
+                holidays = google_calendar_service.fetch_holidays_for_year(year)
+                synced[year] = HolidayService.replace_year(db, year, holidays)
+            except Exception as e:
+                # Keep the rows we already have for this year
+                logger.error(f"❌ Holiday prefetch failed for {year}: {e}")
+                failed.append(year)
+        
+        return {
+            "status": "success" if not failed else "partial",
+            "synced": synced,
+            "failed": failed
+        }
+        
+    except Exception as e:
+        logger.error(f"❌ Error in prefetch_holidays_task: {e}")
+        return {"status": "error", "message": str(e)}
+    finally:
+        if db:
+            try:
+                db.close()
+            except Exception as e:
+                logger.error(f"❌ Error closing database session: {e}")
+
+
+@celery_app.task(bind=True)
+def refresh_note_occurrences_task(self):
+    """Celery task to roll the note_occurrences horizon forward and repair any drift from the notes"""
+    db = None
+    try:
+        db = SessionLocal()
+        counts = NoteOccurrenceService.refresh(db)
+        
+        if any(counts.values()):
+            logger.info(
+                f"🗓️ Note occurrences: +{counts['inserted']} -{counts['deleted']} (purged {counts['purged']})"
+            )
+        return {"status": "success", **counts}
+        
+    except Exception as e:
+        logger.error(f"❌ Error in refresh_note_occurrences_task: {e}")
+        return {"status": "error", "message": str(e)}
+    finally:
+        if db:
+            try:
+                db.close()
+            except Exception as e:
+                logger.error(f"❌ Error closing database session: {e}")
+
+
 if __name__ == '__main__':
     celery_app.start()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-message cost of rendering the notification email
+
+Compares building a fresh Jinja environment for every email (old behaviour)
+with the shared precompiled environment in email_template_service.
+
+Chạy: python benchmark_email_templates.py [so_message]
+"""
+
+import sys
+import time
+from datetime import date
+from jinja2 import Environment, FileSystemLoader
+from app.services.email_template_service import (
+    EMAIL_TEMPLATE_DIR,
+    SIMPLE_NOTIFICATION_TEMPLATE,
+    email_template_service
+)
+from app.services.feng_shui_service import FengShuiService
+
+
+def build_context(i: int) -> dict:
+    event_date = date(2025, 1, 1 + i % 28)
+    return {
+        "note_title": f"Sự kiện {i}",
+        "note_content": "Nội dung ghi chú",
+        "solar_date": event_date.strftime('%d/%m/%Y'),
+        "lunar_date": "01/01/2025",
+        "days_before": i % 3,
+        "progress": "1/3",
+        "feng_shui_data": FengShuiService.get_daily_feng_shui_analysis(event_date),
+        "user_birth_date": None
+    }
+
+
+def render_uncached(context: dict) -> str:
+    env = Environment(loader=FileSystemLoader(EMAIL_TEMPLATE_DIR))
+    return env.get_template(SIMPLE_NOTIFICATION_TEMPLATE).render(**context)
+
+
+def timed(label: str, func, count: int) -> float:
+    started_at = time.perf_counter()
+    func()
+    per_message_ms = (time.perf_counter() - started_at) * 1000 / count
+    print(f"{label:<28} {per_message_ms:8.3f} ms/message")
+    return per_message_ms
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    contexts = [build_context(i) for i in range(count)]
+
+    # Same output both ways
+    assert render_uncached(contexts[0]) == email_template_service.render(SIMPLE_NOTIFICATION_TEMPLATE, **contexts[0])
+
+    print(f"Rendering {count} messages")
+    before = timed("fresh Environment per email", lambda: [render_uncached(c) for c in contexts], count)
+    single = timed("cached render()", lambda: [
+        email_template_service.render(SIMPLE_NOTIFICATION_TEMPLATE, **c) for c in contexts
+    ], count)
+    timed("cached render_many()", lambda: email_template_service.render_many(SIMPLE_NOTIFICATION_TEMPLATE, contexts), count)
+    print(f"Speedup: {before / single:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.config import settings
+from app.database import Base, get_db
+from app import main
+from app.main import app
+from app.models import Holiday, User
+from app.routes import calendar as calendar_routes
+from app.services.page_cache import MemoryPageCacheBackend, PageCache
+from app.services.session_service import session_service
+
+RANGE_URL = "/api/calendar/range?start=2025-01-20&end=2025-02-05"
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(User(id=1, google_id="g1", email="user@example.com", name="User", birth_date=date(1990, 5, 17)))
+    session.add(Holiday(holiday_date=date(2025, 1, 29), year=2025, name="Tết Nguyên Đán", source="google_calendar"))
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def client(db):
+    app.dependency_overrides[get_db] = lambda: db
+    session_service.invalidate_user(1)
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_db, None)
+    session_service.invalidate_user(1)
+
+
+@pytest.fixture
+def build_calls(monkeypatch):
+    calls = []
+    build_range_columns = calendar_routes._build_range_columns
+
+    def counting_build(*args):
+        calls.append(args[1:3])
+        return build_range_columns(*args)
+
+    monkeypatch.setattr(calendar_routes, "_build_range_columns", counting_build)
+    return calls
+
+
+@pytest.fixture
+def page_cache(monkeypatch):
+    cache = PageCache([MemoryPageCacheBackend()], ttl=60)
+    monkeypatch.setattr(calendar_routes, "guest_page_cache", cache)
+    monkeypatch.setattr(main, "guest_page_cache", cache)
+    return cache
+
+
+def _login(client):
+    client.cookies.set("session_token", session_service.create_session_token(1))
+
+
+def test_range_returns_columns_with_etag(client):
+    response = client.get(RANGE_URL)
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"].startswith("public")
+    data = response.json()
+    assert data["type"] == "general"
+    assert data["days"] == len(data["date"]) == len(data["can_chi"]) == 17
+    assert {"name": "Tết Nguyên Đán", "type": "national"} in data["holidays"][data["date"].index("2025-01-29")]
+    assert "score" not in data
+
+    etag = response.headers["etag"]
+    assert etag.startswith('"') and etag.endswith('"')
+    assert client.get(RANGE_URL).headers["etag"] == etag
+    assert client.get("/api/calendar/range?start=2025-01-20&end=2025-02-06").headers["etag"] != etag
+
+
+def test_matching_if_none_match_skips_building_the_payload(client, build_calls):
+    etag = client.get(RANGE_URL).headers["etag"]
+    assert len(build_calls) == 1
+
+    for if_none_match in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        response = client.get(RANGE_URL, headers={"If-None-Match": if_none_match})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+    assert len(build_calls) == 1
+
+    assert client.get(RANGE_URL, headers={"If-None-Match": '"other"'}).status_code == 200
+    assert len(build_calls) == 2
+
+
+def test_etag_changes_with_holidays_and_code_version(client, db, monkeypatch):
+    etag = client.get(RANGE_URL).headers["etag"]
+
+    db.add(Holiday(holiday_date=date(2025, 2, 1), year=2025, name="Ngày nghỉ bù", source="google_calendar"))
+    db.commit()
+    holiday_etag = client.get(RANGE_URL).headers["etag"]
+    assert holiday_etag != etag
+    assert client.get(RANGE_URL, headers={"If-None-Match": etag}).status_code == 200
+
+    monkeypatch.setattr(calendar_routes, "RANGE_API_VERSION", "test")
+    assert client.get(RANGE_URL).headers["etag"] != holiday_etag
+
+
+def test_personal_range_has_its_own_etag(client, db):
+    guest_etag = client.get(RANGE_URL).headers["etag"]
+    _login(client)
+
+    response = client.get(RANGE_URL)
+
+    assert response.status_code == 200
+    assert response.json()["type"] == "personal"
+    assert len(response.json()["score"]) == 17
+    assert response.headers["cache-control"].startswith("private")
+    assert response.headers["etag"] != guest_etag
+    assert client.get(RANGE_URL, headers={"If-None-Match": guest_etag}).status_code == 200
+
+    user = db.get(User, 1)
+    user.menh_calculation_method = "nap_am"
+    db.commit()
+    session_service.invalidate_user(1)
+    assert client.get(RANGE_URL).headers["etag"] != response.headers["etag"]
+
+
+@pytest.mark.parametrize("query", [
+    "start=2025-13-01&end=2025-12-31",
+    "start=20250101&end=2025-01-31",
+    "start=2025-02-01&end=2025-01-31",
+    "start=2025-01-01&end=2026-12-31",
+    "start=0001-01-01&end=0001-01-31",
+])
+def test_bad_range_is_rejected(client, query):
+    response = client.get(f"/api/calendar/range?{query}")
+
+    assert response.status_code == 400
+    assert "error" in response.json()
+    assert "etag" not in response.headers
+
+
+def test_guest_page_cache_ignores_host_and_extra_query(client, page_cache, monkeypatch):
+    monkeypatch.setattr(settings, "public_url", "https://lich.example.com")
+    today = date.today()
+
+    first = client.get(f"/?year={today.year}&month={today.month}")
+    assert first.status_code == 200
+    assert f'content="https://lich.example.com/?year={today.year}&amp;month={today.month}"' in first.text
+
+    for url in ("/", "/?utm_source=spam", f"/?month={today.month}&junk=1", "http://evil.test/?x=y"):
+        response = client.get(url)
+        assert response.text == first.text, url
+    assert "evil.test" not in first.text
+    assert page_cache.stats()["misses"] == 1
+    assert len(page_cache.backends[0]._entries) == 1
+
+    # Other months and focus dates are separate pages
+    focus_date = (today.replace(day=1) - timedelta(days=1)).strftime("%Y-%m-%d")
+    focused = client.get(f"/?focus_date={focus_date}")
+    assert f"focus_date={focus_date}" in focused.text
+    assert len(page_cache.backends[0]._entries) == 2
+
+
+def test_guest_page_cache_key_changes_with_holidays(client, db, page_cache):
+    client.get("/")
+    db.add(Holiday(holiday_date=date.today(), year=date.today().year, name="Ngày lễ mới", source="google_calendar"))
+    db.commit()
+
+    assert "Ngày lễ mới" in client.get("/").text
+    assert page_cache.stats()["misses"] == 2
+
+
+def test_logged_in_pages_bypass_the_guest_cache(client, page_cache):
+    _login(client)
+    client.get("/")
+    client.get("/")
+
+    assert page_cache.stats() == {"hits": 0, "misses": 0, "hit_rate": 0.0}
+
+
+def test_health_reports_page_cache_stats(client, page_cache):
+    client.get("/")
+    client.get("/?utm_source=spam")
+
+    assert client.get("/health").json()["page_cache"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
@@ -0,0 +1,76 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app.services.feng_shui_service import Element, FengShuiService
+
+DAYS = [date(2024, 1, 1) + timedelta(days=offset) for offset in range(60)]
+
+# Output of the original per-year Nạp Âm table, one entry per pair of years from 1924 to 2025;
+# years outside that range were folded into 1924-1983
+LEGACY_NAP_AM_1924 = (
+    "Kim hải trung", "Hỏa lư trung", "Thổ thành đầu", "Kim bạch lạp", "Thủy dương liễu",
+    "Hỏa sơn đầu", "Thổ ốc trung", "Kim sa trung", "Thổ lộ bàng", "Kim kim bạc",
+    "Thủy tuyền trung", "Hỏa sơn hạ", "Thổ tích lịch", "Mộc thành đầu", "Thủy trường lưu",
+    "Hỏa sa trung", "Hỏa sơn hạ", "Mộc bình địa", "Thổ tích lịch", "Kim kim bạc",
+    "Hỏa phúc đăng", "Thủy thiên hà", "Thổ đại trạch", "Kim thoa xuyến", "Mộc tang đố",
+    "Thủy đại khê", "Thổ sa trung", "Hỏa thiên thượng", "Mộc thạch lựu", "Thủy đại hải",
+    "Kim hải trung", "Hỏa lư trung", "Thổ thành đầu", "Kim bạch lạp", "Kim kiếm phong",
+    "Hỏa sơn đầu", "Thổ ốc trung", "Kim sa trung", "Thổ lộ bàng", "Kim kim bạc",
+    "Thủy tuyền trung", "Hỏa sơn hạ", "Thổ tích lịch", "Mộc thành đầu", "Thủy trường lưu",
+    "Hỏa sa trung", "Hỏa sơn hạ", "Mộc bình địa", "Thổ tích lịch", "Kim kim bạc",
+    "Hỏa phúc đăng",
+)
+ELEMENT_BY_PREFIX = {
+    "Kim": Element.METAL, "Mộc": Element.WOOD, "Thủy": Element.WATER, "Hỏa": Element.FIRE, "Thổ": Element.EARTH
+}
+
+
+def _legacy_nap_am(year: int):
+    if not 1924 <= year <= 2025:
+        year = (year - 1924) % 60 + 1924
+    description = LEGACY_NAP_AM_1924[(year - 1924) // 2]
+    return ELEMENT_BY_PREFIX[description.split()[0]], description
+
+
+def test_birth_year_element_matches_legacy_table():
+    for year in range(1, 10000):
+        assert FengShuiService.get_birth_year_element(date(year, 6, 1)) == _legacy_nap_am(year), year
+
+
+@pytest.mark.parametrize("year,description", [
+    (1932, "Thủy dương liễu"), (1933, "Thủy dương liễu"), (1872, "Thủy dương liễu"), (2053, "Thủy dương liễu"),
+    (1992, "Kim kiếm phong"), (1993, "Kim kiếm phong"), (1984, "Kim hải trung"), (2024, "Hỏa phúc đăng"),
+])
+def test_birth_year_element_known_years(year, description):
+    assert FengShuiService.get_birth_year_element(date(year, 1, 1))[1] == description
+
+
+@pytest.mark.parametrize("element", list(Element))
+def test_activity_getters_return_fresh_lists(element):
+    for getter in (FengShuiService.get_lucky_activities, FengShuiService.get_unlucky_activities):
+        activities = getter(element)
+        assert isinstance(activities, list)
+        activities.append("x")
+        assert "x" not in getter(element)
+
+
+@pytest.mark.parametrize("element", list(Element))
+def test_element_relationships_are_lists(element):
+    relationships = FengShuiService.get_element_relationships(element)
+    assert all(isinstance(elements, list) for elements in relationships.values())
+
+
+def test_daily_analysis_returns_mutable_copies():
+    for day in DAYS:
+        analysis = FengShuiService.get_daily_feng_shui_analysis(day)
+        for key in ("lucky_activities", "unlucky_activities", "lucky_hours", "conflicting_zodiacs"):
+            assert isinstance(analysis[key], list), key
+
+        assert FengShuiService.get_lucky_hours(day) == analysis["lucky_hours"]
+        assert FengShuiService.get_conflicting_zodiacs(day) == analysis["conflicting_zodiacs"]
+
+        analysis["lucky_hours"][0]["name"] = "x"
+        analysis["conflicting_zodiacs"].clear()
+        assert FengShuiService.get_lucky_hours(day)[0]["name"] != "x"
+        assert FengShuiService.get_conflicting_zodiacs(day)
@@ -0,0 +1,163 @@
+import threading
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import holiday_cache
+from app.services.google_calendar_service import GoogleCalendarService
+from app.services.holiday_cache import HolidayCache, MemoryHolidayCacheBackend
+
+TTL = 60
+STALE_TTL = 600
+NEGATIVE_TTL = 10
+
+
+class FakeRequest:
+    def __init__(self, service, kwargs):
+        self.service = service
+        self.kwargs = kwargs
+
+    def execute(self):
+        self.service.calls.append(self.kwargs["timeMin"][:4])
+        if self.service.error is not None:
+            raise self.service.error
+        return {"items": self.service.items}
+
+
+class FakeService:
+    """Stands in for the Google Calendar API resource: service.events().list(...).execute()"""
+
+    def __init__(self, items):
+        self.items = items
+        self.error = None
+        self.calls = []
+
+    def events(self):
+        return self
+
+    def list(self, **kwargs):
+        return FakeRequest(self, kwargs)
+
+
+def _event(day: str, summary: str):
+    return {"summary": summary, "start": {"date": day}}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(holiday_cache, "time", SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def fake_service():
+    return FakeService([_event("2025-01-01", "Tết Dương lịch"), _event("2025-04-30", "Ngày Giải phóng")])
+
+
+@pytest.fixture
+def calendar(fake_service):
+    cache = HolidayCache([MemoryHolidayCacheBackend()], ttl=TTL, stale_ttl=STALE_TTL, negative_ttl=NEGATIVE_TTL)
+    return GoogleCalendarService(service=fake_service, cache=cache)
+
+
+def _wait_for_refresh():
+    for thread in threading.enumerate():
+        if thread.name.startswith("holiday-refresh-"):
+            thread.join(timeout=5)
+
+
+def test_year_is_fetched_once_within_ttl(clock, fake_service, calendar):
+    holidays = calendar.get_holidays_for_year(2025)
+
+    assert [(holiday["date"], holiday["name"]) for holiday in holidays] == [
+        (date(2025, 1, 1), "Tết Dương lịch"),
+        (date(2025, 4, 30), "Ngày Giải phóng"),
+    ]
+    clock[0] += TTL - 1
+    assert calendar.get_holidays_for_year(2025) == holidays
+    assert fake_service.calls == ["2025"]
+
+    calendar.get_holidays_for_year(2026)
+    assert fake_service.calls == ["2025", "2026"]
+
+
+def test_stale_entry_is_served_while_refreshing(clock, fake_service, calendar):
+    old = calendar.get_holidays_for_year(2025)
+    fake_service.items = [_event("2025-09-02", "Quốc khánh")]
+
+    clock[0] += TTL + 1
+    assert calendar.get_holidays_for_year(2025) == old
+    _wait_for_refresh()
+
+    assert fake_service.calls == ["2025", "2025"]
+    assert [holiday["name"] for holiday in calendar.get_holidays_for_year(2025)] == ["Quốc khánh"]
+    assert fake_service.calls == ["2025", "2025"]
+
+
+def test_expired_stale_entry_is_fetched_in_the_foreground(clock, fake_service, calendar):
+    calendar.get_holidays_for_year(2025)
+    fake_service.items = [_event("2025-09-02", "Quốc khánh")]
+
+    clock[0] += TTL + STALE_TTL + 1
+    assert [holiday["name"] for holiday in calendar.get_holidays_for_year(2025)] == ["Quốc khánh"]
+    assert fake_service.calls == ["2025", "2025"]
+
+
+def test_api_error_is_negatively_cached(clock, fake_service, calendar):
+    fake_service.error = RuntimeError("quota exceeded")
+
+    assert calendar.get_holidays_for_year(2025) == []
+    clock[0] += NEGATIVE_TTL - 1
+    assert calendar.get_holidays_for_year(2025) == []
+    assert fake_service.calls == ["2025"]
+
+    fake_service.error = None
+    clock[0] += 2
+    calendar.get_holidays_for_year(2025)
+    _wait_for_refresh()
+    assert [holiday["name"] for holiday in calendar.get_holidays_for_year(2025)] == [
+        "Tết Dương lịch", "Ngày Giải phóng"
+    ]
+    assert fake_service.calls == ["2025", "2025"]
+
+
+def test_api_error_keeps_serving_previous_holidays(clock, fake_service, calendar):
+    old = calendar.get_holidays_for_year(2025)
+    fake_service.error = RuntimeError("backend error")
+
+    clock[0] += TTL + 1
+    calendar.get_holidays_for_year(2025)
+    _wait_for_refresh()
+
+    assert calendar.get_holidays_for_year(2025) == old
+    clock[0] += NEGATIVE_TTL - 1
+    assert calendar.get_holidays_for_year(2025) == old
+    assert fake_service.calls == ["2025", "2025"]
+
+
+def test_unconfigured_service_skips_the_cache():
+    cache = HolidayCache([MemoryHolidayCacheBackend()], ttl=TTL, stale_ttl=STALE_TTL, negative_ttl=NEGATIVE_TTL)
+    calendar = GoogleCalendarService(service=None, cache=cache)
+
+    assert calendar.get_holidays_for_year(2025) == []
+
+
+def test_memory_backend_evicts_least_recently_used(clock):
+    backend = MemoryHolidayCacheBackend(max_entries=2)
+    backend.set("2024", {"year": 2024}, TTL)
+    backend.set("2025", {"year": 2025}, TTL)
+    backend.get("2024")
+    backend.set("2026", {"year": 2026}, TTL)
+
+    assert backend.get("2025") is None
+    assert backend.get("2024") == {"year": 2024}
+    clock[0] += TTL
+    assert backend.get("2026") is None
+
+
+def test_month_is_filtered_from_the_cached_year(clock, fake_service, calendar):
+    assert [holiday["name"] for holiday in calendar.get_holidays_for_month(2025, 4)] == ["Ngày Giải phóng"]
+    assert calendar.get_holidays_for_month(2025, 5) == []
+    assert fake_service.calls == ["2025"]
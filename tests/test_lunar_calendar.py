@@ -0,0 +1,121 @@
+from datetime import date, timedelta
+
+import pytest
+from lunardate import LunarDate
+
+from app.services.lunar_calendar import LunarCalendarService
+
+FIRST_DAY = date(1900, 1, 31)
+LAST_DAY = date(2100, 2, 8)
+
+
+def _solar_days():
+    day = FIRST_DAY
+    while day <= LAST_DAY:
+        yield day
+        day += timedelta(days=1)
+
+
+def test_solar_to_lunar_matches_lunardate_for_every_day():
+    for day in _solar_days():
+        expected = LunarDate.fromSolarDate(day.year, day.month, day.day)
+        actual = LunarCalendarService.solar_to_lunar(day)
+        assert (actual.year, actual.month, actual.day, actual.isLeapMonth) == (
+            expected.year, expected.month, expected.day, expected.isLeapMonth
+        ), day
+
+
+def test_lunar_to_solar_round_trips_every_day():
+    for day in _solar_days():
+        lunar = LunarDate.fromSolarDate(day.year, day.month, day.day)
+        assert LunarCalendarService.lunar_to_solar(
+            lunar.year, lunar.month, lunar.day, lunar.isLeapMonth
+        ) == day
+
+
+@pytest.mark.parametrize("solar_date", [date(1900, 1, 30), date(2100, 2, 9), date(1800, 6, 1)])
+def test_outside_table_defers_to_lunardate(solar_date):
+    try:
+        expected = LunarDate.fromSolarDate(solar_date.year, solar_date.month, solar_date.day)
+    except ValueError:
+        with pytest.raises(ValueError):
+            LunarCalendarService.solar_to_lunar(solar_date)
+        return
+
+    actual = LunarCalendarService.solar_to_lunar(solar_date)
+    assert (actual.year, actual.month, actual.day, actual.isLeapMonth) == (
+        expected.year, expected.month, expected.day, expected.isLeapMonth
+    )
+
+
+@pytest.mark.parametrize("args", [(2024, 13, 1, False), (2024, 1, 31, False), (2024, 2, 1, True), (2150, 1, 1, False)])
+def test_invalid_lunar_dates_raise_like_lunardate(args):
+    with pytest.raises(ValueError):
+        LunarDate(*args).toSolarDate()
+    with pytest.raises(ValueError):
+        LunarCalendarService.lunar_to_solar(*args)
+
+
+def _expected_holiday_names(day):
+    lunar = LunarDate.fromSolarDate(day.year, day.month, day.day)
+    if lunar.isLeapMonth:
+        return []
+    return [
+        holiday["name"] for holiday in LunarCalendarService.LUNAR_HOLIDAYS
+        if (holiday["lunar_month"], holiday["lunar_day"]) == (lunar.month, lunar.day)
+    ]
+
+
+def test_holidays_on_matches_lunar_dates():
+    # Starts in 1901 so the previous lunar year (year - 1 lookup) is always in range
+    day = date(1901, 1, 1)
+    while day <= date(2098, 12, 31):
+        assert [holiday["name"] for holiday in LunarCalendarService.holidays_on(day)] == (
+            _expected_holiday_names(day)
+        ), day
+        day += timedelta(days=1)
+
+
+@pytest.mark.parametrize("start_date,end_date,tet", [
+    (date(2022, 12, 20), date(2023, 2, 10), [date(2023, 1, 22)]),
+    (date(2024, 1, 25), date(2024, 2, 25), [date(2024, 2, 10)]),
+    (date(2025, 12, 1), date(2026, 3, 5), [date(2026, 2, 17)]),
+    (date(2019, 11, 1), date(2021, 3, 1), [date(2020, 1, 25), date(2021, 2, 12)]),
+    (date(2024, 5, 1), date(2024, 5, 1), []),
+])
+def test_holidays_in_range_matches_per_day_lookup(start_date, end_date, tet):
+    expected = []
+    day = start_date
+    while day <= end_date:
+        expected.extend(LunarCalendarService.holidays_on(day))
+        day += timedelta(days=1)
+
+    assert LunarCalendarService.holidays_in_range(start_date, end_date) == expected
+    assert [holiday["solar_date"] for holiday in expected if holiday["name"] == "Tết Nguyên Đán"] == tet
+
+
+@pytest.fixture
+def kitchen_god_holiday(monkeypatch):
+    """23/12 falls in January or February of the next solar year, which only the year - 1 scan finds"""
+    LunarCalendarService._get_holiday_index.cache_clear()
+    monkeypatch.setattr(LunarCalendarService, "LUNAR_HOLIDAYS", LunarCalendarService.LUNAR_HOLIDAYS + [
+        {"name": "Ông Công Ông Táo", "lunar_month": 12, "lunar_day": 23},
+    ])
+    yield
+    LunarCalendarService._get_holiday_index.cache_clear()
+
+
+def test_holiday_index_includes_previous_lunar_year(kitchen_god_holiday):
+    # 23/12 of lunar 2024 is 22/1/2025, a week before Tết 29/1/2025
+    holidays = LunarCalendarService.holidays_in_range(date(2025, 1, 15), date(2025, 2, 5))
+
+    assert [(holiday["name"], holiday["solar_date"]) for holiday in holidays] == [
+        ("Ông Công Ông Táo", date(2025, 1, 22)),
+        ("Tết Nguyên Đán", date(2025, 1, 29)),
+    ]
+    assert holidays[0]["lunar_date"] == "23/12/2024"
+    assert LunarCalendarService.holidays_on(date(2025, 1, 22)) == holidays[:1]
+    # 23/12 of lunar 2025 lands in the next solar year and is not indexed under 2025
+    assert all(holiday["name"] != "Ông Công Ông Táo" for holiday in LunarCalendarService.holidays_in_range(
+        date(2025, 12, 1), date(2025, 12, 31)
+    ))
@@ -0,0 +1,146 @@
+from calendar import monthrange
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import Note, NoteOccurrence, User
+from app.services.note_occurrence_service import NoteOccurrenceService
+
+TODAY = date.today()
+WINDOW_START, WINDOW_END = NoteOccurrenceService.get_window(TODAY)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(User(id=1, google_id="g1", email="user@example.com", name="User"))
+    session.add_all([
+        Note(user_id=1, title="once", solar_date=TODAY + timedelta(days=3)),
+        Note(user_id=1, title="monthly", solar_date=date(TODAY.year - 1, 1, 31), monthly_repeat=True),
+        Note(user_id=1, title="yearly", solar_date=date(TODAY.year - 1, 3, 15), yearly_repeat=True),
+    ])
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _pairs(occurrences):
+    return [(occurrence_date, note.id) for occurrence_date, note in occurrences]
+
+
+def test_reads_before_first_refresh_are_computed(db):
+    assert NoteOccurrenceService.get_materialized_through(db) is None
+    assert _pairs(NoteOccurrenceService.get_occurrences(db, 1, WINDOW_START, WINDOW_END)) == _pairs(
+        NoteOccurrenceService.compute_occurrences(db, WINDOW_START, WINDOW_END, 1)
+    )
+
+
+def test_refresh_materializes_the_horizon(db):
+    counts = NoteOccurrenceService.refresh(db, today=TODAY)
+
+    assert counts["inserted"] == db.query(NoteOccurrence).count() > 0
+    assert NoteOccurrenceService.get_materialized_through(db) == WINDOW_END
+    assert _pairs(NoteOccurrenceService.get_occurrences(db, 1, WINDOW_START, WINDOW_END)) == _pairs(
+        NoteOccurrenceService.compute_occurrences(db, WINDOW_START, WINDOW_END, 1)
+    )
+    assert NoteOccurrenceService.refresh(db, today=TODAY) == {"purged": 0, "deleted": 0, "inserted": 0}
+
+
+def test_month_not_yet_materialized_is_computed(db):
+    # Last refresh ran a month ago: the newest month of today's horizon has no rows yet
+    NoteOccurrenceService.refresh(db, today=WINDOW_START - timedelta(days=1))
+    last_month_start = WINDOW_END.replace(day=1)
+    assert db.query(NoteOccurrence).filter(NoteOccurrence.occurrence_date >= last_month_start).count() == 0
+
+    occurrences = NoteOccurrenceService.get_occurrences(db, 1, last_month_start, WINDOW_END)
+    assert [note.title for _, note in occurrences if note.title == "monthly"] == ["monthly"]
+
+
+def test_sync_notes_follows_note_changes(db):
+    NoteOccurrenceService.refresh(db, today=TODAY)
+    note = db.query(Note).filter(Note.title == "monthly").one()
+
+    note.is_active = False
+    db.commit()
+    NoteOccurrenceService.sync_notes(db, [note], today=TODAY)
+
+    assert db.query(NoteOccurrence).filter(NoteOccurrence.note_id == note.id).count() == 0
+    assert "monthly" not in [n.title for _, n in NoteOccurrenceService.get_occurrences(db, 1, WINDOW_START, WINDOW_END)]
+
+
+@pytest.fixture
+def clamped_notes(db):
+    notes = [
+        Note(user_id=1, title="monthly 31", solar_date=date(2024, 1, 31), monthly_repeat=True),
+        Note(user_id=1, title="monthly 30", solar_date=date(2024, 1, 30), monthly_repeat=True),
+        Note(user_id=1, title="monthly 29", solar_date=date(2024, 1, 29), monthly_repeat=True),
+        Note(user_id=1, title="yearly 29/2", solar_date=date(2024, 2, 29), yearly_repeat=True),
+    ]
+    db.add_all(notes)
+    db.commit()
+    return notes
+
+
+def _dates(db, start_date, end_date, title):
+    return [
+        occurrence_date for occurrence_date, note in NoteOccurrenceService.compute_occurrences(db, start_date, end_date, 1)
+        if note.title == title
+    ]
+
+
+@pytest.mark.parametrize("year,month,expected_day", [
+    (2025, 4, 30),
+    (2025, 2, 28),
+    (2024, 2, 29),
+    (2025, 5, 31),
+])
+def test_day_31_monthly_note_is_clamped_to_month_end(db, clamped_notes, year, month, expected_day):
+    month_end = date(year, month, monthrange(year, month)[1])
+
+    assert _dates(db, date(year, month, 1), month_end, "monthly 31") == [date(year, month, expected_day)]
+
+
+@pytest.mark.parametrize("year,expected", [
+    (2025, date(2025, 2, 28)),
+    (2027, date(2027, 2, 28)),
+    (2028, date(2028, 2, 29)),
+])
+def test_yearly_feb_29_note_in_non_leap_year(db, clamped_notes, year, expected):
+    assert _dates(db, date(year, 1, 1), date(year, 12, 31), "yearly 29/2") == [expected]
+
+
+def test_segment_reaching_month_end_widens_to_31(db, clamped_notes):
+    # Notes on the 29th-31st all land on 28/2/2025; the range ends on the last day of February
+    occurrences = NoteOccurrenceService.compute_occurrences(db, date(2025, 2, 20), date(2025, 2, 28), 1)
+    assert [(occurrence_date, note.title) for occurrence_date, note in occurrences if note.title != "monthly"] == [
+        (date(2025, 2, 28), "monthly 31"),
+        (date(2025, 2, 28), "monthly 30"),
+        (date(2025, 2, 28), "monthly 29"),
+        (date(2025, 2, 28), "yearly 29/2"),
+    ]
+
+    # Ending a day earlier the segment is not widened and no clamped day falls inside it
+    assert _dates(db, date(2025, 4, 1), date(2025, 4, 29), "monthly 31") == []
+    assert _dates(db, date(2025, 4, 30), date(2025, 4, 30), "monthly 31") == [date(2025, 4, 30)]
+    # A range crossing the month end only widens the first month's segment
+    assert _dates(db, date(2025, 4, 28), date(2025, 5, 30), "monthly 31") == [date(2025, 4, 30)]
+
+
+def test_refresh_stores_clamped_dates(db, clamped_notes):
+    NoteOccurrenceService.refresh(db, today=date(2025, 2, 10))
+
+    stored = db.query(NoteOccurrence.occurrence_date).filter(
+        NoteOccurrence.note_id.in_([note.id for note in clamped_notes]),
+        NoteOccurrence.occurrence_date <= date(2025, 4, 30)
+    ).order_by(NoteOccurrence.occurrence_date, NoteOccurrence.note_id).all()
+    assert [occurrence_date for occurrence_date, in stored] == [date(2025, 2, 28)] * 4 + [
+        date(2025, 3, 29), date(2025, 3, 30), date(2025, 3, 31),
+        date(2025, 4, 29), date(2025, 4, 30), date(2025, 4, 30),
+    ]
@@ -0,0 +1,356 @@
+from calendar import monthrange
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.config import settings
+from app.database import Base
+from app.models import Note, NotificationSchedule, NotificationSendLog, User
+from app.services.notification_dispatcher import Delivery, NotificationDispatcher
+from app.services.notification_service import NotificationService
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(User(id=1, google_id="g1", email="user@example.com", name="User"))
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def service():
+    return NotificationService()
+
+
+def _old_scheduled_time(note, schedule) -> datetime:
+    """Send time as the per-schedule Python loop computed it before next_notification_at existed"""
+    try:
+        event_date_this_period = note.solar_date.replace(year=schedule.current_year, month=schedule.current_month)
+    except ValueError:
+        last_day = monthrange(schedule.current_year, schedule.current_month)[1]
+        event_date_this_period = note.solar_date.replace(
+            year=schedule.current_year, month=schedule.current_month, day=min(note.solar_date.day, last_day)
+        )
+    notification_date = event_date_this_period - timedelta(days=schedule.current_days_before)
+    try:
+        time_parts = settings.notification_time.split(":")
+        notification_hour = int(time_parts[0])
+        notification_minute = int(time_parts[1]) if len(time_parts) > 1 else 0
+    except:
+        notification_hour, notification_minute = 9, 0
+    return datetime.combine(
+        notification_date, datetime.min.time().replace(hour=notification_hour, minute=notification_minute)
+    )
+
+
+def _old_is_due(note, schedule, now: datetime) -> bool:
+    """The old "is it due today" check, including the already-sent-today guard"""
+    if schedule.is_completed or not note.enable_notification:
+        return False
+    if _old_scheduled_time(note, schedule) > now:
+        return False
+    return not (schedule.last_notification_sent and schedule.last_notification_sent.date() == now.date())
+
+
+# (case, note date, monthly, yearly, schedule year, month, days before)
+SCHEDULE_CASES = [
+    ("same month", date(2025, 6, 20), False, False, 2025, 6, 3),
+    ("event day", date(2025, 6, 20), False, False, 2025, 6, 0),
+    ("days before cross into previous month", date(2025, 3, 2), False, False, 2025, 3, 5),
+    ("days before cross into previous year", date(2025, 1, 1), False, True, 2026, 1, 3),
+    ("days before longer than a month", date(2025, 3, 10), False, False, 2025, 3, 40),
+    ("day 31 in a 30-day month", date(2025, 1, 31), True, False, 2025, 4, 1),
+    ("day 31 in February", date(2025, 1, 31), True, False, 2025, 2, 2),
+    ("day 30 in a leap February", date(2024, 1, 30), True, False, 2024, 2, 0),
+    ("Feb 29 in a non-leap year", date(2024, 2, 29), False, True, 2025, 2, 1),
+    ("monthly after year rollover", date(2025, 11, 15), True, False, 2026, 1, 2),
+    ("yearly after year rollover", date(2020, 12, 31), False, True, 2026, 12, 0),
+]
+
+# Offsets from the old scheduled time, and when the last notification went out relative to it
+NOW_OFFSETS = [timedelta(minutes=-1), timedelta(0), timedelta(hours=14, minutes=59), timedelta(days=2)]
+LAST_SENT = [None, timedelta(days=-1), timedelta(minutes=-5)]
+
+
+@pytest.mark.parametrize("notification_time", ["", "07:30", "21"])
+@pytest.mark.parametrize(
+    "solar_date,monthly,yearly,year,month,days_before",
+    [case[1:] for case in SCHEDULE_CASES],
+    ids=[case[0] for case in SCHEDULE_CASES]
+)
+def test_ready_filters_match_old_due_check(db, service, monkeypatch, notification_time,
+                                           solar_date, monthly, yearly, year, month, days_before):
+    monkeypatch.setattr(settings, "notification_time", notification_time)
+    note = Note(user_id=1, title="note", solar_date=solar_date, monthly_repeat=monthly, yearly_repeat=yearly,
+                notification_days_before=max(days_before, 3))
+    schedule = NotificationSchedule(note=note, total_notifications_needed=4, notifications_sent=0,
+                                    current_days_before=days_before, current_year=year, current_month=month,
+                                    is_completed=False)
+    db.add_all([note, schedule])
+    db.commit()
+
+    # Schedules created before the column existed are backfilled to the old send time
+    assert service.backfill_next_notification_at(db) == 1
+    scheduled_time = _old_scheduled_time(note, schedule)
+    assert schedule.next_notification_at == scheduled_time
+    assert service.compute_next_notification_at(note, schedule) == scheduled_time
+
+    for now_offset in NOW_OFFSETS:
+        now = scheduled_time + now_offset
+        for last_sent in LAST_SENT:
+            schedule.last_notification_sent = None if last_sent is None else now + last_sent
+            db.commit()
+
+            ready = db.query(NotificationSchedule.id).join(Note).filter(*service._ready_filters(now)).all()
+            assert bool(ready) == _old_is_due(note, schedule, now), (now_offset, last_sent)
+
+
+def test_completed_and_disabled_schedules_are_never_ready(db, service):
+    note = Note(user_id=1, title="note", solar_date=date(2025, 6, 20), notification_days_before=3)
+    schedule = NotificationSchedule(note=note, total_notifications_needed=4, notifications_sent=0,
+                                    current_days_before=0, current_year=2025, current_month=6, is_completed=False)
+    db.add_all([note, schedule])
+    db.commit()
+    service.backfill_next_notification_at(db)
+    now = datetime(2025, 7, 1)
+
+    def ready():
+        return db.query(NotificationSchedule.id).join(Note).filter(*service._ready_filters(now)).count()
+
+    assert ready() == 1
+    note.enable_notification = False
+    db.commit()
+    assert ready() == 0 == _old_is_due(note, schedule, now)
+
+    note.enable_notification = True
+    schedule.is_completed = True
+    schedule.next_notification_at = service.compute_next_notification_at(note, schedule)
+    db.commit()
+    assert schedule.next_notification_at is None
+    assert ready() == 0 == _old_is_due(note, schedule, now)
+    # Completed schedules are not backfilled either
+    assert service.backfill_next_notification_at(db) == 0
+
+
+@pytest.mark.parametrize("solar_date,monthly,yearly,start_year,start_month", [
+    (date(2025, 10, 31), True, False, 2025, 10),
+    (date(2024, 2, 29), False, True, 2024, 2),
+    (date(2025, 12, 1), True, False, 2025, 12),
+])
+def test_next_progress_walks_month_and_year_rollover(service, solar_date, monthly, yearly, start_year, start_month):
+    note = SimpleNamespace(solar_date=solar_date, monthly_repeat=monthly, yearly_repeat=yearly,
+                           notification_days_before=2)
+    state = {"notifications_sent": 0, "current_days_before": 2, "current_year": start_year,
+             "current_month": start_month, "is_completed": False}
+
+    for _ in range(15):
+        schedule = SimpleNamespace(id=1, note=note, **state)
+        progress = service._next_progress(schedule)
+        state = {key: progress[key] for key in state}
+
+        # Old code moved the schedule the same way and then recomputed the send time on every run
+        assert progress["next_notification_at"] == _old_scheduled_time(note, SimpleNamespace(**state))
+        assert progress["is_completed"] is False
+
+    assert (state["current_year"], state["current_month"]) == (
+        (start_year + (start_month + 4) // 12, (start_month + 4) % 12 + 1) if monthly else (start_year + 5, start_month)
+    )
+
+
+def test_next_progress_completes_one_off_notes(service):
+    note = SimpleNamespace(solar_date=date(2025, 6, 20), monthly_repeat=False, yearly_repeat=False,
+                           notification_days_before=1)
+    schedule = SimpleNamespace(id=1, note=note, notifications_sent=1, current_days_before=0,
+                               current_year=2025, current_month=6, is_completed=False)
+
+    progress = service._next_progress(schedule)
+
+    assert progress["is_completed"] is True
+    assert progress["next_notification_at"] is None
+
+
+@pytest.fixture
+def due_schedules(db, service):
+    """Two one-off notes whose 3-days-before notification was due yesterday"""
+    schedules = []
+    for title in ("first", "second"):
+        note = Note(user_id=1, title=title, solar_date=date.today() + timedelta(days=2), notification_days_before=3)
+        db.add(note)
+        db.commit()
+        schedules.append(service.create_notification_schedule_for_note(db, note))
+    return schedules
+
+
+@pytest.fixture
+def outbox(service, monkeypatch):
+    """Replace the real channels: each schedule gets one email delivery whose outcome is outbox.results[id]"""
+    outbox = SimpleNamespace(sent=[], results={})
+
+    def send(schedule_id):
+        outbox.sent.append(schedule_id)
+        return outbox.results.get(schedule_id, True)
+
+    monkeypatch.setattr(service, "prepare_deliveries", lambda schedule, payload_builder=None: [
+        Delivery(schedule.id, NotificationDispatcher.CHANNEL_EMAIL, "user@example.com",
+                 lambda schedule_id=schedule.id: send(schedule_id))
+    ])
+    return outbox
+
+
+def _state(db, schedule_id):
+    schedule = db.get(NotificationSchedule, schedule_id)
+    db.refresh(schedule)
+    return (schedule.current_days_before, schedule.notifications_sent, schedule.next_notification_at)
+
+
+def _logs(db):
+    return sorted(
+        (log.schedule_id, log.days_before, log.status)
+        for log in db.query(NotificationSendLog).populate_existing()
+    )
+
+
+def test_send_log_key_is_unique(db, due_schedules):
+    schedule = due_schedules[0]
+    for _ in range(2):
+        db.add(NotificationSendLog(schedule_id=schedule.id, cycle_year=schedule.current_year,
+                                   cycle_month=schedule.current_month, days_before=3, claimed_at=datetime.now()))
+    with pytest.raises(IntegrityError):
+        db.commit()
+
+
+def test_batch_sends_once_and_replay_is_skipped(db, service, due_schedules, outbox):
+    items = service.get_ready_schedule_keys(db)
+    assert [schedule_id for schedule_id, _ in items] == [schedule.id for schedule in due_schedules]
+    before = {schedule.id: _state(db, schedule.id) for schedule in due_schedules}
+
+    result = service.process_schedule_batch(db, items)
+
+    assert (result["processed"], result["failed"], result["skipped"]) == (2, 0, 0)
+    assert sorted(outbox.sent) == [schedule.id for schedule in due_schedules]
+    assert _logs(db) == [(schedule.id, 3, NotificationSendLog.STATUS_SENT) for schedule in due_schedules]
+    for schedule in due_schedules:
+        days_before, sent, next_at = _state(db, schedule.id)
+        assert (days_before, sent) == (2, 1)
+        assert next_at == before[schedule.id][2] + timedelta(days=1)
+
+    # A retried task or overlapping beat run replays the same (schedule_id, cycle_key) batch
+    result = service.process_schedule_batch(db, items)
+
+    assert (result["processed"], result["failed"], result["skipped"]) == (0, 0, 2)
+    assert len(outbox.sent) == 2
+    assert [_state(db, schedule.id)[:2] for schedule in due_schedules] == [(2, 1), (2, 1)]
+
+
+def test_claimed_cycle_is_not_sent_again(db, service, due_schedules, outbox):
+    # Sent and logged, but the run died before the schedule was advanced
+    schedule = due_schedules[0]
+    items = [(schedule.id, service.cycle_key(schedule))]
+    db.add(NotificationSendLog(schedule_id=schedule.id, cycle_year=schedule.current_year,
+                               cycle_month=schedule.current_month, days_before=3,
+                               status=NotificationSendLog.STATUS_SENT, claimed_at=datetime.now()))
+    db.commit()
+
+    result = service.process_schedule_batch(db, items)
+
+    assert (result["processed"], result["skipped"]) == (0, 1)
+    assert outbox.sent == []
+    assert _logs(db) == [(schedule.id, 3, NotificationSendLog.STATUS_SENT)]
+
+
+def test_stale_claim_is_taken_over(db, service, due_schedules, outbox):
+    stale, fresh = due_schedules
+    now = datetime.now()
+    for schedule, claimed_at in (
+        (stale, now - timedelta(seconds=settings.notification_claim_timeout + 60)),
+        (fresh, now - timedelta(seconds=settings.notification_claim_timeout - 60)),
+    ):
+        db.add(NotificationSendLog(schedule_id=schedule.id, cycle_year=schedule.current_year,
+                                   cycle_month=schedule.current_month, days_before=3,
+                                   status=NotificationSendLog.STATUS_SENDING, claimed_at=claimed_at))
+    db.commit()
+    stale_log_id = db.query(NotificationSendLog.id).filter(NotificationSendLog.schedule_id == stale.id).scalar()
+
+    result = service.process_schedule_batch(db, service.get_ready_schedule_keys(db))
+
+    # The abandoned claim is reused; the one still in flight elsewhere is left alone
+    assert (result["processed"], result["skipped"]) == (1, 1)
+    assert outbox.sent == [stale.id]
+    assert _logs(db) == [
+        (stale.id, 3, NotificationSendLog.STATUS_SENT),
+        (fresh.id, 3, NotificationSendLog.STATUS_SENDING),
+    ]
+    assert db.query(NotificationSendLog.id).filter(NotificationSendLog.schedule_id == stale.id).scalar() == stale_log_id
+    assert _state(db, stale.id)[:2] == (2, 1)
+    assert _state(db, fresh.id)[:2] == (3, 0)
+
+
+def test_failed_delivery_does_not_advance_the_schedule(db, service, due_schedules, outbox):
+    failing, working = due_schedules
+    outbox.results[failing.id] = False
+    before = _state(db, failing.id)
+    items = service.get_ready_schedule_keys(db)
+
+    result = service.process_schedule_batch(db, items)
+
+    assert (result["processed"], result["failed"]) == (1, 1)
+    assert _state(db, failing.id) == before
+    assert _logs(db) == [
+        (failing.id, 3, NotificationSendLog.STATUS_FAILED),
+        (working.id, 3, NotificationSendLog.STATUS_SENT),
+    ]
+
+    # The next run takes over the failed claim and retries the same notification
+    outbox.results[failing.id] = True
+    result = service.process_schedule_batch(db, [(failing.id, service.cycle_key(db.get(NotificationSchedule, failing.id)))])
+
+    assert result["processed"] == 1
+    assert outbox.sent.count(failing.id) == 2
+    assert _state(db, failing.id)[:2] == (2, 1)
+    assert _logs(db)[0] == (failing.id, 3, NotificationSendLog.STATUS_SENT)
+
+
+def test_progress_update_is_guarded_by_the_claimed_cycle(db, service, due_schedules):
+    schedule = due_schedules[0]
+    log_ids = service._claim_notifications(db, [schedule])
+    # What the chunk held when it was built: the schedule as claimed, before any progress
+    snapshot = SimpleNamespace(
+        id=schedule.id, note=schedule.note, notifications_sent=schedule.notifications_sent,
+        current_days_before=schedule.current_days_before, current_year=schedule.current_year,
+        current_month=schedule.current_month, is_completed=False
+    )
+
+    assert service._apply_results(db, [(snapshot, log_ids[schedule.id], True)]) == (1, 0)
+    assert _state(db, schedule.id)[:2] == (2, 1)
+
+    # The next notification goes out and moves the schedule on
+    log_ids.update(service._claim_notifications(db, [db.get(NotificationSchedule, schedule.id)]))
+    next_snapshot = SimpleNamespace(**{**vars(snapshot), "notifications_sent": 1, "current_days_before": 2})
+    assert service._apply_results(db, [(next_snapshot, log_ids[schedule.id], True)]) == (1, 0)
+    assert _state(db, schedule.id)[:2] == (1, 2)
+
+    # Replaying the first chunk matches no row (b_days_before is stale) and can't move it back
+    service._apply_results(db, [(snapshot, log_ids[schedule.id], True)])
+    assert _state(db, schedule.id)[:2] == (1, 2)
+    assert _logs(db) == [
+        (schedule.id, 2, NotificationSendLog.STATUS_SENT),
+        (schedule.id, 3, NotificationSendLog.STATUS_SENT),
+    ]
+
+    # Completed schedules are never written either
+    schedule = db.get(NotificationSchedule, schedule.id)
+    schedule.is_completed = True
+    db.commit()
+    last_snapshot = SimpleNamespace(**{**vars(snapshot), "notifications_sent": 2, "current_days_before": 1})
+    service._apply_results(db, [(last_snapshot, log_ids[schedule.id], True)])
+    assert _state(db, schedule.id)[:2] == (1, 2)
@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import page_cache
+from app.services.page_cache import MemoryPageCacheBackend, PageCache
+
+TTL = 60
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(page_cache, "time", SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+def test_memory_backend_evicts_least_recently_used(clock):
+    backend = MemoryPageCacheBackend(max_entries=2)
+    backend.set("a", "<a>", TTL)
+    backend.set("b", "<b>", TTL)
+    assert backend.get("a") == "<a>"
+
+    backend.set("c", "<c>", TTL)
+
+    assert backend.get("b") is None
+    assert backend.get("a") == "<a>"
+    assert backend.get("c") == "<c>"
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = PageCache([MemoryPageCacheBackend()], ttl=TTL)
+    cache.set("key", "<html>")
+
+    clock[0] += TTL - 1
+    assert cache.get("key") == "<html>"
+    clock[0] += 1
+    assert cache.get("key") is None
+
+
+def test_slower_backend_hit_backfills_faster_one(clock):
+    memory, shared = MemoryPageCacheBackend(), MemoryPageCacheBackend()
+    shared.set("key", "<html>", TTL)
+    cache = PageCache([memory, shared], ttl=TTL)
+
+    assert cache.get("key") == "<html>"
+    assert memory.get("key") == "<html>"
+
+
+def test_stats_count_hits_and_misses(clock):
+    cache = PageCache([MemoryPageCacheBackend()], ttl=TTL)
+    assert cache.stats() == {"hits": 0, "misses": 0, "hit_rate": 0.0}
+
+    cache.get("key")
+    cache.set("key", "<html>")
+    cache.get("key")
+    cache.get("key")
+
+    assert cache.stats() == {"hits": 2, "misses": 1, "hit_rate": 0.667}
+
+
+def test_make_key_depends_on_every_part():
+    key = PageCache.make_key(2025, 1, "2025-01-15")
+
+    assert key == PageCache.make_key(2025, 1, "2025-01-15")
+    assert key != PageCache.make_key(2025, 2, "2025-01-15")
+    assert key != PageCache.make_key(2025, 1, "2025-01-16")
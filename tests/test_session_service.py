@@ -0,0 +1,161 @@
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base, get_db
+from app.main import app
+from app.models import Note, User
+from app.services.auth_service import google_auth_service
+from app.services.session_service import session_service
+from app.services.user_cache import MemoryUserCacheBackend, UserCache
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        session.add(User(id=1, google_id="g1", email="user@example.com", name="User",
+                         birth_date=date(1990, 5, 17), menh_calculation_method="can_chi"))
+        session.add(Note(user_id=1, title="note", solar_date=date(2025, 6, 20)))
+        session.commit()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def new_session(engine):
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def user_queries(engine):
+    """SELECTs on the users table"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM users" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture(autouse=True)
+def user_cache(monkeypatch):
+    cache = UserCache(MemoryUserCacheBackend(), ttl=60)
+    monkeypatch.setattr(session_service, "user_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def client(new_session):
+    def get_test_db():
+        db = new_session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = get_test_db
+    client = TestClient(app)
+    client.cookies.set("session_token", session_service.create_session_token(1))
+    yield client
+    app.dependency_overrides.pop(get_db, None)
+
+
+REQUEST = SimpleNamespace(cookies={"session_token": session_service.create_session_token(1)})
+
+
+def _current_user(new_session):
+    """Look up the session's user in a fresh DB session, like one request does"""
+    with new_session() as db:
+        user = session_service.get_current_user(REQUEST, db)
+        return {column: getattr(user, column) for column in (
+            "name", "birth_date", "menh_calculation_method", "telegram_chat_id", "telegram_notifications"
+        )}
+
+
+def test_cached_user_is_served_without_a_query(new_session, user_queries):
+    assert _current_user(new_session)["name"] == "User"
+    assert len(user_queries) == 1
+
+    assert _current_user(new_session)["name"] == "User"
+    assert len(user_queries) == 1
+
+
+def test_rebuilt_user_can_be_changed_and_committed(new_session, user_queries):
+    _current_user(new_session)
+
+    with new_session() as db:
+        user = session_service.get_current_user(REQUEST, db)
+        assert len(user_queries) == 1
+        assert [note.title for note in user.notes] == ["note"]
+
+        user.name = "Renamed"
+        user.telegram_chat_id = "12345"
+        db.commit()
+        session_service.invalidate_user(user.id)
+
+        # Expired by the commit and reloaded like any persistent instance
+        assert user.name == "Renamed"
+
+    with new_session() as db:
+        stored = db.get(User, 1)
+        assert (stored.name, stored.telegram_chat_id, stored.email) == ("Renamed", "12345", "user@example.com")
+    assert _current_user(new_session)["name"] == "Renamed"
+
+
+def test_snapshot_is_stale_until_invalidated(new_session):
+    _current_user(new_session)
+    with new_session() as db:
+        db.execute(update(User).where(User.id == 1).values(name="Changed elsewhere"))
+        db.commit()
+
+    assert _current_user(new_session)["name"] == "User"
+    session_service.invalidate_user(1)
+    assert _current_user(new_session)["name"] == "Changed elsewhere"
+
+
+def test_menh_method_setting_invalidates_the_snapshot(client, new_session):
+    assert _current_user(new_session)["menh_calculation_method"] == "can_chi"
+
+    response = client.post("/settings/menh-method", data={"menh_method": "nap_am"})
+
+    assert response.status_code == 200
+    assert _current_user(new_session)["menh_calculation_method"] == "nap_am"
+
+
+def test_notification_settings_invalidate_the_snapshot(client, new_session):
+    assert _current_user(new_session)["telegram_chat_id"] is None
+    # components/notification_result.html is not in the tree; the write happens before rendering it
+    client = TestClient(app, raise_server_exceptions=False, cookies=client.cookies)
+
+    client.post("/settings/notifications", data={"telegram_notifications": "true", "telegram_chat_id": " 42 "})
+
+    user = _current_user(new_session)
+    assert (user["telegram_chat_id"], user["telegram_notifications"]) == ("42", True)
+
+
+def test_birth_date_update_invalidates_the_snapshot(client, new_session):
+    assert _current_user(new_session)["birth_date"] == date(1990, 5, 17)
+
+    response = client.post("/auth/update-birth-date", json={"birth_date": "1992-03-04"})
+
+    assert response.json()["success"] is True
+    assert _current_user(new_session)["birth_date"] == date(1992, 3, 4)
+
+
+def test_login_invalidates_the_snapshot(new_session):
+    assert _current_user(new_session)["name"] == "User"
+
+    with new_session() as db:
+        google_auth_service.get_or_create_user(db, {"id": "g1", "email": "user@example.com", "name": "New Name"})
+
+    assert _current_user(new_session)["name"] == "New Name"
@@ -0,0 +1,123 @@
+import socket
+import threading
+from email.mime.text import MIMEText
+
+import pytest
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+
+from app.services.smtp_service import SMTPConnectionPool
+
+REJECTED = "rejected@example.com"
+
+
+class RecordingHandler:
+    """Accepts every message except those for REJECTED"""
+
+    def __init__(self):
+        self.received = []
+        self.sessions = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address == REJECTED:
+            return "550 5.1.1 Mailbox unavailable"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.sessions.append(server)
+        self.received.extend(envelope.rcpt_tos)
+        return "250 Message accepted"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = aiosmtpd_controller.Controller(handler, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+
+@pytest.fixture
+def pool(smtp_server):
+    controller, _ = smtp_server
+    pool = SMTPConnectionPool(controller.hostname, controller.port, use_tls=False, max_size=2, timeout=5)
+    yield pool
+    pool.close_all()
+
+
+def _message(to_addr: str) -> MIMEText:
+    msg = MIMEText("Nội dung", "plain", "utf-8")
+    msg["Subject"] = "Test"
+    msg["From"] = "calendar@example.com"
+    msg["To"] = to_addr
+    return msg
+
+
+def test_sends_reuse_one_connection(smtp_server, pool):
+    _, handler = smtp_server
+
+    for i in range(3):
+        assert pool.send("calendar@example.com", f"user{i}@example.com", _message(f"user{i}@example.com"))
+
+    metrics = pool.get_metrics()
+    assert metrics["connections_opened"] == 1
+    assert metrics["connections_reused"] == 2
+    assert metrics["sent"] == 3
+    assert handler.received == [f"user{i}@example.com" for i in range(3)]
+
+
+def test_send_many_uses_one_session(smtp_server, pool):
+    _, handler = smtp_server
+    recipients = [f"user{i}@example.com" for i in range(5)]
+
+    results = pool.send_many([("calendar@example.com", to, _message(to)) for to in recipients])
+
+    assert results == [True] * 5
+    assert pool.get_metrics()["connections_opened"] == 1
+    assert handler.received == recipients
+
+
+def test_reconnects_after_server_drops_connection(smtp_server, pool):
+    controller, handler = smtp_server
+    assert pool.send("calendar@example.com", "first@example.com", _message("first@example.com"))
+
+    # Close the pooled connection from the server side
+    dropped = threading.Event()
+
+    def drop():
+        handler.sessions[-1].transport.close()
+        dropped.set()
+
+    controller.loop.call_soon_threadsafe(drop)
+    assert dropped.wait(5)
+
+    assert pool.send("calendar@example.com", "second@example.com", _message("second@example.com"))
+
+    metrics = pool.get_metrics()
+    assert metrics["reconnects"] == 1
+    assert metrics["connections_opened"] == 2
+    assert metrics["failed"] == 0
+    assert handler.received == ["first@example.com", "second@example.com"]
+
+
+def test_rejected_recipient_keeps_the_session(smtp_server, pool):
+    _, handler = smtp_server
+    recipients = ["ok1@example.com", REJECTED, "ok2@example.com"]
+
+    results = pool.send_many([("calendar@example.com", to, _message(to)) for to in recipients])
+
+    assert results == [True, False, True]
+    metrics = pool.get_metrics()
+    assert metrics["reconnects"] == 0
+    assert metrics["connections_opened"] == 1
+    assert metrics["sent"] == 2
+    assert metrics["failed"] == 1
+    assert handler.received == ["ok1@example.com", "ok2@example.com"]
@@ -0,0 +1,80 @@
+import asyncio
+from collections import Counter
+
+import pytest
+from telegram.error import RetryAfter
+
+from app.services import telegram_service
+from app.services.telegram_service import TelegramSender
+
+
+class FakeBot:
+    """Records every send_message call; raises RetryAfter once per occurrence of a text in flood_texts"""
+
+    def __init__(self, flood_texts=(), retry_after=1):
+        self.flood_texts = Counter(flood_texts)
+        self.retry_after = retry_after
+        self.calls = []
+
+    async def send_message(self, chat_id, text, parse_mode=None):
+        self.calls.append((chat_id, text, asyncio.get_running_loop().time()))
+        if self.flood_texts[text] > 0:
+            self.flood_texts[text] -= 1
+            raise RetryAfter(self.retry_after)
+
+    async def shutdown(self):
+        pass
+
+
+@pytest.fixture
+def make_sender(monkeypatch):
+    senders = []
+
+    def make(bot, max_retries=3):
+        monkeypatch.setattr(telegram_service, "Bot", lambda **kwargs: bot)
+        monkeypatch.setattr(telegram_service, "HTTPXRequest", lambda **kwargs: None)
+        sender = TelegramSender(bot_token="token", api_url="http://telegram.test", rate=1000, chat_rate=100,
+                                max_retries=max_retries)
+        senders.append(sender)
+        return sender
+
+    yield make
+    for sender in senders:
+        sender.shutdown()
+
+
+MESSAGES = [("1", "a"), ("2", "b"), ("1", "c"), ("3", "d"), (2, "e")]
+
+
+def test_send_many_retries_after_flood_control_in_input_order(make_sender):
+    bot = FakeBot(flood_texts=["a"])
+    sender = make_sender(bot)
+
+    results = sender.send_many(MESSAGES, timeout=10)
+
+    assert [result.chat_id for result in results] == ["1", "2", "1", "3", "2"]
+    assert all(result.success and result.error is None for result in results)
+    assert [result.attempts for result in results] == [2, 1, 1, 1, 1]
+    assert results[0].retry_after_seconds == 1
+
+    sent = [(chat_id, text) for chat_id, text, _ in bot.calls]
+    assert sent.count(("1", "a")) == 2
+    # Chat 1 keeps its order; the other chats are not held back by chat 1's pause
+    assert [text for chat_id, text in sent if chat_id == "1"] == ["a", "a", "c"]
+    sent_at = {text: at for _, text, at in bot.calls}
+    first_try = next(at for _, text, at in bot.calls if text == "a")
+    assert sent_at["a"] - first_try >= 1
+    assert max(sent_at["b"], sent_at["d"]) < sent_at["a"]
+
+
+def test_send_many_gives_up_after_max_retries(make_sender):
+    bot = FakeBot(flood_texts=["a", "a"])
+    sender = make_sender(bot, max_retries=1)
+
+    results = sender.send_many(MESSAGES[:3], timeout=10)
+
+    assert [result.chat_id for result in results] == ["1", "2", "1"]
+    assert [result.success for result in results] == [False, True, True]
+    assert results[0].attempts == 2
+    assert "Retry in 1 seconds" in results[0].error
+    assert [text for chat_id, text, _ in bot.calls if chat_id == "1"] == ["a", "a", "c"]